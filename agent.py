@@ -1,39 +1,82 @@
-from openai import OpenAI
-import pandas as pd
 import os
-import random
-import numpy as np
+import time
+import threading
+from utils.lazy_tools import lazy_import
 
-# Initialize the OpenAI client
-client = OpenAI()
+# Heavy modules load on first use, so the first prompt appears before pandas or the OpenAI SDK import
+np = lazy_import('numpy')
+draft_tools = lazy_import('utils.draft_tools')
+sim_tools = lazy_import('utils.sim_tools')
+llm_tools = lazy_import('utils.llm_tools')
+prompt_tools = lazy_import('utils.prompt_tools')
+lookahead_tools = lazy_import('utils.lookahead_tools')
+registry_tools = lazy_import('utils.registry_tools')
+scoring_tools = lazy_import('utils.scoring_tools')
+consensus_tools = lazy_import('utils.consensus_tools')
+snapshot_tools = lazy_import('utils.snapshot_tools')
+metrics_tools = lazy_import('utils.metrics_tools')
+lineup_tools = lazy_import('utils.lineup_tools')
 
-# Function to create the initial draft prompt
-def create_initial_draft_prompt(draft_position, num_teams, league_rules, projections, available_players, current_roster):
-    prompt = f"""
-    You are participating in a fantasy football draft. Here are the key details:
+# Data files live next to this module, so the agent runs from any working directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+_recommender = None
+_snapshot = None
+_load_lock = threading.Lock()
+
+# Function to get the recommender, creating it (and its OpenAI client) on first use
+def get_recommender():
+    global _recommender
+    with _load_lock:
+        if _recommender is None:
+            # Recommendations are memoized on disk by draft situation; set DRAFT_LLM_BACKEND=local to run offline
+            _recommender = llm_tools.create_recommender(cache_path=os.path.join(DATA_DIR, 'cache', 'recommendations.sqlite'))
+    return _recommender
+
+# Function to replace the recommender, e.g. with an offline one for benchmarks
+def set_recommender(recommender):
+    global _recommender
+    with _load_lock:
+        _recommender = recommender
+    return recommender
+
+# Function to load players, rankings and parsed rules from the binary snapshot
+def load_data():
+    global _snapshot
+    with _load_lock:
+        if _snapshot is None:
+            _snapshot = snapshot_tools.load_snapshot(DATA_DIR)
+    return _snapshot
+
+# Function to start loading data and the recommender in the background while the user types
+def warm_up():
+    def load():
+        try:
+            load_data()
+            get_recommender()
+        except Exception:
+            pass  # Anything that failed is loaded (and reported) again on first real use
+    thread = threading.Thread(target=load, name='warm-up', daemon=True)
+    thread.start()
+    return thread
+
+# Function to create the initial draft prompt within a token budget
+def create_initial_draft_prompt(draft_position, num_teams, league_rules, draft_state, current_roster, token_budget=1200):
+    our_team = draft_position - 1
+    candidates, upcoming_picks = prompt_tools.candidate_slice(draft_state, our_team)
     
-    - Draft Position: {draft_position}
-    - Number of Teams: {num_teams}
-    - League Rules: {league_rules}
-    - Current Roster: {current_roster}
-    - Available Players: {available_players.to_string(index=False)}
-    - Player Projections: {projections.to_string(index=False)}
+    builder = prompt_tools.PromptBuilder(token_budget)
+    builder.add('header', f"""You are participating in a fantasy football draft.
+Draft Position: {draft_position} | Teams: {num_teams} | Our next picks (overall): {upcoming_picks}
+Current Roster: {current_roster}""")
+    builder.add('scoring', f"Scoring (stat=points):\n{prompt_tools.summarize_scoring(league_rules)}")
+    builder.add('instructions', """Recommend the best player to draft next and explain your reasoning, considering positional needs,
+projections and how the player fits the scoring system.
+Columns: adp=round.pick average draft position, bye=bye week, vor=points over the positional replacement player.""")
+    builder.add_table('candidates', "Candidates likely available at our next picks:", candidates,
+                      ['player', 'pos', 'team', 'bye', 'adp', 'vor'], float_digits={'adp': 2})
     
-    Based on the information provided, recommend the best player to draft next. 
-    Please explain your reasoning, considering positional needs, player projections, 
-    and how the player's performance fits with the league's scoring system.
-
-    Here are the definitions for the player projection columns:
-    player - The player's name
-    team_bye_week - Their 3 character team abbreviation | bye week
-    pos - Position
-    depth_chart - Position on team's depth chart
-    adp - Average draft position
-    expert_consensus_rank - Expert rankings
-    pts_over_replacement - Number of points this player is expected to score over a replacement level player in the position
-    position_score - How valuable this player is relative to the other players at their position.
-    """
-    return prompt
+    return builder.build(), builder.report
 
 # Function to get user input on draft position and number of teams
 def get_draft_info():
@@ -41,17 +84,40 @@ def get_draft_info():
     num_teams = int(input("Enter the number of teams in the league: "))
     return draft_position, num_teams
 
-# Function to handle each draft round
-def handle_draft_round(projections, available_players, current_roster, league_rules):
-    available_players = calculate_value_over_replacement(available_players)
-    scarcity_scores, roster_needs = analyze_positional_scarcity(available_players, current_roster)
-    bye_week_counts, available_players = analyze_bye_weeks(current_roster, available_players)
+# Function to build the lookahead optimizer for a draft, once per draft
+def create_pick_optimizer(draft_state, league_rules):
+    return lookahead_tools.PickOptimizer(draft_state, slots=scoring_tools.parse_roster_slots(league_rules))
+
+# Function to build the prompt and cache context for a draft round
+def build_round_prompt(draft_state, team, league_rules, optimizer=None):
+    vor_engine = draft_state.vor
+    metrics = metrics_tools.get_recorder()
+    
+    # The engine keeps baselines current pick by pick, so only the top slice is materialized
+    with metrics.timer('draft_stage_seconds', stage='vor'):
+        top_index = vor_engine.top(10)
+        top_players = draft_state.players.iloc[top_index].assign(
+            value_over_replacement=vor_engine.values()[top_index],
+            bye_week=draft_state.bye_weeks[top_index]
+        )
+    current_roster = draft_state.roster_names(team)
+    with metrics.timer('draft_stage_seconds', stage='scarcity'):
+        scarcity_scores = vor_engine.scarcity()
+    roster_needs = analyze_roster_needs(draft_state.roster_positions(team))
+    bye_week_counts = draft_state.bye_week_counts(team)
+    
+    # Deterministic lookahead over our next snake picks narrows the field for the model
+    with metrics.timer('draft_stage_seconds', stage='lookahead'):
+        optimizer = optimizer or create_pick_optimizer(draft_state, league_rules)
+        shortlist = optimizer.frame(optimizer.rank(team)[:5])
     
     prompt = f"""
     Based on the current roster and available players, recommend the best player to draft next. 
     Current Roster: {current_roster}
     Top 10 Available Players by Value Over Replacement:
-    {available_players.nlargest(10, 'value_over_replacement')[['player', 'pos', 'value_over_replacement', 'bye_week']].to_string(index=False)}
+    {top_players[['player', 'pos', 'value_over_replacement', 'bye_week']].to_string(index=False)}
+    Lookahead Shortlist (expected value of this pick plus our next picks, and the positions to target with them):
+    {shortlist[['player', 'pos', 'ev', 'plan']].to_string(index=False)}
     Positional Scarcity Scores: {scarcity_scores}
     Roster Needs: {roster_needs}
     Bye Week Distribution: {bye_week_counts}
@@ -59,99 +125,181 @@ def handle_draft_round(projections, available_players, current_roster, league_ru
     Please explain your reasoning, considering positional needs, player projections, 
     value over replacement, positional scarcity, bye week distribution, and how the player's performance fits with the league's scoring system.
     """
-
-    response = client.chat.completions.create(
-        model="gpt-4-turbo-preview",
-        messages=[
-            {"role": "system", "content": "You are a fantasy football draft assistant."},
-            {"role": "user", "content": prompt}
+    
+    context = {
+        'kind': 'round',
+        'roster': current_roster,
+        'top_available': [
+            {'player': row.player, 'pos': row.pos, 'value': row.value_over_replacement}
+            for row in top_players.itertuples()
         ],
-        max_tokens=150
-    )
+        'shortlist': [
+            {'player': row.player, 'pos': row.pos, 'ev': row.ev, 'plan': row.plan}
+            for row in shortlist.itertuples()
+        ],
+        'scarcity': scarcity_scores,
+        'roster_needs': roster_needs,
+        'rules': league_rules
+    }
+    return prompt, context
 
-    recommendation = response.choices[0].message.content.strip()
+# Function to handle each draft round
+def handle_draft_round(draft_state, team, league_rules, prefetcher=None, optimizer=None):
+    metrics = metrics_tools.get_recorder()
+    start = time.perf_counter()
+    prompt, context = build_round_prompt(draft_state, team, league_rules, optimizer)
+    prompt_seconds = time.perf_counter() - start
+    prompt_tokens = prompt_tools.estimate_tokens(prompt)
+    metrics.observe('draft_prompt_tokens', prompt_tokens, kind='round')
+    
+    start = time.perf_counter()
+    served = prefetcher.served if prefetcher is not None else 0
+    if prefetcher is not None:
+        recommendation = prefetcher.take(prompt, context)
+    else:
+        recommendation = get_recommender().recommend(prompt, context)
+    
+    # One record per pick, so a slow pick shows whether the prompt or the model was slow
+    metrics.event('pick', pick=len(draft_state.history) + 1, team=team, prompt_seconds=prompt_seconds,
+                  prompt_tokens=prompt_tokens, llm_seconds=time.perf_counter() - start,
+                  prefetched=prefetcher is not None and prefetcher.served > served)
+    metrics.flush()
     print(f"Recommended Draft Pick: {recommendation}")
     return recommendation
 
+# Function to predict the situations we may face at our next pick
+def predict_next_pick_scenarios(draft_state, team, league_rules, num_scenarios=3, optimizer=None):
+    picks_before_us = draft_state.picks_until_turn(team)
+    if picks_before_us is None:
+        return []
+    
+    # Most likely: the next players by ADP go in order. Alternatives: one of them slips
+    # past us and the next player in the ADP queue is taken instead.
+    queue = draft_state.adp_queue(picks_before_us + num_scenarios)
+    expected = queue[:picks_before_us]
+    taken_sets = [expected]
+    for slipped in reversed(expected):
+        if len(taken_sets) >= num_scenarios or len(queue) <= picks_before_us:
+            break
+        taken_sets.append([p for p in expected if p != slipped] + [queue[picks_before_us]])
+    
+    scenarios = []
+    for taken in taken_sets:
+        for player_id in taken:
+            draft_state.pick(player_id)
+        scenarios.append(build_round_prompt(draft_state, team, league_rules, optimizer))
+        for _ in taken:
+            draft_state.undo()
+    return scenarios
+
 # Function to analyze bye weeks
 def analyze_bye_weeks(current_roster, available_players):
     roster_bye_weeks = [player.split('|')[1] for player in current_roster if '|' in player]
     bye_week_counts = {week: roster_bye_weeks.count(week) for week in set(roster_bye_weeks)}
     
-    available_players['bye_week'] = available_players['team_bye_week'].str.split('|').str[1]
+    # DraftState parses bye weeks once at load; only raw frames need splitting here
+    if 'bye_week' not in available_players:
+        _, bye_weeks = draft_tools.parse_team_bye(available_players['team_bye_week'])
+        available_players = available_players.assign(bye_week=bye_weeks)
     
     return bye_week_counts, available_players
 
 # Function to calculate value over replacement
 def calculate_value_over_replacement(available_players):
-    positions = ['QB', 'RB', 'WR', 'TE']
-    baseline = {}
-    
-    for pos in positions:
-        pos_players = available_players[available_players['pos'] == pos]
-        baseline[pos] = pos_players.nlargest(12, 'pts_over_replacement')['pts_over_replacement'].min()
+    baseline = draft_tools.position_baselines(available_players)
     
-    available_players['value_over_replacement'] = available_players.apply(
-        lambda row: row['pts_over_replacement'] - baseline[row['pos']], axis=1
+    available_players['value_over_replacement'] = (
+        available_players['pts_over_replacement'] - available_players['pos'].map(baseline)
     )
     
     return available_players
 
 # Function to analyze positional scarcity
 def analyze_positional_scarcity(available_players, current_roster):
+    scarcity_scores = draft_tools.positional_scarcity(available_players).to_dict()
+    roster_needs = analyze_roster_needs(current_roster)
+    
+    return scarcity_scores, roster_needs
+
+# Function to count open starting spots per position
+def analyze_roster_needs(current_roster):
     positions = ['QB', 'RB', 'WR', 'TE']
-    scarcity_scores = {}
+    return {pos: 2 - len([p for p in current_roster if p.startswith(pos)]) for pos in positions}
 
-    for pos in positions:
-        available = available_players[available_players['pos'] == pos]
-        top_players = available.nlargest(10, 'pts_over_replacement')
-        scarcity_scores[pos] = np.mean(top_players['pts_over_replacement'])
+# Function to resolve a recommendation to a player id, falling back to the top VOR player
+# (None once the pool is empty)
+def resolve_recommendation(draft_state, recommendation):
+    player_id = draft_state.match_player(recommendation)
+    if player_id is None:
+        top = draft_state.vor.top(1)
+        player_id = top[0] if len(top) else draft_state.best_available_by_adp()
+    return player_id
 
-    roster_needs = {pos: 2 - len([p for p in current_roster if p.startswith(pos)]) for pos in positions}
-    
-    return scarcity_scores, roster_needs
+# Function to load projections, optionally re-valued by a consensus of scraped sources
+def load_projections(aggregator=None):
+    projections = load_data().projections
+    if aggregator is not None:
+        projections = consensus_tools.apply_consensus(projections, aggregator)
+    return projections
 
 # Function to run mock draft
-def run_mock_draft(num_teams, draft_position):
-    # Load initial data
-    projections = pd.read_csv('../data/fantasy_rankings.csv')
-    available_players = pd.read_csv('../data/player_list.csv')
-    with open('../data/rules.txt', 'r') as file:
-        league_rules = file.read()
+def run_mock_draft(num_teams, draft_position, aggregator=None, projections=None):
+    # Load initial data (a projections frame can be passed in, e.g. a synthetic pool for benchmarks)
+    projections = projections if projections is not None else load_projections(aggregator)
+    available_players = load_data().player_list
+    league_rules = load_data().rules
     
-    current_roster = []
-    all_rosters = {i+1: [] for i in range(num_teams)}
+    rounds = 15  # Assuming 15 rounds in the draft
+    draft_state = draft_tools.DraftState(projections, num_teams, rounds)
+    our_team = draft_position - 1
+    report_unresolved_players(projections, available_players)
+    optimizer = create_pick_optimizer(draft_state, league_rules)
     
     # Create the initial draft prompt
-    draft_prompt = create_initial_draft_prompt(draft_position, num_teams, league_rules, projections, available_players, current_roster)
+    draft_prompt, _ = create_initial_draft_prompt(draft_position, num_teams, league_rules, draft_state, [])
     
     # Draft loop
-    for round in range(1, 16):  # Assuming 15 rounds in the draft
+    for round in range(1, rounds + 1):
         for pick in range(1, num_teams + 1):
-            current_pick = (round - 1) * num_teams + pick
-            
             if pick == draft_position:
                 # Our pick
-                recommendation = handle_draft_round(projections, available_players, current_roster, league_rules)
-                current_roster.append(recommendation)
-                all_rosters[pick].append(recommendation)
-                available_players = available_players[available_players['Player'] != recommendation]
-                print(f"Round {round}, Pick {pick}: You drafted {recommendation}")
+                recommendation = handle_draft_round(draft_state, our_team, league_rules, optimizer=optimizer)
+                player_id = resolve_recommendation(draft_state, recommendation)
+                if player_id is None:
+                    break
+                draft_state.pick(player_id, our_team)
+                print(f"Round {round}, Pick {pick}: You drafted {draft_state.names[player_id]}")
             else:
                 # Simulate other teams' picks
-                best_available = available_players.iloc[0]['Player']
-                all_rosters[pick].append(best_available)
-                available_players = available_players[available_players['Player'] != best_available]
-                print(f"Round {round}, Pick {pick}: Team {pick} drafted {best_available}")
+                player_id = draft_state.best_available_by_adp()
+                if player_id is None:
+                    break
+                draft_state.pick(player_id, pick - 1)
+                print(f"Round {round}, Pick {pick}: Team {pick} drafted {draft_state.names[player_id]}")
             
-            if len(available_players) == 0:
+            if not draft_state.available.any():
                 break
         
-        if len(available_players) == 0:
+        if not draft_state.available.any():
             break
     
+    current_roster = draft_state.roster_names(our_team)
+    all_rosters = {team + 1: draft_state.roster_names(team) for team in range(num_teams)}
     return current_roster, all_rosters
 
+# Function to report player list entries missing from the projections
+def report_unresolved_players(projections, available_players):
+    data = load_data()
+    if projections is data.projections and available_players is data.player_list:
+        registry = data.registry  # Resolved when the snapshot was built
+    else:
+        registry = registry_tools.PlayerRegistry.from_rankings(projections)
+        registry.resolve(available_players, name_col='Player', pos_col='Pos', team_col='Team', source='player_list')
+    unresolved = registry.unresolved_frame()
+    if len(unresolved):
+        print(f"{len(unresolved)} players in player_list.csv have no projections: {', '.join(unresolved['name'])}")
+    return registry
+
 # Function to print mock draft results
 def print_mock_draft_results(current_roster, all_rosters):
     print("\nYour Team:")
@@ -164,44 +312,77 @@ def print_mock_draft_results(current_roster, all_rosters):
         for i, player in enumerate(roster, 1):
             print(f"{i}. {player}")
 
+# Function to set every team's best lineup for each week of the season
+def optimize_lineups(all_rosters, league_rules=None, projections=None, weekly=None, aggregator=None):
+    # Rosters as run_mock_draft returns them (team -> player names) or DraftState.rosters
+    projections = projections if projections is not None else load_projections(aggregator)
+    league_rules = league_rules if league_rules is not None else load_data().rules
+    # Without consensus or weekly points the rankings only carry points over replacement, so
+    # lineups are ranked by that and the solution is labelled with it
+    value_col = None if 'consensus' in projections or weekly is not None else 'pts_over_replacement'
+    return lineup_tools.solve_season(projections, all_rosters, league_rules, weekly=weekly, value_col=value_col)
+
+# Function to print a team's projected lineups over the season
+def print_lineup_summary(solution, team):
+    index = solution.teams.index(team)
+    totals = solution.weekly_totals[index]
+    empty = solution.players[index] < 0
+    # Slots nobody on the roster can ever fill are reported once; bye-week holes per week
+    never = empty.all(axis=0)
+    units = solution.units.replace('_', ' ')
+    print(f"\nTeam {team} projected starters: {solution.season_totals[index]:.1f} {units} over {len(totals)} weeks")
+    if solution.units != 'points':
+        print(f"Note: no projected points were loaded, so lineups are ranked by {units}, not points.")
+    if never.any():
+        print(f"No eligible player for: {', '.join(slot for slot, missing in zip(solution.slots, never) if missing)}")
+    for week, total in enumerate(totals, 1):
+        holes = [slot for slot, missing in zip(solution.slots, empty[week - 1] & ~never) if missing]
+        note = f" (bye-week holes: {', '.join(holes)})" if holes else ''
+        print(f"Week {week}: {total:.1f} {units}{note}")
+    ranks = (-solution.season_totals).argsort().argsort()
+    print(f"League rank by projected starters: {ranks[index] + 1} of {len(solution.teams)}")
+
 # Function to get initial pick
-def get_initial_pick(draft_prompt):
-    response = client.chat.completions.create(
-        model="gpt-4-turbo-preview",
-        messages=[
-            {"role": "system", "content": "You are a fantasy football draft assistant."},
-            {"role": "user", "content": draft_prompt}
-        ],
-        max_tokens=150
-    )
-    
-    return response.choices[0].message.content.strip()
+def get_initial_pick(draft_prompt, context=None):
+    # Without a structured context the prompt itself identifies the situation
+    context = dict(context or {}, kind='initial', prompt=draft_prompt)
+    return get_recommender().recommend(draft_prompt, context)
 
 # Main function to run the draft
-def run_draft():
+def run_draft(aggregator=None):
     # Load initial data
-    projections = pd.read_csv('../data/fantasy_rankings.csv')
-    available_players = pd.read_csv('../data/player_list.csv')
-    with open('../data/rules.txt', 'r') as file:
-        league_rules = file.read()
-    
-    current_roster = []
+    projections = load_projections(aggregator)
+    available_players = load_data().player_list
+    league_rules = load_data().rules
     
     # Get draft info
     draft_position, num_teams = get_draft_info()
+    draft_state = draft_tools.DraftState(projections, num_teams)
+    our_team = draft_position - 1
+    # Registry ids are projection rows, so they double as DraftState ids
+    registry = report_unresolved_players(projections, available_players)
+    optimizer = create_pick_optimizer(draft_state, league_rules)
     
     # Create the initial draft prompt
-    draft_prompt = create_initial_draft_prompt(draft_position, num_teams, league_rules, projections, available_players, current_roster)
+    draft_prompt, token_report = create_initial_draft_prompt(draft_position, num_teams, league_rules, draft_state, [])
+    print(f"Initial prompt tokens by section: {token_report}")
+    metrics_tools.get_recorder().observe('draft_prompt_tokens', token_report['total'], kind='initial')
     
     # Get the initial pick recommendation
-    initial_recommendation = get_initial_pick(draft_prompt)
+    _, initial_context = build_round_prompt(draft_state, our_team, league_rules, optimizer)
+    initial_recommendation = get_initial_pick(draft_prompt, initial_context)
     print(initial_recommendation)
     
+    # Recommendations for the likely next situations are requested while other teams pick
+    prefetcher = llm_tools.RecommendationPrefetcher(get_recommender())
+    
     # Draft loop
-    while len(available_players) > 0:
+    while draft_state.available.any():
+        prefetcher.prefetch(predict_next_pick_scenarios(draft_state, our_team, league_rules, optimizer=optimizer))
+        
         # Show available players and ask which ones to remove (drafted by others)
         print("\nAvailable Players:")
-        print(available_players[['player', 'pos']])
+        print(draft_state.available_players(['player', 'pos']))
         
         drafted_players = input("Enter the names of players drafted by other teams (comma-separated, or type 'end' to finish the draft): ").split(",")
         
@@ -209,31 +390,63 @@ def run_draft():
             print("Ending the draft.")
             break
         
-        drafted_players = [player.strip() for player in drafted_players]
+        drafted_players = [player.strip() for player in drafted_players if player.strip()]
         
-        # Remove drafted players from available_players
-        available_players = available_players[~available_players['player'].isin(drafted_players)]
+        # Remove drafted players from the pool
+        for player in drafted_players:
+            player_id = registry.match(player)
+            if player_id is None:
+                player_id = draft_state.match_player(player)
+            if player_id is None or not draft_state.available[player_id]:
+                print(f"Unknown or already drafted player: {player}")
+                continue
+            draft_state.pick(player_id)
+        
+        if not draft_state.available.any():
+            print("No players left to draft.")
+            break
         
         # Handle draft round and get the recommendation for the next pick
-        recommendation = handle_draft_round(projections, available_players, current_roster, league_rules)
+        recommendation = handle_draft_round(draft_state, our_team, league_rules, prefetcher, optimizer)
         
         # Add the recommended player to the current roster
-        current_roster.append(recommendation)
+        player_id = resolve_recommendation(draft_state, recommendation)
+        if player_id is None:
+            print("No players left to draft.")
+            break
+        draft_state.pick(player_id, our_team)
         
         # Optionally save the recommendation to update the roster file
-        with open('data/roster.txt', 'a') as file:
-            file.write(f"{recommendation}\n")
-
-        # Update available players
-        available_players = available_players[available_players['player'] != recommendation]
+        with open(os.path.join(DATA_DIR, 'roster.txt'), 'a') as file:
+            file.write(f"{draft_state.names[player_id]}\n")
         
         # Check if the draft is over
-        if len(current_roster) >= num_teams * len(current_roster):
+        if draft_state.is_complete(our_team):
             break
+    
+    prefetcher.close()
+
+# Function to simulate many drafts and show who is likely to last to our picks
+def run_simulation(num_teams, draft_position, num_sims=2000, aggregator=None):
+    projections = load_projections(aggregator)
+    draft_state = draft_tools.DraftState(projections, num_teams)
+    
+    result = sim_tools.simulate_drafts(draft_state, num_sims)
+    # Best players first, so the list shows who is worth waiting for
+    availability = result.availability_frame(draft_position)
+    availability = availability.iloc[np.argsort(-projections['pts_over_replacement'].to_numpy(), kind='stable')]
+    
+    print(f"Expected roster value from slot {draft_position}: {result.expected_value[draft_position - 1]:.1f}")
+    for round in availability.columns[:5]:
+        likely = availability[round][availability[round] >= 0.5].index[:10]
+        print(f"\n{round}: players available with 50%+ probability: {', '.join(likely)}")
+    
+    return result
 
 # Update the main function to include mock draft option
 if __name__ == "__main__":
-    draft_type = input("Enter 'real' for a real draft or 'mock' for a mock draft: ").lower()
+    warm_up()
+    draft_type = input("Enter 'real' for a real draft, 'mock' for a mock draft or 'sim' to simulate drafts: ").lower()
     
     if draft_type == 'real':
         run_draft()
@@ -242,5 +455,10 @@ if __name__ == "__main__":
         num_teams = int(input("Enter the number of teams in the league: "))
         current_roster, all_rosters = run_mock_draft(num_teams, draft_position)
         print_mock_draft_results(current_roster, all_rosters)
+        print_lineup_summary(optimize_lineups(all_rosters), draft_position)
+    elif draft_type == 'sim':
+        draft_position = int(input("Enter your draft position: "))
+        num_teams = int(input("Enter the number of teams in the league: "))
+        run_simulation(num_teams, draft_position)
     else:
-        print("Invalid input. Please enter 'real' or 'mock'.")
\ No newline at end of file
+        print("Invalid input. Please enter 'real', 'mock' or 'sim'.")
\ No newline at end of file
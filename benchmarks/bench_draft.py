@@ -0,0 +1,124 @@
+import os
+import io
+import sys
+import argparse
+import contextlib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agent
+from utils.llm_tools import Recommender, LocalBackend
+from utils.draft_tools import parse_team_bye
+from utils.sim_tools import DEFAULT_ROSTER_LIMITS, DEFAULT_ROSTER_MINIMUMS
+from utils.lineup_tools import season_points, solve_lineups
+from benchmarks.harness import measure, report, write_results, read_results, compare
+from benchmarks.synthetic import synthetic_pool, synthetic_roster
+
+TEAM_SIZES = (8, 10, 12, 14)
+# Leagues solved in one lineup call, as a what-if sweep over many roster variants would
+LINEUP_LEAGUES = (1, 100)
+POOL_SIZES = (1000, 2500, 5000, 10000)
+MOCK_POOL_SIZES = (1000, 10000)
+
+def _pools(sizes):
+    # The real rankings plus synthetic pools of each size
+    pools = [('rankings', agent.load_projections())]
+    pools.extend((size, synthetic_pool(size, seed=size)) for size in sizes)
+    return pools
+
+def bench_analysis(pool_sizes=POOL_SIZES, repeat=7):
+    results = []
+    for size, pool in _pools(pool_sizes):
+        params = {'pool': size}
+        roster = synthetic_roster(pool)
+        positions = [pos for pos in pool['pos'].head(8)]
+        results.append(measure('agent.calculate_value_over_replacement',
+                               agent.calculate_value_over_replacement, repeat=repeat, number=5,
+                               setup=lambda pool=pool: pool.copy(), params=params))
+        results.append(measure('agent.analyze_positional_scarcity',
+                               lambda pool=pool: agent.analyze_positional_scarcity(pool, positions),
+                               repeat=repeat, number=5, params=params))
+        results.append(measure('agent.analyze_bye_weeks',
+                               lambda pool=pool, roster=roster: agent.analyze_bye_weeks(roster, pool),
+                               repeat=repeat, number=5, params=params))
+    return results
+
+def _roster_problems(roster, pool):
+    # What is wrong with our drafted roster's positional mix: positions over the roster limits
+    # or short of a starting lineup, no backup at a FLEX position, or a bench spent mostly on
+    # quarterbacks and tight ends
+    positions = pool.drop_duplicates('player').set_index('player')['pos']
+    counts = positions.reindex(roster).value_counts()
+    problems = [f"{count} {pos} (limit {DEFAULT_ROSTER_LIMITS[pos]})" for pos, count in counts.items()
+                if count > DEFAULT_ROSTER_LIMITS.get(pos, count)]
+    problems += [f"{counts.get(pos, 0)} {pos} (need {minimum})" for pos, minimum in DEFAULT_ROSTER_MINIMUMS.items()
+                 if counts.get(pos, 0) < minimum]
+    problems += [f"no {pos} depth" for pos in ('RB', 'WR') if counts.get(pos, 0) <= DEFAULT_ROSTER_MINIMUMS[pos]]
+    if counts.get('QB', 0) + counts.get('TE', 0) > counts.get('RB', 0) + counts.get('WR', 0):
+        problems.append("more QB and TE than RB and WR")
+    return problems
+
+def bench_mock_draft(team_sizes=TEAM_SIZES, pool_sizes=MOCK_POOL_SIZES, repeat=3):
+    # The LLM is replaced by the deterministic offline backend with no recommendation cache, so
+    # every pick pays for the full prompt and lookahead. A draft whose roster has an unbalanced
+    # positional mix (see _roster_problems) fails.
+    agent.set_recommender(Recommender(LocalBackend(), cache=None))
+    results = []
+    for size, pool in _pools(pool_sizes):
+        for num_teams in team_sizes:
+            draft_position = num_teams // 2
+            rosters = []
+            def run(pool=pool, num_teams=num_teams, draft_position=draft_position):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    rosters.append(agent.run_mock_draft(num_teams, draft_position, projections=pool)[0])
+            result = measure('agent.run_mock_draft', run, repeat=repeat,
+                             params={'pool': size, 'teams': num_teams})
+            result['roster_problems'] = _roster_problems(rosters[-1], pool)
+            result['passed'] = result['passed'] and not result['roster_problems']
+            results.append(result)
+    return results
+
+def bench_lineups(team_sizes=TEAM_SIZES, leagues=LINEUP_LEAGUES, pool_size=5000, repeat=7):
+    """
+    Solves 17 weeks of lineups for every team of ``leagues`` leagues at once, with 15-player
+    rosters dealt from a synthetic pool.
+    """
+    pool = synthetic_pool(pool_size, seed=pool_size)
+    points = season_points(pool, value_col='pts_over_replacement')
+    positions = pool['pos'].to_numpy()
+    bye = parse_team_bye(pool['team_bye_week'])[1].to_numpy()
+    rng = np.random.default_rng(0)
+    results = []
+    for count in leagues:
+        for num_teams in team_sizes:
+            rosters = np.stack([rng.permutation(pool_size)[:num_teams * 15].reshape(num_teams, 15)
+                                for _ in range(count)]).reshape(-1, 15)
+            results.append(measure('lineup.solve_season',
+                                   lambda rosters=rosters: solve_lineups(points, positions, rosters, bye),
+                                   repeat=repeat, params={'leagues': count, 'teams': num_teams}))
+    return results
+
+def run(quick=False):
+    if quick:
+        return (bench_analysis(POOL_SIZES[:1], repeat=3) + bench_mock_draft(TEAM_SIZES[::3], (), repeat=1)
+                + bench_lineups(TEAM_SIZES[-1:], repeat=3))
+    return bench_analysis() + bench_mock_draft() + bench_lineups()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for the draft engine.")
+    parser.add_argument('--quick', action='store_true', help="Smallest pools and team sizes only")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="Results JSON to compare against")
+    args = parser.parse_args()
+
+    results = run(args.quick)
+    if args.baseline:
+        compare(results, read_results(args.baseline))
+    report(results)
+    for result in results:
+        if result.get('roster_problems'):
+            print(f"  {result['name']} {result['params']}: {', '.join(result['roster_problems'])}")
+    if args.output:
+        write_results(results, args.output)
+    sys.exit(0 if all(result['passed'] for result in results) else 1)
@@ -0,0 +1,133 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper
+from utils.http_tools import create_http_client
+from utils.retry_tools import RetryPolicy, CircuitBreaker
+from utils.store_tools import ProjectionStore
+from benchmarks.harness import summarize, report, write_results, read_results, compare
+from benchmarks.make_fixtures import FIXTURES_DIR, WEEK, write_fixtures
+from benchmarks.standin import StandInServer, StandInTransport
+
+# One healthy but slow site, one that fails once and recovers, one that never answers
+BEHAVIOURS = {
+    'www.numberfire.com': {'delay': 0.2},
+    'www.cbssports.com': {'fail': 1},
+    'www.fftoday.com': {'hang': True},
+}
+EXPECTED = {'NumberFire': 'ok', 'CBS Sports': 'ok', 'FFToday': 'timeout'}
+DEADLINE = 2.0
+BUDGET = 3.0
+
+def _refresh(server, breaker):
+    sources = [(name, func) for name, func in scraper.SCRAPERS if name in EXPECTED]
+
+    async def run():
+        async with create_http_client(transport=StandInTransport(server.address)) as client:
+            return await scraper.scrape_sources(WEEK, sources, browser=False, client=client, deadline=DEADLINE,
+                                                budget=BUDGET, retry=RetryPolicy(base_delay=0.05), breaker=breaker)
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    return results, (time.perf_counter() - start) * 1000
+
+def bench_faults(repeat=3):
+    """
+    A refresh against a local stand-in with a slow, a flaky and a hung site must finish within
+    its budget with the slow and flaky sources intact, and once the hung source's circuit is
+    open the next refresh must skip it.
+    """
+    if not os.path.isdir(FIXTURES_DIR):
+        write_fixtures(FIXTURES_DIR, WEEK)
+
+    results = []
+    with StandInServer(FIXTURES_DIR, BEHAVIOURS) as server:
+        times, statuses = [], {}
+        for _ in range(repeat):
+            server.requests.clear()
+            scraped, elapsed = _refresh(server, breaker=None)
+            times.append(elapsed)
+            statuses = {name: entry['status'] for name, entry in scraped.status.items()}
+        result = summarize('scraper.refresh_with_faults', times, params={'deadline': DEADLINE, 'budget': BUDGET})
+        result['statuses'] = statuses
+        result['passed'] = result['passed'] and statuses == EXPECTED and max(times) <= BUDGET * 1000 + 500
+        results.append(result)
+
+        # The hung source fails once, opening its circuit, and the next refresh skips it
+        breaker = CircuitBreaker(path=None, failure_threshold=1)
+        _refresh(server, breaker)
+        times = []
+        for _ in range(repeat):
+            scraped, elapsed = _refresh(server, breaker)
+            times.append(elapsed)
+        result = summarize('scraper.refresh_circuit_open', times, params={'deadline': DEADLINE, 'budget': BUDGET})
+        result['statuses'] = {name: entry['status'] for name, entry in scraped.status.items()}
+        result['passed'] = result['passed'] and result['statuses'] == dict(EXPECTED, FFToday='skipped')
+        results.append(result)
+    return results
+
+def _stream(server, store, name):
+    sources = [(source, func) for source, func in scraper.SCRAPERS if source == name]
+
+    async def run():
+        async with create_http_client(transport=StandInTransport(server.address)) as client:
+            return await scraper.stream_sources(WEEK, store, sources, season=2024, browser=False, client=client,
+                                                deadline=DEADLINE, budget=BUDGET)
+    start = time.perf_counter()
+    status = asyncio.run(run())
+    return status[name], (time.perf_counter() - start) * 1000
+
+def bench_partial_stream(repeat=3, name='CBS Sports'):
+    """
+    A streamed refresh in which one position of a positional source fails must leave the
+    source's previous partition intact instead of swapping in the positions that did arrive.
+    """
+    if not os.path.isdir(FIXTURES_DIR):
+        write_fixtures(FIXTURES_DIR, WEEK)
+
+    store_root = tempfile.mkdtemp(prefix='ffm-partial-')
+    try:
+        store = ProjectionStore(store_root)
+        with StandInServer(FIXTURES_DIR) as server:
+            _stream(server, store, name)
+            stored = store.read_sources(2024, WEEK)[name]
+            server.behaviours = {'www.cbssports.com': {'fail_paths': ['/RB/']}}
+            times, statuses = [], set()
+            for _ in range(repeat):
+                entry, elapsed = _stream(server, store, name)
+                times.append(elapsed)
+                statuses.add(entry['status'])
+        kept = store.read_sources(2024, WEEK)[name]
+    finally:
+        shutil.rmtree(store_root, ignore_errors=True)
+    result = summarize('scraper.stream_partial_source', times, params={'source': name})
+    result['statuses'] = {name: '/'.join(sorted(statuses))}
+    result['passed'] = (result['passed'] and statuses == {'partial'} and len(stored) > 0
+                        and len(kept) == len(stored) and bool((kept['position'] == 'RB').any()))
+    return [result]
+
+def run(quick=False):
+    return bench_faults(repeat=1 if quick else 3) + bench_partial_stream(repeat=1 if quick else 3)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh latency against a stand-in with slow, flaky and hung sites.")
+    parser.add_argument('--quick', action='store_true', help="Fewer repeats")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="Results JSON to compare against")
+    args = parser.parse_args()
+
+    results = run(args.quick)
+    if args.baseline:
+        compare(results, read_results(args.baseline))
+    report(results)
+    for result in results:
+        print(f"  {result['name']}: {result['statuses']}")
+    if args.output:
+        write_results(results, args.output)
+    sys.exit(0 if all(result['passed'] for result in results) else 1)
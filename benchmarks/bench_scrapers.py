@@ -0,0 +1,91 @@
+import os
+import sys
+import shutil
+import asyncio
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper
+from utils.cache_tools import ScrapeCache, CachedScraper, cache_key
+from utils.store_tools import ProjectionStore
+from benchmarks.harness import measure, report, write_results, read_results, compare
+from benchmarks.make_fixtures import FIXTURES_DIR, WEEK, write_fixtures
+
+# Sources that capture a JSON payload; their rendered-table fallback is benchmarked on its own
+JSON_SOURCES = {'FantasyNerds', 'ESPN'}
+
+def _replay(cache, name, func, week, position=None):
+    # Every position job of a source runs concurrently, as in scrape_sources
+    jobs = scraper._expand_positions([(name, func)], scraper.POSITIONAL_SOURCES)
+
+    async def run_jobs():
+        return await asyncio.gather(*(
+            job_func(CachedScraper(cache, cache_key(name, week, position or job_position)), week)
+            for _, job_func, job_position in jobs
+        ))
+    return scraper._merge_positions(jobs, asyncio.run(run_jobs()))[name]
+
+def bench_parsers(root=FIXTURES_DIR, week=WEEK, repeat=7):
+    """
+    Replays every scrape function against the recorded fixtures. Records of real pages (a
+    week's entries from data/cache) can be copied into ``root`` to benchmark those instead.
+    """
+    if not os.path.isdir(root):
+        write_fixtures(root, week)
+    cache = ScrapeCache(root, replay=True, max_bytes=float('inf'))
+
+    results = []
+    for name, func in scraper.SCRAPERS:
+        rows = len(_replay(cache, name, func, week))
+        if not rows:
+            raise RuntimeError(f"No rows parsed for {name}; regenerate the fixtures with make_fixtures.py")
+        params = {'source': name, 'rows': rows}
+        results.append(measure('scraper.parse', lambda name=name, func=func: _replay(cache, name, func, week),
+                               repeat=repeat, params=params))
+        if name in JSON_SOURCES:
+            rows = len(_replay(cache, name, func, week, position='table'))
+            results.append(measure('scraper.parse_table_fallback',
+                                   lambda name=name, func=func: _replay(cache, name, func, week, position='table'),
+                                   repeat=repeat, params={'source': name, 'rows': rows}))
+    return results
+
+def bench_stream(root=FIXTURES_DIR, week=WEEK, repeat=5):
+    """
+    Replays every source through the streaming pipeline (normalization, id resolution and a
+    Parquet partition per source) into a scratch store.
+    """
+    if not os.path.isdir(root):
+        write_fixtures(root, week)
+    cache = ScrapeCache(root, replay=True, max_bytes=float('inf'))
+    store_root = tempfile.mkdtemp(prefix='ffm-stream-')
+
+    def stream():
+        return asyncio.run(scraper.stream_sources(week, ProjectionStore(store_root), season=2024, cache=cache,
+                                                  browser=False))
+    try:
+        rows = sum(entry['rows'] for entry in stream().values())
+        result = measure('scraper.stream_to_store', stream, repeat=repeat, params={'rows': rows})
+    finally:
+        shutil.rmtree(store_root, ignore_errors=True)
+    return [result]
+
+def run(quick=False):
+    repeat = 3 if quick else 7
+    return bench_parsers(repeat=repeat) + bench_stream(repeat=repeat)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for the scrape parsers against saved fixtures.")
+    parser.add_argument('--quick', action='store_true', help="Fewer repeats")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="Results JSON to compare against")
+    args = parser.parse_args()
+
+    results = run(args.quick)
+    if args.baseline:
+        compare(results, read_results(args.baseline))
+    report(results)
+    if args.output:
+        write_results(results, args.output)
+    sys.exit(0 if all(result['passed'] for result in results) else 1)
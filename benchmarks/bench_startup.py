@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import summarize, report, write_results, read_results, compare
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = b"Enter 'real'"
+
+def time_to_prompt(python=sys.executable):
+    """
+    Milliseconds from launching agent.py to its first prompt appearing on stdout.
+    """
+    env = dict(os.environ, DRAFT_LLM_BACKEND='local', OPENAI_API_KEY=os.environ.get('OPENAI_API_KEY', 'benchmark'))
+    start = time.perf_counter()
+    process = subprocess.Popen([python, os.path.join(ROOT, 'agent.py')], stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, cwd=ROOT)
+    output = b''
+    while PROMPT not in output:
+        chunk = os.read(process.stdout.fileno(), 4096)
+        if not chunk:
+            raise RuntimeError(f"agent.py exited before prompting: {output!r}")
+        output += chunk
+    elapsed = (time.perf_counter() - start) * 1000
+    process.communicate(b'')
+    return elapsed
+
+def run(quick=False):
+    runs = 3 if quick else 10
+    time_to_prompt()  # Warm the OS file cache and the data snapshot
+    return [summarize('startup.time_to_prompt', [time_to_prompt() for _ in range(runs)])]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time from launching agent.py to its first prompt.")
+    parser.add_argument('--quick', action='store_true', help="Fewer runs")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="Results JSON to compare against")
+    args = parser.parse_args()
+
+    results = run(args.quick)
+    if args.baseline:
+        compare(results, read_results(args.baseline))
+    report(results)
+    if args.output:
+        write_results(results, args.output)
+    sys.exit(0 if all(result['passed'] for result in results) else 1)
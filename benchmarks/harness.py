@@ -0,0 +1,98 @@
+import os
+import gc
+import json
+import time
+import statistics
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+THRESHOLDS_PATH = os.path.join(BENCH_DIR, 'thresholds.json')
+
+# A benchmark regresses when its median is this much slower than the baseline run it is compared to
+DEFAULT_TOLERANCE = 1.5
+
+def load_thresholds(path=THRESHOLDS_PATH):
+    """
+    Dict of benchmark key (see threshold_key) to the highest acceptable median in milliseconds.
+    """
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except OSError:
+        return {}
+
+def threshold_key(name, params=None):
+    """
+    Key of a benchmark in thresholds.json, e.g. 'agent.run_mock_draft[pool=10000,teams=12]'.
+    A bare name sets the threshold for every parameter combination.
+    """
+    if not params:
+        return name
+    return f"{name}[{','.join(f'{key}={value}' for key, value in params.items())}]"
+
+def summarize(name, times, params=None, thresholds=None):
+    """
+    Result record for a list of timings in milliseconds, checked against its threshold.
+    """
+    thresholds = load_thresholds() if thresholds is None else thresholds
+    median = statistics.median(times)
+    threshold = thresholds.get(threshold_key(name, params), thresholds.get(name))
+    return {
+        'name': name,
+        'params': params or {},
+        'unit': 'ms',
+        'runs': len(times),
+        'median': median,
+        'min': min(times),
+        'max': max(times),
+        'threshold': threshold,
+        'passed': threshold is None or median <= threshold,
+    }
+
+def measure(name, func, repeat=5, number=1, setup=None, params=None, thresholds=None):
+    """
+    Times ``func`` ``repeat`` times after one warm-up call and returns its summary.
+
+    :param number: Calls per timing; each timing is divided by it, for functions too fast to time alone.
+    :param setup: Optional callable run before every timing (untimed) whose result is passed to ``func``.
+    """
+    func(setup()) if setup else func()
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(number):
+            func(arg) if setup else func()
+        times.append((time.perf_counter() - start) * 1000 / number)
+    return summarize(name, times, params, thresholds)
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Marks results whose median grew past ``tolerance`` times the same benchmark in ``baseline``.
+    """
+    previous = {(r['name'], json.dumps(r['params'], sort_keys=True)): r for r in baseline}
+    for result in results:
+        before = previous.get((result['name'], json.dumps(result['params'], sort_keys=True)))
+        if before is None:
+            continue
+        result['baseline'] = before['median']
+        result['ratio'] = result['median'] / before['median'] if before['median'] else None
+        if result['ratio'] is not None and result['ratio'] > tolerance:
+            result['passed'] = False
+    return results
+
+def report(results):
+    for result in results:
+        params = ', '.join(f"{key}={value}" for key, value in result['params'].items())
+        limit = f" (limit {result['threshold']:.0f})" if result['threshold'] is not None else ''
+        ratio = f" x{result['ratio']:.2f} vs baseline" if result.get('ratio') else ''
+        status = 'ok  ' if result['passed'] else 'FAIL'
+        print(f"{status} {result['name']:<40} {params:<28} {result['median']:>10.2f} ms{limit}{ratio}")
+
+def write_results(results, path):
+    with open(path, 'w') as file:
+        json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}, file, indent=2)
+
+def read_results(path):
+    with open(path) as file:
+        return json.load(file)['results']
@@ -0,0 +1,159 @@
+import os
+import sys
+import html
+import shutil
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper
+from utils.cache_tools import ScrapeCache, cache_key
+from benchmarks.synthetic import synthetic_pool
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+WEEK = 1
+ROWS = 400
+
+# Scripts, styles and navigation around the table, so lxml parses a page of realistic weight
+PAGE = """<!DOCTYPE html>
+<html><head><title>{title}</title>
+{scripts}
+<style>.nav a {{ padding: 4px; }} table td {{ text-align: right; }}</style>
+</head><body>
+<nav class="nav">{nav}</nav>
+<main>{body}</main>
+<footer>{nav}</footer>
+</body></html>"""
+
+ESPN_POSITION_IDS = {pos: code for code, pos in scraper.ESPN_POSITIONS.items()}
+ESPN_TEAM_IDS = {team: code for code, team in scraper.ESPN_TEAMS.items()}
+
+def _page(title, body):
+    scripts = '\n'.join(f'<script>window.__cfg{i} = {{"slot": {i}, "lazy": true}};</script>' for i in range(40))
+    nav = ''.join(f'<a href="/section/{i}">Section {i}</a>' for i in range(60))
+    return PAGE.format(title=title, scripts=scripts, nav=nav, body=body)
+
+def _esc(value):
+    return html.escape(str(value))
+
+def _players(seed=1, rows=ROWS):
+    pool = synthetic_pool(rows, seed=seed)
+    teams = pool['team_bye_week'].str.split('/').str[0]
+    points = (pool['pts_over_replacement'] / 8 + 12).round(1)
+    return [(name, pos, team, proj) for name, pos, team, proj in zip(pool['player'], pool['pos'], teams, points)]
+
+def _table(css, rows, header=''):
+    return f'<table {css}><thead>{header}</thead><tbody>{"".join(rows)}</tbody></table>'
+
+def draftsharks(players):
+    items = ''.join(
+        f'<div class="ranking-item"><div class="rank">{i}</div><div class="name">{_esc(name)}</div>'
+        f'<div class="position">{pos}</div><div class="team">{team}</div><div class="proj-pts">{proj}</div></div>'
+        for i, (name, pos, team, proj) in enumerate(players, 1))
+    return _page('DraftSharks', f'<div class="rankings">{items}</div>')
+
+def fantasynerds(players):
+    rows = [f'<tr><td>{i}</td><td>{_esc(name)}</td><td>{pos}</td><td>{team}</td><td>{i % 14 + 1}</td><td>{proj}</td></tr>'
+            for i, (name, pos, team, proj) in enumerate(players, 1)]
+    return _page('FantasyNerds', _table('id="DataTables_Table_0"', rows))
+
+def espn(players):
+    rows = [f'<tr><td><div class="player-column__athlete"><a class="AnchorLink" href="#">{_esc(name)}</a>'
+            f'<span class="playerinfo__playerteam">{pos} - {team}</span></div></td>'
+            f'<td>{i % 30}</td><td>{proj * 0.9:.1f}</td><td>{proj}</td></tr>'
+            for i, (name, pos, team, proj) in enumerate(players, 1)]
+    return _page('ESPN', _table('class="Table"', rows))
+
+def nfl(players):
+    rows = [f'<tr><td class="playerNameAndInfo"><a class="playerName" href="#">{_esc(name)}</a> <em>{pos} - {team}</em></td>'
+            f'<td class="stat">{i % 50}</td><td class="stat projected">{proj}</td></tr>'
+            for i, (name, pos, team, proj) in enumerate(players, 1)]
+    return _page('NFL', _table('class="tableType-player"', rows))
+
+def numberfire(players):
+    rows = [f'<tr><td>{i}</td><td>{_esc(name)}</td><td>{pos}</td><td>{team}</td><td>{proj * 0.1:.2f}</td><td>{proj}</td></tr>'
+            for i, (name, pos, team, proj) in enumerate(players, 1)]
+    return _page('NumberFire', _table('class="projection-table"', rows))
+
+def fftoday(players):
+    header = '<tr><td colspan="6">Projections</td></tr><tr><td>Chg</td><td>Player</td><td>Team</td><td>Opp</td><td>Att</td><td>FPts</td></tr>'
+    rows = [f'<tr><td>{i}</td><td>{_esc(name)}</td><td>{team}</td><td>@{team}</td><td>{i % 20}</td><td>{proj}</td></tr>'
+            for i, (name, _, team, proj) in enumerate(players, 1)]
+    return _page('FFToday', f'<table class="stats">{header}{"".join(rows)}</table>')
+
+def cbssports(players):
+    rows = [f'<tr><td><span class="CellPlayerName--long"><a href="#">{_esc(name)}</a>'
+            f'<span class="CellPlayerName-position">{pos}</span><span class="CellPlayerName-team">{team}</span></span></td>'
+            f'<td>{i % 16}</td><td>{proj}</td></tr>'
+            for i, (name, pos, team, proj) in enumerate(players, 1)]
+    return _page('CBS Sports', _table('class="TableBase-table"', rows))
+
+def _espn_team(team):
+    # ESPN's own abbreviations for the two teams the registry spells differently
+    return {'WAS': 'WSH', 'JAC': 'JAX'}.get(team, team)
+
+def espn_json(players, week):
+    return {'players': [{'player': {
+        'fullName': name,
+        'defaultPositionId': ESPN_POSITION_IDS.get(pos),
+        'proTeamId': ESPN_TEAM_IDS.get(_espn_team(team)),
+        'stats': [{'statSourceId': 0, 'scoringPeriodId': week, 'appliedTotal': 0.0},
+                  {'statSourceId': 1, 'scoringPeriodId': week, 'appliedTotal': proj}],
+    }} for name, pos, team, proj in players]}
+
+def fantasynerds_json(players):
+    projections = {}
+    for name, pos, team, proj in players:
+        projections.setdefault(pos, []).append({'name': name, 'team': team, 'proj_pts': str(proj)})
+    return {'projections': projections}
+
+def write_fixtures(root=FIXTURES_DIR, week=WEEK, rows=ROWS):
+    """
+    Records a synthetic page for every source into a ScrapeCache at ``root``, under the same
+    keys and URLs the scrape functions visit, so CachedScraper replays them offline. ESPN and
+    FantasyNerds get both their captured JSON (key position 'ALL') and the rendered table they
+    fall back to (key position 'table').
+    """
+    shutil.rmtree(root, ignore_errors=True)
+    cache = ScrapeCache(root, max_bytes=float('inf'))
+    players = _players(rows=rows)
+    by_position = {}
+    for player in players:
+        by_position.setdefault('DST' if player[1] == 'D/ST' else player[1], []).append(player)
+
+    urls = {
+        'DraftSharks': f"https://www.draftsharks.com/weekly-rankings/{week}/ppr",
+        'FantasyNerds': "https://www.fantasynerds.com/nfl/weekly-projections",
+        'ESPN': "https://fantasy.espn.com/football/players/projections",
+        'NumberFire': "https://www.numberfire.com/nfl/daily-fantasy/daily-football-projections",
+    }
+    cache.put_raw(cache_key('DraftSharks', week), urls['DraftSharks'], draftsharks(players))
+    cache.put_raw(cache_key('NumberFire', week), urls['NumberFire'], numberfire(players))
+    cache.put_raw(cache_key('FantasyNerds', week), urls['FantasyNerds'], fantasynerds_json(players), kind='json')
+    cache.put_raw(cache_key('FantasyNerds', week, 'table'), urls['FantasyNerds'], fantasynerds(players))
+    cache.put_raw(cache_key('ESPN', week), urls['ESPN'], espn_json(players, week), kind='json')
+    cache.put_raw(cache_key('ESPN', week, 'table'), urls['ESPN'], espn(players))
+
+    nfl_url = f"https://fantasy.nfl.com/research/projections#researchProjections=researchProjections%2C%2Fresearch%2Fprojections%253Fposition%253DO%2526sort%253DprojectedPts%2526statCategory%253DprojectedStats%2526statSeason%253D2024%2526statType%253DweekProjectedStats%2526statWeek%253D{week}%2Creplace"
+    cache.put_raw(cache_key('NFL', week), nfl_url, nfl(players))
+
+    for position, code in scraper.FFTODAY_POSITIONS.items():
+        url = f"https://www.fftoday.com/rankings/playerwkproj.php?Season=2024&GameWeek={week}&PosID={code}&LeagueID=1"
+        group = by_position.get(position, [])
+        # 50 players per page like the site, then an empty page that ends the pagination
+        pages = [group[i:i + 50] for i in range(0, len(group), 50)] + [[]]
+        for page, rows_on_page in enumerate(pages):
+            cache.put_raw(cache_key('FFToday', week, position), f"{url}&cur_page={page}", fftoday(rows_on_page))
+
+    for position, slug in scraper.CBSSPORTS_POSITIONS.items():
+        url = f"https://www.cbssports.com/fantasy/football/stats/{slug}/2024/tp/projections/ppr/"
+        cache.put_raw(cache_key('CBS Sports', week, position), url, cbssports(by_position.get(position, [])))
+    return cache
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the scraper benchmark fixtures.")
+    parser.add_argument('--root', default=FIXTURES_DIR)
+    parser.add_argument('--rows', type=int, default=ROWS)
+    args = parser.parse_args()
+    write_fixtures(args.root, rows=args.rows)
+    print(f"Fixtures written to {args.root}")
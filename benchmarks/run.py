@@ -0,0 +1,45 @@
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import bench_startup, bench_draft, bench_scrapers, bench_resilience
+from benchmarks.harness import DEFAULT_TOLERANCE, report, write_results, read_results, compare
+
+SUITES = {
+    'startup': bench_startup,
+    'draft': bench_draft,
+    'scrapers': bench_scrapers,
+    'resilience': bench_resilience,
+}
+
+# Run every suite offline and check the results against thresholds.json (and a baseline run, if given):
+#   python benchmarks/run.py --output bench.json
+#   python benchmarks/run.py --baseline bench.json --output bench-new.json
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs the benchmark suites offline.")
+    parser.add_argument('suites', nargs='*', help=f"Suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument('--quick', action='store_true', help="Smaller sizes and fewer repeats")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="Results JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Slowdown versus the baseline that counts as a regression")
+    args = parser.parse_args()
+    unknown = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(unknown)}")
+
+    # The agent runs on the offline backend; no benchmark makes network calls
+    os.environ.setdefault('DRAFT_LLM_BACKEND', 'local')
+    os.environ.setdefault('OPENAI_API_KEY', 'benchmark')
+
+    results = []
+    for name in args.suites or SUITES:
+        results.extend(SUITES[name].run(args.quick))
+    if args.baseline:
+        compare(results, read_results(args.baseline), args.tolerance)
+    report(results)
+    if args.output:
+        write_results(results, args.output)
+    sys.exit(0 if all(result['passed'] for result in results) else 1)
@@ -0,0 +1,124 @@
+import os
+import json
+import time
+import threading
+from urllib.parse import urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import httpx
+
+ORIGINAL_URL_HEADER = 'X-Original-URL'
+
+def _recorded_pages(root):
+    # URL -> file of every HTML page recorded in a ScrapeCache directory
+    pages = {}
+    for dirpath, _, filenames in os.walk(root):
+        if 'meta.json' in filenames:
+            with open(os.path.join(dirpath, 'meta.json')) as file:
+                meta = json.load(file)
+            for entry, name in meta['urls'].items():
+                kind, url = entry.split(' ', 1)
+                if kind == 'html':
+                    pages[url] = os.path.join(dirpath, name)
+    return pages
+
+class StandInServer:
+    """
+    Local HTTP server that plays the scraped sites from recorded pages, with per-host faults.
+
+    Requests reach it through StandInTransport, which keeps the real URL in a header, so scrape
+    functions run unchanged. Behaviours are keyed by host name:
+
+        {'www.fftoday.com': {'hang': True},          # never answers
+         'www.numberfire.com': {'delay': 2.0},       # answers after two seconds
+         'www.cbssports.com': {'fail': 2}}           # first two requests per URL get a 503
+
+    ``'fail_paths': ['/RB/']`` answers every request whose path contains one of the strings
+    with a 503, e.g. to fail one position of a positional source.
+
+    :param root: ScrapeCache directory with the recorded pages (e.g. benchmarks/fixtures).
+    :param behaviours: Dict of host name to behaviour.
+    """
+    def __init__(self, root, behaviours=None):
+        self.pages = _recorded_pages(root)
+        self.behaviours = behaviours or {}
+        self.requests = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _respond(self, handler):
+        url = handler.headers.get(ORIGINAL_URL_HEADER, '')
+        behaviour = self.behaviours.get(urlparse(url).hostname, {})
+        with self._lock:
+            count = self.requests[url] = self.requests.get(url, 0) + 1
+
+        if behaviour.get('hang'):
+            time.sleep(behaviour.get('hang_seconds', 3600))
+            return
+        time.sleep(behaviour.get('delay', 0))
+        if count <= behaviour.get('fail', 0) or any(part in urlparse(url).path for part in behaviour.get('fail_paths', ())):
+            handler.send_error(503, 'Stand-in failure')
+            return
+        path = self.pages.get(url)
+        if path is None:
+            handler.send_error(404, 'Not recorded')
+            return
+        with open(path, 'rb') as file:
+            body = file.read()
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'text/html; charset=utf-8')
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                try:
+                    server._respond(self)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client gave up (deadline) before we answered
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def address(self):
+        return self._server.server_address
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+class StandInTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport sending every request to a StandInServer, with the real URL in a header.
+    """
+    def __init__(self, address):
+        host, port = address
+        self.base = httpx.URL(f"http://{host}:{port}/")
+        self._transport = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request):
+        request.headers[ORIGINAL_URL_HEADER] = str(request.url)
+        request.url = self.base
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        await self._transport.aclose()
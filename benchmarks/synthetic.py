@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+from utils.registry_tools import TEAM_NAMES
+
+FIRST_NAMES = ['Aaron', 'Bijan', 'Calvin', 'Dak', 'Evan', 'Frank', 'George', 'Hunter', 'Isaiah', 'Jalen',
+               'Kyren', 'Lamar', 'Marvin', 'Nico', 'Omar', 'Puka', 'Quentin', 'Rashee', 'Saquon', 'Travis',
+               'Utah', 'Victor', 'Wan', 'Xavier', 'Yusuf', 'Zay']
+SYLLABLES = ['ba', 'ker', 'mo', 'ri', 'son', 'tel', 'gan', 'vi', 'dor', 'lu', 'pe', 'ham', 'ster', 'quin',
+             'fra', 'zel', 'chu', 'wick', 'nor', 'jas']
+
+# Position mix of a draft board: lots of receivers and backs, few kickers and defenses
+POSITION_SHARES = {'QB': 0.12, 'RB': 0.24, 'WR': 0.32, 'TE': 0.12, 'K': 0.1, 'D/ST': 0.1}
+BYE_WEEKS = list(range(5, 15))
+
+def _last_names(rng, count):
+    # Two or three random syllables give last names with varied phonetic keys, like real ones
+    names = set()
+    while len(names) < count:
+        parts = rng.choice(SYLLABLES, size=rng.integers(2, 4))
+        names.add(''.join(parts).capitalize())
+    return sorted(names)
+
+def synthetic_pool(size, seed=0):
+    """
+    Projections frame shaped like data/fantasy_rankings.csv with ``size`` players, unique names
+    and ADP ordered roughly by value, for benchmarking at pool sizes the real file doesn't reach.
+    """
+    rng = np.random.default_rng(seed)
+    last_names = _last_names(rng, size // len(FIRST_NAMES) + 1)
+    names = [f"{first} {last}" for last in last_names for first in FIRST_NAMES][:size]
+    rng.shuffle(names)
+
+    positions = rng.choice(list(POSITION_SHARES), size=size, p=list(POSITION_SHARES.values()))
+    teams = rng.choice(list(TEAM_NAMES), size=size)
+    byes = dict(zip(TEAM_NAMES, rng.choice(BYE_WEEKS, size=len(TEAM_NAMES))))
+    # Value decays down the board with noise; ADP follows value loosely
+    points = np.round(120 * np.exp(-np.arange(size) / (size / 6)) + rng.normal(0, 8, size) - 20, 1)
+    rank = np.argsort(np.argsort(-(points + rng.normal(0, 10, size)))) + 1
+    adp = np.where(rank <= 240, (rank - 1) // 12 + 1 + ((rank - 1) % 12 + 1) / 100, np.nan)
+
+    return pd.DataFrame({
+        'player': names,
+        'team_bye_week': [f"{team}/{byes[team]}" for team in teams],
+        'pos': positions,
+        'depth_chart': rng.integers(1, 4, size),
+        'adp': np.round(adp, 2),
+        'expert_consensus_rank': rank,
+        'pts_over_replacement': points,
+        'position_score': np.round(points * rng.uniform(0.8, 1.2, size), 2),
+    })
+
+def synthetic_roster(pool, size=8, seed=0):
+    """
+    Roster entries in the 'Name|bye' form analyze_bye_weeks reads.
+    """
+    rng = np.random.default_rng(seed)
+    rows = pool.iloc[rng.choice(len(pool), size=min(size, len(pool)), replace=False)]
+    return [f"{row.player}|{row.team_bye_week.split('/')[1]}" for row in rows.itertuples()]
@@ -1,251 +1,756 @@
+import os
+import time
+import asyncio
+from functools import partial
+import numpy as np
 import pandas as pd
-from utils.scrape_tools import WebScraper
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from concurrent.futures import ThreadPoolExecutor
+from utils.scrape_tools import AsyncWebScraper, BrowserPool, RequestBlocker, stream_url_table
+from utils.http_tools import HttpScraper, StaticPageError, create_http_client
+from utils.cache_tools import ScrapeCache, CachedScraper, CacheMiss, cache_key
+from utils.extract_tools import Column, TableSpec
+from utils.registry_tools import PlayerRegistry
+from utils.consensus_tools import ConsensusAggregator
+from utils.store_tools import ProjectionStore, current_season
+from utils.metrics_tools import get_recorder
+from utils.retry_tools import RetryPolicy, CircuitBreaker, DeadlineExceeded, run_with_deadline
+from utils.stream_tools import normalize_batch, ResolveIds, run_stream
+from utils.delta_tools import DeltaTracker, DEFAULT_ALERT_THRESHOLD, movement_alerts
 
-def scrape_draftsharks(week):
-    scraper = WebScraper()
-    url = f"https://www.draftsharks.com/weekly-rankings/{week}/ppr"
-    
+PROJECTION_COLUMNS = ['name', 'position', 'team', 'projection']
+
+DRAFTSHARKS_TABLE = TableSpec('div.ranking-item', [
+    Column('name', selector='div.name'),
+    Column('position', selector='div.position'),
+    Column('team', selector='div.team'),
+    Column('projection', selector='div.proj-pts', parser='float'),
+])
+
+FANTASYNERDS_TABLE = TableSpec('table#DataTables_Table_0 tbody tr', [
+    Column('name', index=1),
+    Column('position', index=2),
+    Column('team', index=3),
+    Column('projection', index=5, parser='float'),  # Fantasy Points column
+])
+
+ESPN_TABLE = TableSpec('table.Table tbody tr', [
+    Column('name', selector='div.player-column__athlete a.AnchorLink'),
+    Column(('position', 'team'), selector='div.player-column__athlete span.playerinfo__playerteam', parser='split'),
+    Column('projection', index=-1, parser='float'),
+])
+
+NFL_TABLE = TableSpec('table.tableType-player tbody tr', [
+    Column('name', selector='a.playerName'),
+    Column(('position', 'team'), selector='em', parser='split'),
+    Column('projection', selector='td.stat.projected', parser='float'),
+])
+
+NUMBERFIRE_TABLE = TableSpec('table.projection-table tbody tr', [
+    Column('name', index=1),
+    Column('position', index=2),
+    Column('team', index=3),
+    Column('projection', index=-1, parser='float'),
+])
+
+# FFToday and CBS publish one table per position; each position is scraped as its own job
+FFTODAY_POSITIONS = {'QB': 10, 'RB': 20, 'WR': 30, 'TE': 40, 'K': 80, 'DST': 99}
+CBSSPORTS_POSITIONS = {'QB': 'QB', 'RB': 'RB', 'WR': 'WR', 'TE': 'TE', 'K': 'K', 'DST': 'DST'}
+
+# A third row means the page has at least one player below the two header rows
+FFTODAY_CONTENT_CHECK = 'table.stats tr:nth-of-type(3)'
+
+def _fftoday_table(position):
+    # Stat columns differ by position but fantasy points are always the last cell
+    return TableSpec('table.stats tr', [
+        Column('name', index=1),
+        Column('team', index=2),
+        Column('projection', index=-1, parser='float'),
+    ], skip_rows=2, min_cells=5, constants={'position': position})
+
+def _cbssports_table(position):
+    return TableSpec('table.TableBase-table tbody tr', [
+        Column('name', selector='span.CellPlayerName--long a'),
+        Column('team', selector='span.CellPlayerName--long span.CellPlayerName-team'),
+        Column('projection', index=-1, parser='float'),
+    ], constants={'position': position})
+
+# ESPN identifies positions and teams by numeric id in its player API
+ESPN_POSITIONS = {1: 'QB', 2: 'RB', 3: 'WR', 4: 'TE', 5: 'K', 16: 'D/ST'}
+ESPN_TEAMS = {
+    1: 'ATL', 2: 'BUF', 3: 'CHI', 4: 'CIN', 5: 'CLE', 6: 'DAL', 7: 'DEN', 8: 'DET',
+    9: 'GB', 10: 'TEN', 11: 'IND', 12: 'KC', 13: 'LV', 14: 'LAR', 15: 'MIA', 16: 'MIN',
+    17: 'NE', 18: 'NO', 19: 'NYG', 20: 'NYJ', 21: 'PHI', 22: 'ARI', 23: 'PIT', 24: 'LAC',
+    25: 'SF', 26: 'SEA', 27: 'TB', 28: 'WSH', 29: 'CAR', 30: 'JAX', 33: 'BAL', 34: 'HOU'
+}
+ESPN_API_PATTERN = r'/apis/v3/games/ffl/seasons/\d+/segments/0/leaguedefaults/'
+FANTASYNERDS_API_PATTERN = r'weekly-projections.*(json|ajax)|/v1/nfl/weekly-projections'
+
+def parse_espn_json(payload, week):
+    players = []
+    for entry in payload.get('players', []):
+        player = entry.get('player', entry)
+        projection = None
+        for stat in player.get('stats', []):
+            # statSourceId 1 is ESPN's projection (0 is the actual result)
+            if stat.get('statSourceId') == 1 and stat.get('scoringPeriodId') == week:
+                projection = stat.get('appliedTotal')
+                break
+
+        players.append({
+            'name': player.get('fullName'),
+            'position': ESPN_POSITIONS.get(player.get('defaultPositionId')),
+            'team': ESPN_TEAMS.get(player.get('proTeamId')),
+            'projection': projection
+        })
+
+    return pd.DataFrame(players, columns=PROJECTION_COLUMNS)
+
+def parse_fantasynerds_json(payload, week):
+    projections = payload.get('projections', payload)
+    # The payload is keyed by position, each holding a list of player projections
+    if isinstance(projections, dict):
+        rows = [dict(row, position=row.get('position', pos)) for pos, pos_rows in projections.items() for row in pos_rows]
+    else:
+        rows = projections
+
+    players = []
+    for row in rows:
+        projection = row.get('proj_pts', row.get('fantasy_points'))
+        players.append({
+            'name': row.get('name'),
+            'position': row.get('position'),
+            'team': row.get('team'),
+            'projection': float(projection) if projection not in (None, '') else None
+        })
+
+    return pd.DataFrame(players, columns=PROJECTION_COLUMNS)
+
+async def _scrape_table(scraper, url, spec):
+    # The table rows appearing is all we need; don't wait for ads and trackers to settle
+    await scraper.navigate_to_page(url, ready_selector=spec.row_selector)
+    df = await scraper.extract_table(spec)
+    return df[PROJECTION_COLUMNS]
+
+async def _scrape_capture(scraper, url, url_pattern, parse_payload, week, fallback_spec):
     try:
-        scraper.navigate_to_page(url)
-        
-        players = []
-        rankings = scraper.page.query_selector_all('div.ranking-item')
-        
-        for rank in rankings:
-            name = rank.query_selector('div.name').inner_text()
-            position = rank.query_selector('div.position').inner_text()
-            team = rank.query_selector('div.team').inner_text()
-            projection = rank.query_selector('div.proj-pts').inner_text()
-            
-            players.append({
-                'name': name,
-                'position': position,
-                'team': team,
-                'projection': float(projection)
-            })
-        
-        return pd.DataFrame(players)
-    
-    except Exception as e:
-        print(f"Error scraping DraftSharks: {e}")
-        return pd.DataFrame()
-    finally:
-        scraper.stop_browser()
+        payload = await scraper.capture_json(url, url_pattern)
+    except (PlaywrightTimeoutError, CacheMiss):
+        # The data endpoint never fired (or was never recorded); read the rendered table instead
+        await scraper.wait_until_ready(fallback_spec.row_selector)
+        df = await scraper.extract_table(fallback_spec)
+        return df[PROJECTION_COLUMNS]
+    return parse_payload(payload, week)
 
-def scrape_fantasynerds(week):
-    scraper = WebScraper()
+async def _scrape_draftsharks(scraper, week):
+    url = f"https://www.draftsharks.com/weekly-rankings/{week}/ppr"
+    return await _scrape_table(scraper, url, DRAFTSHARKS_TABLE)
+
+async def _scrape_fantasynerds(scraper, week):
     url = f"https://www.fantasynerds.com/nfl/weekly-projections"
-    
-    try:
-        scraper.navigate_to_page(url)
-        
-        players = []
-        rows = scraper.page.query_selector_all('table#DataTables_Table_0 tbody tr')
-        
-        for row in rows:
-            cols = row.query_selector_all('td')
-            name = cols[1].inner_text()
-            position = cols[2].inner_text()
-            team = cols[3].inner_text()
-            projection = cols[5].inner_text()  # Fantasy Points column
-            
-            players.append({
-                'name': name,
-                'position': position,
-                'team': team,
-                'projection': float(projection) if projection else None
-            })
-        
-        return pd.DataFrame(players)
-    
-    except Exception as e:
-        print(f"Error scraping FantasyNerds: {e}")
-        return pd.DataFrame()
-    finally:
-        scraper.stop_browser()
+    return await _scrape_capture(scraper, url, FANTASYNERDS_API_PATTERN, parse_fantasynerds_json, week, FANTASYNERDS_TABLE)
 
-def scrape_espn(week):
-    scraper = WebScraper()
+async def _scrape_espn(scraper, week):
     url = f"https://fantasy.espn.com/football/players/projections"
-    
-    try:
-        scraper.navigate_to_page(url)
-        
-        players = []
-        rows = scraper.page.query_selector_all('table.Table tbody tr')
-        
-        for row in rows:
-            name_elem = row.query_selector('div.player-column__athlete')
-            name = name_elem.query_selector('a.AnchorLink').inner_text()
-            position_team = name_elem.query_selector('span.playerinfo__playerteam').inner_text()
-            position, team = position_team.split(' - ')
-            projection = row.query_selector_all('td')[-1].inner_text()
-            
-            players.append({
-                'name': name,
-                'position': position,
-                'team': team,
-                'projection': float(projection) if projection else None
-            })
-        
-        return pd.DataFrame(players)
-    
-    except Exception as e:
-        print(f"Error scraping ESPN: {e}")
-        return pd.DataFrame()
-    finally:
-        scraper.stop_browser()
+    return await _scrape_capture(scraper, url, ESPN_API_PATTERN, parse_espn_json, week, ESPN_TABLE)
 
-def scrape_nfl(week):
-    scraper = WebScraper()
+async def _scrape_nfl(scraper, week):
     url = f"https://fantasy.nfl.com/research/projections#researchProjections=researchProjections%2C%2Fresearch%2Fprojections%253Fposition%253DO%2526sort%253DprojectedPts%2526statCategory%253DprojectedStats%2526statSeason%253D2024%2526statType%253DweekProjectedStats%2526statWeek%253D{week}%2Creplace"
-    
-    try:
-        scraper.navigate_to_page(url)
-        
-        players = []
-        rows = scraper.page.query_selector_all('table.tableType-player tbody tr')
-        
-        for row in rows:
-            name_elem = row.query_selector('a.playerName')
-            name = name_elem.inner_text()
-            position_team = row.query_selector('em').inner_text()
-            position, team = position_team.split(' - ')
-            projection = row.query_selector('td.stat.projected').inner_text()
-            
-            players.append({
-                'name': name,
-                'position': position,
-                'team': team,
-                'projection': float(projection) if projection else None
-            })
-        
-        return pd.DataFrame(players)
-    
-    except Exception as e:
-        print(f"Error scraping NFL: {e}")
-        return pd.DataFrame()
-    finally:
-        scraper.stop_browser()
+    return await _scrape_table(scraper, url, NFL_TABLE)
 
-def scrape_numberfire(week):
-    scraper = WebScraper()
+async def _scrape_numberfire(scraper, week):
     url = f"https://www.numberfire.com/nfl/daily-fantasy/daily-football-projections"
-    
+    return await _scrape_table(scraper, url, NUMBERFIRE_TABLE)
+
+async def _stream_fftoday(scraper, week, position='QB'):
+    # Long position lists (RB/WR) are split over several pages selected by cur_page; each page
+    # is yielded as soon as it is read, minus players an earlier page already had
+    url = f"https://www.fftoday.com/rankings/playerwkproj.php?Season=2024&GameWeek={week}&PosID={FFTODAY_POSITIONS[position]}&LeagueID=1"
+    spec = _fftoday_table(position)
+    seen = set()
+    async for page in stream_url_table(scraper, url, spec, FFTODAY_CONTENT_CHECK, start_page=0,
+                                       page_param='cur_page', ready_selector=spec.row_selector, max_pages=10):
+        keys = list(zip(page['name'], page['team']))
+        fresh = pd.Series([key not in seen for key in keys], index=page.index, dtype=bool)
+        seen.update(keys)
+        yield page[fresh].drop_duplicates(['name', 'team'])[PROJECTION_COLUMNS].reset_index(drop=True)
+
+async def _scrape_fftoday(scraper, week, position='QB'):
+    pages = [page async for page in _stream_fftoday(scraper, week, position)]
+    return pd.concat(pages, ignore_index=True)
+
+async def _scrape_cbssports(scraper, week, position='QB'):
+    url = f"https://www.cbssports.com/fantasy/football/stats/{CBSSPORTS_POSITIONS[position]}/2024/tp/projections/ppr/"
+    return await _scrape_table(scraper, url, _cbssports_table(position))
+
+SCRAPERS = [
+    ('DraftSharks', _scrape_draftsharks),
+    ('FantasyNerds', _scrape_fantasynerds),
+    ('ESPN', _scrape_espn),
+    ('NFL', _scrape_nfl),
+    ('NumberFire', _scrape_numberfire),
+    ('FFToday', _scrape_fftoday),
+    ('CBS Sports', _scrape_cbssports)
+]
+
+# Sources that yield a batch per page; every other source's whole table is a single batch
+STREAMERS = {
+    'FFToday': _stream_fftoday,
+}
+
+# Sources whose projection tables are server-rendered and can be read without a browser
+STATIC_SOURCES = {'NumberFire', 'FFToday', 'CBS Sports'}
+
+# Sources scraped once per position; their scrape functions take a ``position`` argument
+POSITIONAL_SOURCES = {
+    'FFToday': list(FFTODAY_POSITIONS),
+    'CBS Sports': list(CBSSPORTS_POSITIONS),
+}
+
+# Seconds each source may take, retries included, and seconds the whole run may take
+DEFAULT_DEADLINE = 120
+DEFAULT_BUDGET = 300
+
+# Job statuses that mean the source produced nothing it should have
+FAILED_STATUSES = ('empty', 'failed', 'timeout')
+
+class ScrapeResults(dict):
+    """
+    Dict of source name to DataFrame, as every consumer of scrape results expects, plus a
+    ``status`` dict with one entry per source: 'status' (ok, partial, cached, replayed, empty,
+    failed, timeout or skipped), 'rows', 'seconds', 'attempts', 'error' and, for sources scraped
+    per position, 'positions' with each position's status.
+
+    ``deltas`` holds, when scrape_all tracked snapshots, each source's inserted, changed and
+    removed rows since its previous scrape (see utils.delta_tools).
+    """
+    def __init__(self, frames, status, deltas=None):
+        super().__init__(frames)
+        self.status = status
+        self.deltas = deltas or {}
+
+def _with_cache(scraper, cache, key):
+    return CachedScraper(cache, key, scraper) if cache is not None else scraper
+
+async def _run_static(client, name, scraper_func, week, cache, key, fallback=True):
     try:
-        scraper.navigate_to_page(url)
-        
-        players = []
-        rows = scraper.page.query_selector_all('table.projection-table tbody tr')
-        
-        for row in rows:
-            cols = row.query_selector_all('td')
-            name = cols[1].inner_text()
-            position = cols[2].inner_text()
-            team = cols[3].inner_text()
-            projection = cols[-1].inner_text()
-            
-            players.append({
-                'name': name,
-                'position': position,
-                'team': team,
-                'projection': float(projection) if projection else None
-            })
-        
-        return pd.DataFrame(players)
-    
+        async with HttpScraper(client, source=name) as scraper:
+            df = await scraper_func(_with_cache(scraper, cache, key), week)
+        # An empty table usually means the rows are rendered by JavaScript after all
+        if not len(df):
+            raise StaticPageError(f"No rows in the static HTML for {name}")
     except Exception as e:
-        print(f"Error scraping NumberFire: {e}")
-        return pd.DataFrame()
-    finally:
-        scraper.stop_browser()
+        if not fallback:
+            raise
+        print(f"Static fetch failed for {name}, falling back to the browser: {e}")
+        get_recorder().event('static_fallback', source=name, key=key, error=type(e).__name__, message=str(e))
+        return None
+    return df
 
-def scrape_fftoday(week):
-    scraper = WebScraper()
-    url = f"https://www.fftoday.com/rankings/playerwkproj.php?Season=2024&GameWeek={week}&PosID=10&LeagueID=1"
-    
+async def _fetch(pool, client, name, scraper_func, week, static, cache, key):
+    # Without a pool there is no browser tier, and static fetch errors are the job's errors
+    if static:
+        df = await _run_static(client, name, scraper_func, week, cache, key, fallback=pool is not None)
+        if df is not None:
+            return df
+    if pool is None:
+        raise StaticPageError(f"{name} needs a browser, which this run does not use")
+    async with AsyncWebScraper(pool=pool, source=name) as scraper:
+        return await scraper_func(_with_cache(scraper, cache, key), week)
+
+async def _run_scraper(pool, client, name, scraper_func, week, static, cache=None, position='ALL', deadline=None,
+                       retry=None, skip=False):
+    # Returns (frame, status); failures become an empty frame with the reason in the status
+    key = cache_key(name, week, position)
+    metrics = get_recorder()
+    status = {'status': None, 'rows': 0, 'seconds': 0.0, 'attempts': 0, 'error': None}
+    start = time.monotonic()
+    df = pd.DataFrame()
+    with metrics.timer('scrape_source_seconds', source=name, position=position) as labels:
+        try:
+            if cache is not None:
+                cached = cache.get_frame(key, name)
+                if cached is not None:
+                    status['status'], df = 'cached', cached
+                elif cache.replay:
+                    # Re-parse the recorded payloads offline; nothing is written back in replay mode
+                    status['status'] = 'replayed'
+                    df = await scraper_func(CachedScraper(cache, key), week)
+            if status['status'] is None and skip:
+                status['status'], status['error'] = 'skipped', 'circuit open'
+            elif status['status'] is None:
+                deadline = deadline if deadline is not None else start + DEFAULT_DEADLINE
+                df = await run_with_deadline(lambda: _fetch(pool, client, name, scraper_func, week, static, cache, key),
+                                             deadline, retry, status)
+                if cache is not None and len(df):
+                    cache.put_frame(key, df)
+                status['status'] = 'ok' if len(df) else 'empty'
+        except Exception as e:
+            status['status'] = 'timeout' if isinstance(e, DeadlineExceeded) else 'failed'
+            status['error'] = status['error'] or f"{type(e).__name__}: {e}"
+            print(f"Error scraping {name} ({position}): {status['error']}")
+            metrics.increment('scrape_errors_total', source=name, error=type(e).__name__)
+            metrics.event('scrape_error', source=name, position=position, key=key, error=type(e).__name__,
+                          message=str(e), attempts=status['attempts'])
+            df = pd.DataFrame()
+        labels['status'] = status['status']
+    status['rows'] = len(df)
+    status['seconds'] = time.monotonic() - start
+    return df, status
+
+async def scrape_sources(week, sources, max_concurrent=4, pool=None, blocker=None, static_sources=STATIC_SOURCES,
+                         cache=None, positional_sources=POSITIONAL_SOURCES, deadline=DEFAULT_DEADLINE,
+                         budget=DEFAULT_BUDGET, retry=None, breaker=None, browser=True, client=None):
+    """
+    Runs the given (name, scraper) pairs concurrently.
+
+    Sources listed in ``static_sources`` are first fetched over a pooled keep-alive HTTP client
+    and parsed with lxml; everything else, and any static fetch that fails, goes through one
+    shared browser.
+
+    Every fetch runs under its source's deadline, retrying failed attempts with jittered
+    backoff, and no job runs past the global ``budget``: whatever finished in time is returned
+    and the rest is reported as timed out.
+
+    :param week: NFL week to scrape.
+    :param sources: Iterable of (name, async scraper function) pairs.
+    :param max_concurrent: Maximum number of browser contexts open at once.
+    :param pool: Optional BrowserPool to reuse; one is created and closed if omitted.
+    :param blocker: Optional RequestBlocker for a newly created pool. Defaults to blocking
+                    images, media, fonts and known ad/tracker domains.
+    :param static_sources: Names of sources to try over plain HTTP first.
+    :param cache: Optional ScrapeCache. Fresh cached frames are returned without fetching and
+                  raw payloads of new fetches are recorded.
+    :param positional_sources: Dict of source name to the positions it is fanned out over.
+                               Every position runs as its own concurrent job and the results
+                               are merged into one frame per source.
+    :param deadline: Seconds per source (every position job of it), or a dict of source name to
+                     seconds with DEFAULT_DEADLINE for the rest.
+    :param budget: Seconds for the whole run; None for no limit.
+    :param retry: RetryPolicy for failed attempts; the default allows three attempts.
+    :param breaker: Optional CircuitBreaker. Sources with an open circuit are skipped (cached
+                    frames are still served) and every fetched source's outcome is recorded.
+    :param browser: Set to False to use the HTTP tier only, with no browser fallback.
+    :param client: Optional httpx.AsyncClient to use instead of a new pooled client.
+    :return: ScrapeResults of source name to DataFrame, in the order given, with per-source status.
+    """
+    sources = list(sources)
+    if pool is None and browser:
+        blocker = blocker if blocker is not None else RequestBlocker()
+        async with BrowserPool(size=max_concurrent, blocker=blocker) as own_pool:
+            return await scrape_sources(week, sources, pool=own_pool, static_sources=static_sources, cache=cache,
+                                        positional_sources=positional_sources, deadline=deadline, budget=budget,
+                                        retry=retry, breaker=breaker, client=client)
+
+    started = time.monotonic()
+    budget_end = started + budget if budget is not None else float('inf')
+    def job_deadline(name):
+        seconds = deadline.get(name, DEFAULT_DEADLINE) if isinstance(deadline, dict) else deadline
+        return min(started + seconds, budget_end)
+
+    skipped = {name for name, _ in sources if breaker is not None and not breaker.allow(name)}
+    jobs = _expand_positions(sources, positional_sources)
+    own_client = client is None
+    client = client if client is not None else create_http_client()
     try:
-        scraper.navigate_to_page(url)
-        
-        players = []
-        rows = scraper.page.query_selector_all('table.stats tr')[2:]  # Skip header rows
-        
-        for row in rows:
-            cols = row.query_selector_all('td')
-            if len(cols) < 8:  # Skip rows without full data
-                continue
-            name = cols[1].inner_text()
-            team = cols[2].inner_text()
-            projection = cols[7].inner_text()
-            
-            players.append({
-                'name': name,
-                'position': 'QB',  # This URL is for QBs, adjust for other positions
-                'team': team,
-                'projection': float(projection) if projection else None
-            })
-        
-        return pd.DataFrame(players)
-    
-    except Exception as e:
-        print(f"Error scraping FFToday: {e}")
-        return pd.DataFrame()
+        outcomes = await asyncio.gather(*(
+            _run_scraper(pool, client, name, func, week, name in static_sources, cache, position,
+                         deadline=job_deadline(name), retry=retry, skip=name in skipped)
+            for name, func, position in jobs
+        ))
     finally:
-        scraper.stop_browser()
+        if own_client:
+            await client.aclose()
 
-def scrape_cbssports(week):
-    scraper = WebScraper()
-    url = f"https://www.cbssports.com/fantasy/football/stats/QB/2024/tp/projections/ppr/"
-    
+    frames = _merge_positions(jobs, [df for df, _ in outcomes])
+    status = _merge_status(jobs, [job_status for _, job_status in outcomes], positional_sources)
+    if breaker is not None:
+        for name, entry in status.items():
+            if entry['status'] in ('ok', 'partial'):
+                breaker.record_success(name)
+            elif entry['status'] in FAILED_STATUSES:
+                breaker.record_failure(name, entry['error'])
+    return ScrapeResults(frames, status)
+
+def _expand_positions(sources, positional_sources):
+    # One job per (source, position); non-positional sources keep a single 'ALL' job
+    jobs = []
+    for name, func in sources:
+        for position in positional_sources.get(name, ['ALL']):
+            job_func = func if position == 'ALL' else partial(func, position=position)
+            jobs.append((name, job_func, position))
+    return jobs
+
+def _merge_positions(jobs, frames):
+    results = {}
+    for (name, _, _), df in zip(jobs, frames):
+        results.setdefault(name, []).append(df)
+
+    merged = {}
+    for name, parts in results.items():
+        non_empty = [df for df in parts if len(df)]
+        merged[name] = pd.concat(non_empty, ignore_index=True) if non_empty else parts[0]
+    return merged
+
+def _merge_status(jobs, statuses, positional_sources):
+    # One status per source: the one all its jobs share, 'partial' when only some produced
+    # rows, otherwise the first job's failure
+    grouped = {}
+    for (name, _, position), status in zip(jobs, statuses):
+        grouped.setdefault(name, []).append((position, status))
+
+    merged = {}
+    for name, parts in grouped.items():
+        kinds = [status['status'] for _, status in parts]
+        rows = [status['rows'] for _, status in parts]
+        if len(set(kinds)) == 1:
+            kind = kinds[0]
+        elif all(rows):
+            kind = 'ok'  # e.g. some positions fetched and the rest served from the cache
+        elif any(rows):
+            kind = 'partial'
+        else:
+            kind = next((k for k in kinds if k in FAILED_STATUSES + ('skipped',)), kinds[0])
+        merged[name] = {
+            'status': kind,
+            'rows': sum(status['rows'] for _, status in parts),
+            'seconds': max(status['seconds'] for _, status in parts),
+            'attempts': max(status['attempts'] for _, status in parts),
+            'error': next((status['error'] for _, status in parts if status['error']), None),
+        }
+        if name in positional_sources:
+            merged[name]['positions'] = {position: status['status'] for position, status in parts}
+    return merged
+
+def _as_stream(name, scraper_func):
+    # Async generator function of a job's batches; single-page sources yield their one frame
+    streamer = STREAMERS.get(name)
+    if streamer is not None:
+        position = scraper_func.keywords.get('position') if isinstance(scraper_func, partial) else None
+        return partial(streamer, position=position) if position else streamer
+
+    async def single(scraper, week):
+        yield await scraper_func(scraper, week)
+    return single
+
+async def _stream_job(pool, client, name, scraper_func, week, static, cache, key):
+    # The tier selection of _fetch, for a stream: a static fetch that fails before its first
+    # batch falls back to the browser, but one that fails midway can't be replayed and fails the job
+    stream = _as_stream(name, scraper_func)
+    if cache is not None:
+        cached = cache.get_frame(key, name)
+        if cached is not None:
+            yield cached
+            return
+        if cache.replay:
+            async for batch in stream(CachedScraper(cache, key), week):
+                yield batch
+            return
+    if static:
+        emitted = False
+        try:
+            async with HttpScraper(client, source=name) as scraper:
+                async for batch in stream(_with_cache(scraper, cache, key), week):
+                    if len(batch):
+                        emitted = True
+                        yield batch
+            if not emitted:
+                raise StaticPageError(f"No rows in the static HTML for {name}")
+            return
+        except Exception as e:
+            if emitted or pool is None:
+                raise
+            print(f"Static fetch failed for {name}, falling back to the browser: {e}")
+            get_recorder().event('static_fallback', source=name, key=key, error=type(e).__name__, message=str(e))
+    if pool is None:
+        raise StaticPageError(f"{name} needs a browser, which this run does not use")
+    async with AsyncWebScraper(pool=pool, source=name) as scraper:
+        async for batch in stream(_with_cache(scraper, cache, key), week):
+            yield batch
+
+async def _run_stream_job(pool, client, name, scraper_func, week, static, stages, sink, executor, cache=None,
+                          position='ALL', deadline=None, skip=False):
+    # Returns the job's status; rows have already gone to the sink
+    key = cache_key(name, week, position)
+    metrics = get_recorder()
+    status = {'status': None, 'rows': 0, 'seconds': 0.0, 'attempts': 0, 'error': None}
+    start = time.monotonic()
+    with metrics.timer('scrape_source_seconds', source=name, position=position, mode='stream') as labels:
+        if skip:
+            status['status'], status['error'] = 'skipped', 'circuit open'
+        else:
+            try:
+                deadline = deadline if deadline is not None else start + DEFAULT_DEADLINE
+                status['attempts'] = 1
+                batches = _stream_job(pool, client, name, scraper_func, week, static, cache, key)
+                counts = await asyncio.wait_for(run_stream(batches, stages, sink, executor=executor, metrics=metrics,
+                                                           source=name),
+                                                max(deadline - time.monotonic(), 0))
+                status['rows'] = counts['rows']
+                status['status'] = 'ok' if counts['rows'] else 'empty'
+            except Exception as e:
+                timed_out = isinstance(e, asyncio.TimeoutError)
+                status['status'] = 'timeout' if timed_out else 'failed'
+                status['error'] = 'deadline passed while streaming' if timed_out else f"{type(e).__name__}: {e}"
+                print(f"Error streaming {name} ({position}): {status['error']}")
+                metrics.increment('scrape_errors_total', source=name, error=type(e).__name__)
+                metrics.event('scrape_error', source=name, position=position, key=key, error=type(e).__name__,
+                              message=str(e), attempts=status['attempts'])
+        labels['status'] = status['status']
+    status['seconds'] = time.monotonic() - start
+    return status
+
+async def stream_sources(week, store, sources=SCRAPERS, season=None, registry=None, max_concurrent=4, pool=None,
+                         blocker=None, static_sources=STATIC_SOURCES, cache=None, positional_sources=POSITIONAL_SOURCES,
+                         deadline=DEFAULT_DEADLINE, budget=DEFAULT_BUDGET, breaker=None, browser=True, client=None):
+    """
+    Streaming counterpart of scrape_sources: every page is normalized, resolved to a player id
+    and appended to its source's store partition as soon as it is read, instead of whole sources
+    being collected into frames first.
+
+    Memory stays flat in the number of pages, and the normalization, id resolution and Parquet
+    writes of one page overlap with fetching the next. A source's partition is replaced once
+    all its jobs finish with rows; a source with any failed, timed-out or empty job keeps its
+    last good partition.
+    Batches already written can't be taken back, so streamed jobs are not retried; the deadline
+    and budget still apply.
+
+    :param week: NFL week to scrape.
+    :param store: ProjectionStore the sources are written to.
+    :param sources: Iterable of (name, async scraper function) pairs.
+    :param season: Season to store under; defaults to the current season.
+    :param registry: PlayerRegistry the player_id column comes from. New players are added to it.
+    :return: Dict of source name to status, as in ScrapeResults.status.
+
+    The remaining parameters are those of scrape_sources.
+    """
+    sources = list(sources)
+    if pool is None and browser:
+        blocker = blocker if blocker is not None else RequestBlocker()
+        async with BrowserPool(size=max_concurrent, blocker=blocker) as own_pool:
+            return await stream_sources(week, store, sources, season=season, registry=registry, pool=own_pool,
+                                        static_sources=static_sources, cache=cache,
+                                        positional_sources=positional_sources, deadline=deadline, budget=budget,
+                                        breaker=breaker, client=client)
+
+    season = season or current_season()
+    registry = registry if registry is not None else PlayerRegistry()
+    started = time.monotonic()
+    budget_end = started + budget if budget is not None else float('inf')
+    def job_deadline(name):
+        seconds = deadline.get(name, DEFAULT_DEADLINE) if isinstance(deadline, dict) else deadline
+        return min(started + seconds, budget_end)
+
+    skipped = {name for name, _ in sources if breaker is not None and not breaker.allow(name)}
+    jobs = _expand_positions(sources, positional_sources)
+    writers = {name: store.writer(season, week, name) for name, _ in sources}
+    own_client = client is None
+    client = client if client is not None else create_http_client()
+    # One worker: stages of every job run in order, so the shared registry sees one batch at a time
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='stream')
+    statuses = None
     try:
-        scraper.navigate_to_page(url)
-        
-        players = []
-        rows = scraper.page.query_selector_all('table.TableBase-table tbody tr')
-        
-        for row in rows:
-            name_elem = row.query_selector('span.CellPlayerName--long')
-            name = name_elem.query_selector('a').inner_text()
-            team = name_elem.query_selector('span.CellPlayerName-team').inner_text()
-            projection = row.query_selector_all('td')[-1].inner_text()
-            
-            players.append({
-                'name': name,
-                'position': 'QB',  # This URL is for QBs, adjust for other positions
-                'team': team,
-                'projection': float(projection) if projection else None
-            })
-        
-        return pd.DataFrame(players)
-    
-    except Exception as e:
-        print(f"Error scraping CBS Sports: {e}")
-        return pd.DataFrame()
+        statuses = await asyncio.gather(*(
+            _run_stream_job(pool, client, name, func, week, name in static_sources,
+                            [normalize_batch, ResolveIds(registry, source=name)], writers[name].write, executor,
+                            cache, position, deadline=job_deadline(name), skip=name in skipped)
+            for name, func, position in jobs
+        ))
     finally:
-        scraper.stop_browser()
-
-def scrape_all(week):
-    scrapers = [
-        ('DraftSharks', scrape_draftsharks),
-        ('FantasyNerds', scrape_fantasynerds),
-        ('ESPN', scrape_espn),
-        ('NFL', scrape_nfl),
-        ('NumberFire', scrape_numberfire),
-        ('FFToday', scrape_fftoday),
-        ('CBS Sports', scrape_cbssports)
-    ]
-    
-    results = {}
-    for name, scraper_func in scrapers:
-        df = scraper_func(week)
-        results[name] = df
-        print(f"\n{name} data:")
+        executor.shutdown(wait=True)
+        if own_client:
+            await client.aclose()
+        # A partition is only swapped in when every job of its source streamed rows; otherwise
+        # the staged rows are dropped and the previous partition stays
+        failed = {name for (name, _, _), status in zip(jobs, statuses or [{}] * len(jobs))
+                  if status.get('status') != 'ok'}
+        for name, writer in writers.items():
+            if name in failed:
+                writer.abort()
+            else:
+                writer.close()
+
+    status = _merge_status(jobs, statuses, positional_sources)
+    if breaker is not None:
+        for name, entry in status.items():
+            if entry['status'] in ('ok', 'partial'):
+                breaker.record_success(name)
+            elif entry['status'] in FAILED_STATUSES:
+                breaker.record_failure(name, entry['error'])
+    return status
+
+def _scrape_one(name, week):
+    scraper_func = dict(SCRAPERS)[name]
+    return asyncio.run(scrape_sources(week, [(name, scraper_func)], max_concurrent=1))[name]
+
+def scrape_draftsharks(week):
+    return _scrape_one('DraftSharks', week)
+
+def scrape_fantasynerds(week):
+    return _scrape_one('FantasyNerds', week)
+
+def scrape_espn(week):
+    return _scrape_one('ESPN', week)
+
+def scrape_nfl(week):
+    return _scrape_one('NFL', week)
+
+def scrape_numberfire(week):
+    return _scrape_one('NumberFire', week)
+
+def scrape_fftoday(week):
+    return _scrape_one('FFToday', week)
+
+def scrape_cbssports(week):
+    return _scrape_one('CBS Sports', week)
+
+def track_deltas(results, tracker, season, week, alert_threshold=DEFAULT_ALERT_THRESHOLD):
+    """
+    Diffs every scraped source against its last snapshot, stores the deltas on
+    ``results.deltas`` and reports projections that moved at least ``alert_threshold`` points.
+
+    :return: Frame of the movement alerts across all sources.
+    """
+    metrics = get_recorder()
+    for name, df in results.items():
+        status = results.status[name]['status']
+        if status in FAILED_STATUSES + ('skipped',):
+            continue
+        deltas = tracker.update(name, df, season, week, complete=status != 'partial')
+        results.deltas[name] = deltas
+        for change, count in deltas['change'].value_counts().items():
+            metrics.increment('projection_changes_total', int(count), source=name, change=change)
+
+    moved = [alerts for alerts in (movement_alerts(deltas, alert_threshold) for deltas in results.deltas.values()) if len(alerts)]
+    alerts = pd.concat(moved, ignore_index=True) if moved else pd.DataFrame()
+    for alert in alerts.itertuples():
+        print(f"{alert.source}: {alert.name} ({alert.position}) moved {alert.delta:+.1f} to {alert.projection:.1f}")
+        metrics.event('projection_moved', source=alert.source, week=week, name=alert.name, position=alert.position,
+                      team=alert.team, previous=alert.previous_projection, projection=alert.projection, delta=alert.delta)
+    return alerts
+
+def scrape_all(week, max_concurrent=4, cache=None, replay=False, store=None, season=None, deadline=DEFAULT_DEADLINE,
+               budget=DEFAULT_BUDGET, breaker=None, tracker=None, alert_threshold=DEFAULT_ALERT_THRESHOLD):
+    """
+    Scrapes every source for a week and returns whatever completed within the budget.
+
+    :param week: NFL week to scrape.
+    :param max_concurrent: Maximum number of browser contexts open at once.
+    :param cache: ScrapeCache to use. Defaults to one under data/cache; pass False to disable.
+    :param replay: Serve everything from the default cache without touching the network.
+    :param store: Optional ProjectionStore the complete results are written to; partial and
+                  failed sources keep their last good partition. With a tracker, sources
+                  that did not change since the last scrape are not rewritten.
+    :param season: Season the results are stored under; defaults to the current season.
+    :param deadline: Seconds per source, or a dict of source name to seconds.
+    :param budget: Seconds for the whole refresh.
+    :param breaker: CircuitBreaker to skip recently failing sources with. Defaults to one kept
+                    next to the cache; pass False to disable.
+    :param tracker: DeltaTracker keeping each source's last snapshot. Defaults to one kept next
+                    to the cache (not in replay mode); pass False to disable.
+    :param alert_threshold: Points a projection must move between scrapes to be reported.
+    :return: ScrapeResults; ``results.status`` says how each source fared and ``results.deltas``
+             what changed since the previous scrape.
+
+    Stage timings, row counts and failures go to the process-wide MetricsRecorder; set
+    DRAFT_METRICS_PATH and DRAFT_METRICS_PROM to keep them as JSON lines and a Prometheus snapshot.
+    """
+    season = season or current_season()
+    if cache is None:
+        cache = ScrapeCache(replay=replay)
+    if breaker is None and cache and not cache.replay:
+        breaker = CircuitBreaker(os.path.join(cache.root, 'breakers.json'))
+    if tracker is None and cache and not cache.replay:
+        tracker = DeltaTracker(os.path.join(cache.root, 'snapshots'))
+    results = asyncio.run(scrape_sources(week, SCRAPERS, max_concurrent=max_concurrent, cache=cache or None,
+                                         deadline=deadline, budget=budget, breaker=breaker or None))
+    if tracker:
+        track_deltas(results, tracker, season, week, alert_threshold)
+    if store is not None:
+        unchanged = {name for name, deltas in results.deltas.items()
+                     if not len(deltas) and store.has_partition(season, week, name)}
+        # A partial source is missing positions, so writing it would truncate a complete partition
+        complete = {name: df for name, df in results.items()
+                    if results.status[name]['status'] not in ('partial',) + FAILED_STATUSES and name not in unchanged}
+        store.write_sources(complete, season, week)
+
+    metrics = get_recorder()
+    for name, df in results.items():
+        status = results.status[name]
+        print(f"\n{name} data ({status['status']}, {status['seconds']:.1f}s, {status['attempts']} attempts):")
+        if status['error']:
+            print(f"Last error: {status['error']}")
+        if name in results.deltas:
+            changes = results.deltas[name]['change'].value_counts()
+            print("Changes since the last scrape: " + ', '.join(f"{changes.get(kind, 0)} {kind}" for kind in ('insert', 'change', 'remove')))
         print(df.head())
         print(f"Total players scraped from {name}: {len(df)}")
-    
+        metrics.event('scrape_result', source=name, week=week, **status)
+    metrics.flush()
+
     return results
 
+def stream_all(week, store=None, season=None, registry=None, max_concurrent=4, cache=None, replay=False,
+               deadline=DEFAULT_DEADLINE, budget=DEFAULT_BUDGET, breaker=None):
+    """
+    Streams every source for a week straight into a ProjectionStore with stream_sources.
+
+    :param store: ProjectionStore to write to; defaults to one under data/store.
+    :param registry: PlayerRegistry for the player_id column; defaults to an empty one.
+    :return: Dict of source name to status. Read the rows back with store.read_sources.
+
+    The other parameters are those of scrape_all.
+    """
+    store = store if store is not None else ProjectionStore()
+    if cache is None:
+        cache = ScrapeCache(replay=replay)
+    if breaker is None and cache and not cache.replay:
+        breaker = CircuitBreaker(os.path.join(cache.root, 'breakers.json'))
+    status = asyncio.run(stream_sources(week, store, season=season, registry=registry, max_concurrent=max_concurrent,
+                                        cache=cache or None, deadline=deadline, budget=budget,
+                                        breaker=breaker or None))
+
+    metrics = get_recorder()
+    for name, entry in status.items():
+        print(f"{name}: {entry['status']}, {entry['rows']} rows in {entry['seconds']:.1f}s"
+              + (f" (last error: {entry['error']})" if entry['error'] else ''))
+        metrics.event('scrape_result', source=name, week=week, mode='stream', **entry)
+    metrics.flush()
+    return status
+
+def build_consensus(results, projections=None, weights=None, position_weights=None):
+    """
+    Aligns scraped sources on player id and aggregates them into a ConsensusAggregator.
+
+    :param results: Dict of source name to DataFrame, as returned by scrape_all. Empty frames
+                    (failed sources) are recorded as missing.
+    :param projections: Optional fantasy_rankings frame to seed the registry with, so the
+                        consensus can be applied to it with apply_consensus.
+    :param weights: Dict of source name to weight.
+    :param position_weights: Dict of (source, position) to weight.
+    """
+    registry = PlayerRegistry.from_rankings(projections) if projections is not None else PlayerRegistry()
+    aggregator = ConsensusAggregator(registry, weights=weights, position_weights=position_weights)
+    for name, df in results.items():
+        aggregator.add_source(name, df)
+    return aggregator
+
+def update_consensus(aggregator, results):
+    """
+    Folds a re-scrape's deltas (ScrapeResults.deltas from scrape_all) into an existing consensus
+    instead of rebuilding it. Sources without deltas (failed, or not tracked) are left as they are.
+
+    :return: Registry ids of every player whose consensus may have moved; pass them to
+             consensus_tools.refresh_consensus to update a projections frame and its VOR.
+    """
+    touched = [aggregator.apply_deltas(name, deltas) for name, deltas in results.deltas.items()]
+    return np.unique(np.concatenate(touched)) if touched else np.array([], dtype=int)
+
 # Test all functions
 if __name__ == "__main__":
     week = 1
-    all_data = scrape_all(week)
\ No newline at end of file
+    all_data = scrape_all(week, store=ProjectionStore())
+    consensus = build_consensus(all_data)
+    print("\nConsensus projections:")
+    print(consensus.result().head(20))
+    print(f"Source status: {consensus.status}")
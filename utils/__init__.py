@@ -0,0 +1,4 @@
+import os
+
+# Data files live next to the package, so default paths do not depend on the working directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
@@ -0,0 +1,203 @@
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import pandas as pd
+from lxml import html as lxml_html
+from utils import DATA_DIR
+from utils.scrape_tools import paginate_url
+
+# Projections move slowly early in the week and quickly near kickoff; these are conservative defaults
+DEFAULT_TTL = 6 * 3600
+SOURCE_TTLS = {
+    'ESPN': 2 * 3600,
+    'NFL': 2 * 3600,
+    'FantasyNerds': 3 * 3600,
+}
+
+class CacheMiss(Exception):
+    """
+    Raised in replay mode when a payload was never recorded.
+    """
+
+def cache_key(source, week, position='ALL', scoring='ppr'):
+    """
+    Builds the on-disk key for one scrape: (source, week, position, scoring format).
+    """
+    slug = re.sub(r'[^a-z0-9]+', '-', source.lower()).strip('-')
+    return f"{slug}/week-{week}/{position.lower().replace('/', '')}-{scoring.lower()}"
+
+class ScrapeCache:
+    """
+    On-disk cache of raw page payloads and parsed DataFrames.
+
+    Each key holds the raw HTML/JSON of every URL visited for that scrape plus the final frame.
+    Entries expire after a per-source TTL, the least recently used entries are evicted once the
+    cache grows past ``max_bytes``, and ``replay=True`` serves everything from disk without
+    touching the network (entries never expire in replay mode).
+
+    :param root: Directory holding the cache.
+    :param ttls: Optional dict of source name to TTL in seconds, merged over SOURCE_TTLS.
+    :param default_ttl: TTL for sources not listed in ``ttls``.
+    :param max_bytes: Size bound for the whole cache directory.
+    :param replay: Serve only from the cache and never fetch.
+    """
+    def __init__(self, root=os.path.join(DATA_DIR, 'cache'), ttls=None, default_ttl=DEFAULT_TTL, max_bytes=200 * 1024 * 1024, replay=False):
+        self.root = root
+        self.ttls = dict(SOURCE_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.replay = replay
+        os.makedirs(self.root, exist_ok=True)
+
+    def _dir(self, key):
+        return os.path.join(self.root, key)
+
+    def _meta_path(self, key):
+        return os.path.join(self._dir(key), 'meta.json')
+
+    def _read_meta(self, key):
+        try:
+            with open(self._meta_path(key)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, key, meta):
+        os.makedirs(self._dir(key), exist_ok=True)
+        with open(self._meta_path(key), 'w') as file:
+            json.dump(meta, file)
+
+    def is_fresh(self, key, source):
+        meta = self._read_meta(key)
+        if meta is None:
+            return False
+        if self.replay:
+            return True
+        return time.time() - meta['created'] < self.ttls.get(source, self.default_ttl)
+
+    def get_frame(self, key, source):
+        """
+        Returns the cached DataFrame for a key, or None when it is missing or expired.
+        """
+        path = os.path.join(self._dir(key), 'frame.pkl')
+        if not os.path.exists(path) or not self.is_fresh(key, source):
+            return None
+        os.utime(self._meta_path(key))  # Mark as recently used for eviction
+        return pd.read_pickle(path)
+
+    def put_frame(self, key, df):
+        meta = self._read_meta(key) or {'urls': {}}
+        meta['created'] = time.time()
+        self._write_meta(key, meta)
+        df.to_pickle(os.path.join(self._dir(key), 'frame.pkl'))
+        self.evict()
+
+    def get_raw(self, key, url, kind='html'):
+        meta = self._read_meta(key)
+        name = meta and meta['urls'].get(f"{kind} {url}")
+        if not name:
+            raise CacheMiss(f"No recorded payload for {url} under {key}")
+        with open(os.path.join(self._dir(key), name), encoding='utf-8') as file:
+            return file.read()
+
+    def put_raw(self, key, url, payload, kind='html'):
+        meta = self._read_meta(key) or {'urls': {}, 'created': time.time()}
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + ('.json' if kind == 'json' else '.html')
+        os.makedirs(self._dir(key), exist_ok=True)
+        with open(os.path.join(self._dir(key), name), 'w', encoding='utf-8') as file:
+            file.write(payload if isinstance(payload, str) else json.dumps(payload))
+        meta['urls'][f"{kind} {url}"] = name
+        self._write_meta(key, meta)
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            if 'meta.json' in filenames:
+                size = sum(os.path.getsize(os.path.join(dirpath, name)) for name in filenames)
+                yield dirpath, os.path.getmtime(os.path.join(dirpath, 'meta.json')), size
+
+    def evict(self):
+        """
+        Removes least recently used entries until the cache fits in ``max_bytes``.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+class CachedScraper:
+    """
+    Sits between a scrape function and its scraper, recording raw payloads as they are read.
+
+    With ``scraper=None`` it replays recorded payloads instead: pages are re-parsed from the
+    saved HTML with lxml and captured JSON is returned from disk, so scrape functions run
+    fully offline.
+
+    :param cache: ScrapeCache to record into or replay from.
+    :param key: Key from cache_key for this scrape.
+    :param scraper: Live AsyncWebScraper or HttpScraper, or None to replay.
+    """
+    def __init__(self, cache, key, scraper=None):
+        self.cache = cache
+        self.key = key
+        self.scraper = scraper
+        self.url = None
+        # Only the current page's parsed tree is kept, so paginated replays stay flat in memory
+        self._tree_url = None
+        self._tree = None
+
+    @property
+    def page(self):
+        return self.scraper.page
+
+    async def navigate_to_page(self, url, ready_selector=None, timeout=30000):
+        self.url = url
+        if self.scraper is not None:
+            await self.scraper.navigate_to_page(url, ready_selector=ready_selector, timeout=timeout)
+
+    async def wait_until_ready(self, ready_selector=None, timeout=30000):
+        if self.scraper is not None:
+            await self.scraper.wait_until_ready(ready_selector, timeout)
+
+    async def capture_json(self, url, url_pattern, timeout=15000):
+        self.url = url
+        if self.scraper is None:
+            return json.loads(self.cache.get_raw(self.key, url, kind='json'))
+        payload = await self.scraper.capture_json(url, url_pattern, timeout=timeout)
+        self.cache.put_raw(self.key, url, payload, kind='json')
+        return payload
+
+    def _replay_tree(self):
+        if self._tree_url != self.url:
+            self._tree = lxml_html.fromstring(self.cache.get_raw(self.key, self.url))
+            self._tree_url = self.url
+        return self._tree
+
+    async def has_selector(self, selector):
+        if self.scraper is None:
+            return bool(self._replay_tree().cssselect(selector))
+        return await self.scraper.has_selector(selector)
+
+    async def paginate_scrape_url(self, base_url, scrape_function, content_check, start_page=1, page_param='page',
+                                  ready_selector=None, max_pages=None):
+        # Routed through this wrapper so every page is recorded or replayed
+        await paginate_url(self, base_url, scrape_function, content_check, start_page, page_param, ready_selector, max_pages)
+
+    async def extract_table(self, spec):
+        if self.scraper is None:
+            return spec.parse_html(self._replay_tree())
+        # Record the DOM as it is at extraction time, after any client-side rendering
+        if getattr(self.scraper, 'html', None) is not None:
+            html = self.scraper.html
+        else:
+            html = await self.scraper.page.content()
+        self.cache.put_raw(self.key, self.url, html)
+        return await self.scraper.extract_table(spec)
+
+    def timing_stats(self):
+        return self.scraper.timing_stats() if self.scraper is not None else {}
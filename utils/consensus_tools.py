@@ -0,0 +1,251 @@
+import numpy as np
+import pandas as pd
+from utils.draft_tools import position_baselines, VOR_POSITIONS, REPLACEMENT_RANK
+from utils.registry_tools import PlayerRegistry, normalize_position
+
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+class ConsensusAggregator:
+    """
+    Weighted consensus of projections from many sources, aligned on registry player ids.
+
+    Values live in a players x sources matrix, next to running per-player sums of w and w*x.
+    Adding, removing or re-weighting a source only touches that source's column and the sums,
+    so a source that failed (an empty frame) or arrives late never forces a recompute of
+    the others. result() derives consensus, spread and quantiles for every player in one
+    vectorized pass over the matrix.
+
+    :param registry: PlayerRegistry to align rows with; unknown players are registered. A new
+                     registry is created if omitted.
+    :param weights: Dict of source name to weight (default 1).
+    :param position_weights: Dict of (source, position) to weight, overriding ``weights``.
+    :param quantiles: Quantiles reported for every player.
+    :param value_col: Column of each source frame holding the projection.
+    """
+    def __init__(self, registry=None, weights=None, position_weights=None, quantiles=DEFAULT_QUANTILES,
+                 value_col='projection'):
+        self.registry = registry if registry is not None else PlayerRegistry()
+        self.weights = dict(weights or {})
+        self.position_weights = dict(position_weights or {})
+        self.quantiles = quantiles
+        self.value_col = value_col
+        self.sources = []
+        self.status = {}
+        self._values = np.full((0, 0), np.nan)
+        self._sum_w = np.zeros(0)
+        self._sum_wx = np.zeros(0)
+
+    def _grow(self, players, sources):
+        rows, cols = self._values.shape
+        if players > rows or sources > cols:
+            values = np.full((max(players, rows), max(sources, cols)), np.nan)
+            values[:rows, :cols] = self._values
+            self._values = values
+            pad = max(players, rows) - rows
+            self._sum_w = np.concatenate([self._sum_w, np.zeros(pad)])
+            self._sum_wx = np.concatenate([self._sum_wx, np.zeros(pad)])
+
+    def _column_weights(self, name):
+        # Weight of this source for every registered player, by the player's position
+        positions = np.array(self.registry.positions[:self._values.shape[0]], dtype=object)
+        weights = np.full(len(positions), float(self.weights.get(name, 1.0)))
+        for (source, pos), weight in self.position_weights.items():
+            if source == name:
+                weights[positions == normalize_position(pos)] = weight
+        return weights
+
+    def _accumulate(self, column, sign):
+        values = self._values[:, column]
+        present = ~np.isnan(values)
+        weights = np.where(present, self._column_weights(self.sources[column]), 0.0)
+        values = np.where(present, values, 0.0)
+        self._sum_w += sign * weights
+        self._sum_wx += sign * weights * values
+
+    def add_source(self, name, frame, name_col='name', pos_col='position', team_col='team'):
+        """
+        Adds (or replaces) one source. An empty frame marks the source as missing and leaves
+        the consensus of the other sources untouched.
+        """
+        if name in self.sources:
+            self.remove_source(name)
+        if frame is None or not len(frame) or self.value_col not in frame:
+            self.status[name] = 'missing'
+            return
+
+        ids = self.registry.resolve(frame, name_col, pos_col, team_col, source=name, add=True)
+        values = pd.to_numeric(frame[self.value_col], errors='coerce')
+        # A player listed twice by one source (e.g. on two pages) counts once, at their mean
+        per_player = values.groupby(ids.to_numpy()).mean().dropna()
+
+        if name not in self.sources:
+            self.sources.append(name)
+        column = self.sources.index(name)
+        self._grow(len(self.registry), len(self.sources))
+        self._values[:, column] = np.nan
+        self._values[per_player.index.to_numpy(dtype=int), column] = per_player.to_numpy()
+        self._accumulate(column, 1)
+        self.status[name] = 'ok'
+
+    def apply_deltas(self, name, deltas, name_col='name', pos_col='position', team_col='team'):
+        """
+        Updates one source from a DeltaTracker delta frame: only the inserted, changed and
+        removed players' cells and their share of the running sums are touched.
+
+        :return: Registry ids of the players whose consensus may have moved.
+        """
+        if deltas is None or not len(deltas):
+            return np.array([], dtype=int)
+        ids = self.registry.resolve(deltas, name_col, pos_col, team_col, source=name, add=True)
+        values = pd.to_numeric(deltas[self.value_col], errors='coerce').where(deltas['change'] != 'remove')
+        # The last delta of a player wins, as the last snapshot row does
+        updates = pd.Series(values.to_numpy(), index=ids.to_numpy()).loc[lambda s: s.index.notna()]
+        updates = updates[~updates.index.duplicated(keep='last')]
+
+        if name not in self.sources:
+            self.sources.append(name)
+        column = self.sources.index(name)
+        self._grow(len(self.registry), len(self.sources))
+        rows = updates.index.to_numpy(dtype=int)
+        weights = self._column_weights(name)[rows]
+        new = updates.to_numpy(dtype=float)
+        # Take the old cells out of the sums and put the new ones in
+        for cells, sign in ((self._values[rows, column], -1), (new, 1)):
+            present = ~np.isnan(cells)
+            self._sum_w[rows] += sign * np.where(present, weights, 0.0)
+            self._sum_wx[rows] += sign * weights * np.where(present, cells, 0.0)
+        self._values[rows, column] = new
+        self.status[name] = 'ok' if (~np.isnan(self._values[:, column])).any() else 'missing'
+        return rows
+
+    def player_stats(self, ids):
+        """
+        (consensus, spread) arrays for just the given player ids, from the running sums, without
+        the full result() pass. Players nobody projects get NaN.
+        """
+        ids = np.asarray(ids, dtype=int)
+        self._grow(len(self.registry), len(self.sources))
+        values = self._values[ids, :len(self.sources)]
+        weights = np.column_stack([self._column_weights(name)[ids] for name in self.sources]) if self.sources else np.zeros_like(values)
+        weights = np.where(np.isnan(values), 0.0, weights)
+        known = self._sum_w[ids] > 1e-12
+        sum_w = np.where(known, self._sum_w[ids], 1)
+        mean = self._sum_wx[ids] / sum_w
+        deviation = np.where(np.isnan(values), 0.0, values - mean[:, None])
+        spread = np.sqrt((weights * deviation ** 2).sum(axis=1) / sum_w)
+        return np.where(known, mean, np.nan), np.where(known, spread, np.nan)
+
+    def remove_source(self, name):
+        if name not in self.sources:
+            return
+        column = self.sources.index(name)
+        self._accumulate(column, -1)
+        self._values[:, column] = np.nan
+        self.status[name] = 'removed'
+
+    def set_weight(self, name, weight, position=None):
+        """
+        Changes a source's weight (for one position, or overall) and updates only its share of
+        the running sums.
+        """
+        column = self.sources.index(name) if name in self.sources else None
+        if column is not None:
+            self._accumulate(column, -1)
+        if position is None:
+            self.weights[name] = weight
+        else:
+            self.position_weights[(name, position)] = weight
+        if column is not None:
+            self._accumulate(column, 1)
+
+    def _quantiles(self, values, weights):
+        # Weighted quantiles row by row: sort each player's values, walk the cumulative weight
+        order = np.argsort(np.where(np.isnan(values), np.inf, values), axis=1)
+        sorted_values = np.take_along_axis(values, order, axis=1)
+        cumulative = np.cumsum(np.take_along_axis(weights, order, axis=1), axis=1)
+        total = cumulative[:, -1:] if cumulative.shape[1] else np.zeros((len(values), 1))
+        out = {}
+        for q in self.quantiles:
+            at = (cumulative >= q * total).argmax(axis=1) if cumulative.shape[1] else np.zeros(len(values), dtype=int)
+            picked = sorted_values[np.arange(len(values)), at] if sorted_values.shape[1] else np.full(len(values), np.nan)
+            out[f"q{int(round(q * 100))}"] = np.where(total[:, 0] > 0, picked, np.nan)
+        return out
+
+    def result(self):
+        """
+        One row per player with at least one projection: player_id, player, pos, team,
+        consensus (weighted mean), spread (weighted standard deviation), sources (count) and
+        the configured quantiles.
+        """
+        values = self._values[:, :len(self.sources)]
+        weights = np.column_stack([self._column_weights(name) for name in self.sources]) if self.sources else np.zeros_like(values)
+        weights = np.where(np.isnan(values), 0.0, weights)
+
+        # Spread is taken around the running mean directly from the matrix, which stays exact
+        # however many sources were added and removed
+        ids = np.flatnonzero(self._sum_w > 1e-12)
+        mean = self._sum_wx / np.where(self._sum_w > 1e-12, self._sum_w, 1)
+        deviation = np.where(np.isnan(values), 0.0, values - mean[:, None])
+        spread = np.sqrt((weights * deviation ** 2).sum(axis=1) / np.where(self._sum_w > 1e-12, self._sum_w, 1))
+        frame = pd.DataFrame({
+            'player_id': ids,
+            'player': [self.registry.names[i] for i in ids],
+            'pos': [self.registry.positions[i] for i in ids],
+            'team': [self.registry.teams[i] for i in ids],
+            'consensus': mean[ids],
+            'spread': spread[ids],
+            'sources': (~np.isnan(values[ids])).sum(axis=1),
+        })
+        for column, quantile in self._quantiles(values[ids], weights[ids]).items():
+            frame[column] = quantile
+        return frame.sort_values('consensus', ascending=False, kind='stable').reset_index(drop=True)
+
+def apply_consensus(projections, aggregator, keep_missing=False):
+    """
+    Projections frame for DraftState/VOR driven by a consensus: 'consensus' and 'spread'
+    columns are added and pts_over_replacement becomes consensus points over the replacement
+    level of each position.
+
+    The aggregator's registry must be PlayerRegistry.from_rankings(projections), so ids are row
+    positions; they are kept in a 'player_id' column for refresh_consensus. Players without any
+    projection are dropped unless ``keep_missing`` is set, in which case they keep their
+    original pts_over_replacement.
+    """
+    projections = projections.reset_index(drop=True)
+    consensus = aggregator.result().set_index('player_id').reindex(range(len(projections)))
+    projections = projections.assign(player_id=np.arange(len(projections)),
+                                     consensus=consensus['consensus'].to_numpy(),
+                                     spread=consensus['spread'].to_numpy())
+
+    known = projections['consensus'].notna()
+    baseline = position_baselines(projections[known], value_col='consensus', positions=VOR_POSITIONS,
+                                  replacement_rank=REPLACEMENT_RANK)
+    over = projections['consensus'] - projections['pos'].map(baseline)
+    projections['pts_over_replacement'] = over.where(known, projections['pts_over_replacement'])
+    if not keep_missing:
+        projections = projections[known & projections['pts_over_replacement'].notna()].reset_index(drop=True)
+    return projections
+
+def refresh_consensus(projections, aggregator, ids):
+    """
+    Incremental apply_consensus for the players in ``ids`` (e.g. returned by apply_deltas):
+    their consensus, spread and pts_over_replacement are updated in place and nothing else is
+    recomputed.
+
+    Each position keeps the replacement level it had when apply_consensus built the frame.
+    That shifts a whole position by a constant, which value over replacement cancels out, so
+    VorEngine values stay exact.
+
+    :return: Row positions of ``projections`` that changed, for DraftState.update_points.
+    """
+    rows = np.flatnonzero(projections['player_id'].isin(np.asarray(ids)).to_numpy())
+    if not len(rows):
+        return rows
+    player_ids = projections['player_id'].to_numpy()[rows]
+    consensus, spread = aggregator.player_stats(player_ids)
+    offset = (projections['consensus'] - projections['pts_over_replacement']).to_numpy()[rows]
+    columns = [projections.columns.get_loc(name) for name in ('consensus', 'spread', 'pts_over_replacement')]
+    projections.iloc[rows, columns[0]] = consensus
+    projections.iloc[rows, columns[1]] = spread
+    projections.iloc[rows, columns[2]] = consensus - offset
+    return rows
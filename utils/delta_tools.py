@@ -0,0 +1,142 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+from utils import DATA_DIR
+from utils.registry_tools import normalize_name, normalize_position
+
+CHANGE_KINDS = ('insert', 'change', 'remove')
+DELTA_COLUMNS = ['source', 'key', 'change', 'name', 'position', 'team', 'projection', 'previous_projection', 'delta']
+
+# Points a projection has to move between scrapes to raise an alert
+DEFAULT_ALERT_THRESHOLD = 3.0
+
+def player_keys(frame, name_col='name', pos_col='position'):
+    """
+    Key identifying each row's player from one scrape to the next: normalized name and position.
+    Team is left out, so a traded player shows up as a change rather than a remove plus an insert.
+    """
+    names = frame[name_col].map(normalize_name)
+    positions = frame[pos_col].map(normalize_position).fillna('') if pos_col in frame else ''
+    return names.astype(str) + '|' + positions.astype(str)
+
+def row_hashes(frame, columns, decimals=2):
+    """
+    64-bit hash of every row's ``columns``, with floats rounded to ``decimals`` so re-scrapes that
+    only differ in float noise hash the same.
+    """
+    values = frame[list(columns)].copy()
+    for column in values.columns:
+        if pd.api.types.is_float_dtype(values[column]):
+            values[column] = values[column].round(decimals)
+        elif not pd.api.types.is_numeric_dtype(values[column]):
+            values[column] = values[column].astype(object).where(values[column].notna(), None).astype(str)
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+def diff_snapshots(previous, current, value_col='projection'):
+    """
+    Rows of ``current`` that are new ('insert') or hash differently ('change') and rows of
+    ``previous`` that are gone ('remove'), compared on 'key' and 'hash'. Removed rows carry their
+    last values; 'previous_projection' and 'delta' are filled for changed rows.
+    """
+    prev = previous.set_index('key')
+    cur = current.set_index('key')
+    common = cur.index.intersection(prev.index)
+    changed = common[cur.loc[common, 'hash'].to_numpy() != prev.loc[common, 'hash'].to_numpy()]
+
+    inserts = cur.loc[cur.index.difference(prev.index)].assign(change='insert')
+    changes = cur.loc[changed].assign(change='change', previous_projection=prev.loc[changed, value_col])
+    removes = prev.loc[prev.index.difference(cur.index)].assign(change='remove', previous_projection=lambda f: f[value_col])
+    removes[value_col] = np.nan
+
+    parts = [part for part in (inserts, changes, removes) if len(part)]
+    if not parts:
+        return pd.DataFrame(columns=[c for c in DELTA_COLUMNS if c != 'source'])
+    deltas = pd.concat(parts).drop(columns='hash').rename_axis('key').reset_index()
+    if 'previous_projection' not in deltas:
+        deltas['previous_projection'] = np.nan
+    deltas['delta'] = deltas[value_col] - deltas['previous_projection']
+    return deltas
+
+def movement_alerts(deltas, threshold=DEFAULT_ALERT_THRESHOLD, relative=None):
+    """
+    Changed rows whose projection moved by at least ``threshold`` points, or with ``relative`` set
+    also by at least that fraction of the previous projection, largest moves first.
+    """
+    if not len(deltas):
+        return deltas
+    changed = deltas[deltas['change'] == 'change']
+    moved = changed['delta'].abs() >= threshold
+    if relative is not None:
+        moved |= changed['delta'].abs() >= relative * changed['previous_projection'].abs()
+    alerts = changed[moved]
+    return alerts.iloc[np.argsort(-alerts['delta'].abs().to_numpy(), kind='stable')].reset_index(drop=True)
+
+class DeltaTracker:
+    """
+    Keeps each source's last scraped snapshot on disk, keyed and hashed per player, and turns
+    every new scrape into a delta frame of only the inserted, changed and removed rows.
+
+    Snapshots are Parquet files under ``root``/<season>/week-<week>/, one per source. An empty
+    frame (a failed scrape) produces no deltas and keeps the snapshot, so an outage never looks
+    like every player being removed.
+
+    :param root: Directory holding the snapshots.
+    :param value_col: Projection column reported in 'projection', 'previous_projection' and 'delta'.
+    :param decimals: Float precision rows are hashed at.
+    """
+    def __init__(self, root=os.path.join(DATA_DIR, 'cache', 'snapshots'), value_col='projection', decimals=2):
+        self.root = root
+        self.value_col = value_col
+        self.decimals = decimals
+
+    def _path(self, source, season, week):
+        slug = re.sub(r'[^a-z0-9]+', '-', source.lower()).strip('-')
+        return os.path.join(self.root, str(season), f"week-{week}", f"{slug}.parquet")
+
+    def snapshot(self, source, season, week):
+        """
+        The last snapshot of a source (its rows plus 'key' and 'hash'), or None.
+        """
+        path = self._path(source, season, week)
+        return pd.read_parquet(path) if os.path.exists(path) else None
+
+    def _save(self, snapshot, source, season, week):
+        path = self._path(source, season, week)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        snapshot.to_parquet(temp_path, index=False)
+        os.replace(temp_path, path)
+
+    def _keyed(self, frame):
+        frame = frame.reset_index(drop=True)
+        frame = frame.assign(key=player_keys(frame))
+        frame = frame[frame['key'].str.len() > 1].drop_duplicates('key', keep='last')
+        columns = [column for column in frame.columns if column != 'key']
+        return frame.assign(hash=row_hashes(frame, columns, self.decimals))
+
+    def update(self, source, frame, season, week, complete=True):
+        """
+        Diffs a fresh scrape against the source's last snapshot and makes it the new snapshot.
+
+        :param complete: False when only part of the source was scraped (e.g. some positions
+                         failed); players at positions missing from ``frame`` are then kept
+                         rather than reported as removed.
+        :return: Delta frame with DELTA_COLUMNS (plus any other columns the source has).
+        """
+        if frame is None or not len(frame):
+            return pd.DataFrame(columns=DELTA_COLUMNS)
+        current = self._keyed(frame)
+        previous = self.snapshot(source, season, week)
+        if previous is None:
+            previous = current.iloc[:0]
+        elif not complete and 'position' in current:
+            scraped = set(current['position'].map(normalize_position).dropna())
+            kept = previous[~previous['position'].map(normalize_position).isin(scraped)]
+            current = pd.concat([current, kept[~kept['key'].isin(current['key'])]], ignore_index=True)
+
+        deltas = diff_snapshots(previous, current, self.value_col)
+        if len(deltas) or len(previous) != len(current):
+            self._save(current, source, season, week)
+        deltas.insert(0, 'source', source)
+        return deltas
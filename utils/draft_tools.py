@@ -0,0 +1,293 @@
+import numpy as np
+import pandas as pd
+
+VOR_POSITIONS = ['QB', 'RB', 'WR', 'TE']
+
+# The replacement player is the last starter in a 12-team league; scarcity looks at the top 10 left
+REPLACEMENT_RANK = 12
+SCARCITY_DEPTH = 10
+
+def _ranked(players, value_col, positions):
+    # One sort of the pool, then each player's rank within their position
+    pool = players.loc[players['pos'].isin(positions), ['pos', value_col]]
+    pool = pool.sort_values(value_col, ascending=False, kind='stable')
+    return pool, pool.groupby('pos', sort=False).cumcount()
+
+def position_baselines(players, value_col='pts_over_replacement', positions=VOR_POSITIONS, replacement_rank=REPLACEMENT_RANK):
+    """
+    Replacement-level value per position: the lowest value among each position's top
+    ``replacement_rank`` players, computed in one grouped pass.
+    """
+    pool, rank = _ranked(players, value_col, positions)
+    return pool[rank < replacement_rank].groupby('pos')[value_col].min().reindex(positions)
+
+def positional_scarcity(players, value_col='pts_over_replacement', positions=VOR_POSITIONS, depth=SCARCITY_DEPTH):
+    """
+    Mean value of the top ``depth`` players left at each position.
+    """
+    pool, rank = _ranked(players, value_col, positions)
+    return pool[rank < depth].groupby('pos')[value_col].mean().reindex(positions)
+
+class VorEngine:
+    """
+    Incremental value-over-replacement and scarcity over a fixed player pool.
+
+    Players are sorted by value once per position at construction. Removing or restoring a
+    player only recomputes that player's position, and values() is a single vectorized
+    subtraction against the per-position baselines.
+
+    :param points: Array of player values (e.g. pts_over_replacement).
+    :param positions: Array of position labels, aligned with ``points``.
+    :param available: Optional boolean mask of available players. It is used in place (not
+                      copied), so a caller can share it with its own draft state.
+    """
+    def __init__(self, points, positions, available=None, vor_positions=VOR_POSITIONS,
+                 replacement_rank=REPLACEMENT_RANK, scarcity_depth=SCARCITY_DEPTH):
+        self.points = np.array(points, dtype=float)
+        self.pos_codes, labels = pd.factorize(np.asarray(positions))
+        self.labels = list(labels)
+        self.available = available if available is not None else np.ones(len(self.points), dtype=bool)
+        self.vor_positions = [pos for pos in vor_positions if pos in self.labels]
+        self.replacement_rank = replacement_rank
+        self.scarcity_depth = scarcity_depth
+
+        # Per-position player indices, best first
+        order = np.argsort(-self.points, kind='stable')
+        self._by_pos = {self.labels.index(pos): order[self.pos_codes[order] == self.labels.index(pos)]
+                        for pos in self.vor_positions}
+        self._baseline = np.full(len(self.labels), np.nan)
+        self._scarcity = np.full(len(self.labels), np.nan)
+        for code in self._by_pos:
+            self._refresh(code)
+
+    @classmethod
+    def from_frame(cls, players, value_col='pts_over_replacement', **kwargs):
+        return cls(players[value_col].to_numpy(), players['pos'].to_numpy(), **kwargs)
+
+    def _refresh(self, code):
+        ranked = self._by_pos[code]
+        live = ranked[self.available[ranked]]
+        top = self.points[live[:max(self.replacement_rank, self.scarcity_depth)]]
+        self._baseline[code] = top[:self.replacement_rank].min() if len(top) else np.nan
+        self._scarcity[code] = top[:self.scarcity_depth].mean() if len(top) else np.nan
+
+    def remove(self, index):
+        """
+        Marks a player as drafted and updates only their position's baseline.
+        """
+        self.available[index] = False
+        self.refresh_position(index)
+
+    def restore(self, index):
+        self.available[index] = True
+        self.refresh_position(index)
+
+    def refresh_position(self, index):
+        code = self.pos_codes[index]
+        if code in self._by_pos:
+            self._refresh(code)
+
+    def update_points(self, indices, points):
+        """
+        Changes some players' values (e.g. after a projection update) and re-ranks and refreshes
+        only their positions.
+        """
+        indices = np.asarray(indices, dtype=int)
+        self.points[indices] = points
+        for code in np.unique(self.pos_codes[indices]):
+            if code in self._by_pos:
+                ranked = self._by_pos[code]
+                self._by_pos[code] = ranked[np.argsort(-self.points[ranked], kind='stable')]
+                self._refresh(code)
+
+    def values(self):
+        """
+        Value over replacement for every player in the pool (NaN outside VOR_POSITIONS).
+        """
+        return self.points - self._baseline[self.pos_codes]
+
+    def baselines(self):
+        return {pos: self._baseline[self.labels.index(pos)] for pos in self.vor_positions}
+
+    def scarcity(self):
+        return {pos: self._scarcity[self.labels.index(pos)] for pos in self.vor_positions}
+
+    def top(self, n=10):
+        """
+        Indices of the ``n`` available players with the highest value over replacement.
+        """
+        values = np.where(self.available, self.values(), np.nan)
+        candidates = np.flatnonzero(~np.isnan(values))
+        if len(candidates) > n:
+            candidates = candidates[np.argpartition(-values[candidates], n - 1)[:n]]
+        return candidates[np.argsort(-values[candidates], kind='stable')]
+
+def snake_order(num_teams, rounds):
+    """
+    Team index (0-based) on the clock for every overall pick of a snake draft.
+    """
+    forward = np.arange(num_teams)
+    return np.concatenate([forward if r % 2 == 0 else forward[::-1] for r in range(rounds)])
+
+def adp_to_overall(adp, teams_per_round=12):
+    """
+    Converts 'round.pick' ADP values (2.09 = round 2, pick 9) into overall pick numbers.
+    """
+    adp = np.asarray(adp, dtype=float)
+    draft_round = np.floor(adp)
+    # Unranked players (NaN or inf ADP) stay non-finite without warnings
+    with np.errstate(invalid='ignore'):
+        pick = np.round((adp - draft_round) * 100)
+    return (draft_round - 1) * teams_per_round + pick
+
+def parse_team_bye(team_bye_week):
+    """
+    Splits 'PHI/5' style values into (team, bye week) Series in one vectorized pass.
+    """
+    parts = team_bye_week.astype(str).str.split('/', n=1, expand=True).reindex(columns=[0, 1])
+    bye = pd.to_numeric(parts[1], errors='coerce').fillna(0).astype(int)
+    return parts[0], bye
+
+class DraftState:
+    """
+    Indexed state of a draft over a fixed player pool.
+
+    Players get integer ids (their row in ``players``). Positions, teams and bye weeks are
+    parsed once here, availability is a preallocated mask, and each team's roster is a row of
+    a preallocated id array, so picks and undos are constant-time and never copy the pool.
+    The VorEngine shares the availability mask, so its values always reflect the draft.
+
+    :param players: Projections frame with 'player', 'pos', 'team_bye_week', 'adp' and
+                    'pts_over_replacement' columns.
+    :param num_teams: Number of teams in the league.
+    :param rounds: Number of roster spots drafted per team.
+    """
+    def __init__(self, players, num_teams, rounds=15):
+        self.players = players.reset_index(drop=True)
+        self.num_teams = num_teams
+        self.rounds = rounds
+
+        self.names = self.players['player'].to_numpy()
+        self.positions = self.players['pos'].to_numpy()
+        team, bye = parse_team_bye(self.players['team_bye_week'])
+        self.teams = team.to_numpy()
+        self.bye_weeks = bye.to_numpy()
+        self.adp = pd.to_numeric(self.players['adp'], errors='coerce').fillna(np.inf).to_numpy()
+        self.ids = {name: i for i, name in enumerate(self.names)}
+
+        self.available = np.ones(len(self.players), dtype=bool)
+        self.rosters = np.full((num_teams, rounds), -1, dtype=int)
+        self.roster_sizes = np.zeros(num_teams, dtype=int)
+        self.history = []
+
+        self.vor = VorEngine(self.players['pts_over_replacement'].to_numpy(), self.positions, available=self.available)
+        self._adp_order = np.argsort(self.adp, kind='stable')
+        self._adp_rank = np.empty_like(self._adp_order)
+        self._adp_rank[self._adp_order] = np.arange(len(self._adp_order))
+        self._adp_cursor = 0
+
+    def id_of(self, name):
+        return self.ids.get(name)
+
+    def match_player(self, text):
+        """
+        Resolves free text (e.g. an LLM recommendation) to an available player id: an exact
+        name first, otherwise the available player whose name appears earliest in the text.
+        """
+        player_id = self.ids.get(text.strip())
+        if player_id is not None and self.available[player_id]:
+            return player_id
+        best, best_at = None, len(text)
+        for player_id in np.flatnonzero(self.available):
+            at = text.find(self.names[player_id])
+            if 0 <= at < best_at:
+                best, best_at = player_id, at
+        return best
+
+    def pick(self, player_id, team=None):
+        """
+        Drafts a player. ``team`` is a 0-based team index; None records a pick by an
+        untracked team (the player only leaves the pool).
+        """
+        if player_id is None:
+            raise ValueError("No player to draft: the player pool is empty")
+        if not self.available[player_id]:
+            raise ValueError(f"{self.names[player_id]} has already been drafted")
+        self.vor.remove(player_id)
+        if team is not None:
+            self.rosters[team, self.roster_sizes[team]] = player_id
+            self.roster_sizes[team] += 1
+        self.history.append((team, player_id))
+
+    def undo(self):
+        team, player_id = self.history.pop()
+        if team is not None:
+            self.roster_sizes[team] -= 1
+            self.rosters[team, self.roster_sizes[team]] = -1
+        self.vor.restore(player_id)
+        self._adp_cursor = min(self._adp_cursor, self._adp_rank[player_id])
+        return team, player_id
+
+    def update_points(self, player_ids, points):
+        """
+        New pts_over_replacement for some players (e.g. rows from consensus_tools.refresh_consensus),
+        mid-draft; only their positions' VOR baselines are recomputed.
+        """
+        player_ids = np.asarray(player_ids, dtype=int)
+        points = np.asarray(points, dtype=float)
+        self.players.iloc[player_ids, self.players.columns.get_loc('pts_over_replacement')] = points
+        self.vor.update_points(player_ids, points)
+
+    def best_available_by_adp(self):
+        # The cursor only moves forward while picks happen, so repeated calls are amortized O(1)
+        while self._adp_cursor < len(self._adp_order) and not self.available[self._adp_order[self._adp_cursor]]:
+            self._adp_cursor += 1
+        if self._adp_cursor == len(self._adp_order):
+            return None
+        return self._adp_order[self._adp_cursor]
+
+    def picks_until_turn(self, team):
+        """
+        Number of picks other teams make before ``team`` is next on the clock in a snake draft.
+        """
+        order = snake_order(self.num_teams, self.rounds)
+        upcoming = np.flatnonzero(order[len(self.history):] == team)
+        return int(upcoming[0]) if len(upcoming) else None
+
+    def adp_queue(self, count):
+        """
+        Ids of the next ``count`` available players in ADP order.
+        """
+        queue = []
+        for player_id in self._adp_order[self._adp_cursor:]:
+            if self.available[player_id]:
+                queue.append(player_id)
+                if len(queue) == count:
+                    break
+        return queue
+
+    def roster(self, team):
+        return self.rosters[team, :self.roster_sizes[team]]
+
+    def roster_names(self, team):
+        return list(self.names[self.roster(team)])
+
+    def roster_positions(self, team):
+        return list(self.positions[self.roster(team)])
+
+    def bye_week_counts(self, team):
+        weeks = self.bye_weeks[self.roster(team)]
+        weeks = weeks[weeks > 0]
+        return {int(week): int(count) for week, count in zip(*np.unique(weeks, return_counts=True))}
+
+    def available_players(self, columns=None):
+        """
+        Frame of the players still available (a copy; meant for display).
+        """
+        frame = self.players.loc[self.available]
+        return frame if columns is None else frame[columns]
+
+    def is_complete(self, team=None):
+        if team is not None:
+            return self.roster_sizes[team] >= self.rounds
+        return not self.available.any() or (self.roster_sizes >= self.rounds).all()
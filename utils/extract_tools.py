@@ -0,0 +1,152 @@
+import pandas as pd
+from lxml import html as lxml_html
+
+# Runs inside the page: walks every matching row once and returns the raw cell text for each
+# column, so a whole table costs a single round trip instead of one inner_text() call per cell.
+EXTRACT_TABLE_SCRIPT = """
+([rowSelector, columns, skipRows, minCells]) => {
+    const rows = Array.from(document.querySelectorAll(rowSelector)).slice(skipRows);
+    const out = [];
+    for (const row of rows) {
+        const cells = row.querySelectorAll('td');
+        if (cells.length < minCells) continue;
+        out.push(columns.map(col => {
+            let el = null;
+            if (col.selector) {
+                el = row.querySelector(col.selector);
+            } else {
+                const i = col.index < 0 ? cells.length + col.index : col.index;
+                el = cells[i] || null;
+            }
+            return el ? el.innerText.trim() : null;
+        }));
+    }
+    return out;
+}
+"""
+
+# Same idea for the XPath cell scrapes used by scrape_table_data
+EXTRACT_CELLS_SCRIPT = "cells => cells.map(cell => cell.innerText)"
+
+def parse_text(value):
+    return value
+
+def parse_float(value):
+    if value is None:
+        return None
+    value = value.replace(',', '').strip()
+    if value in ('', '-', '--'):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+PARSERS = {
+    'text': parse_text,
+    'float': parse_float,
+}
+
+class Column:
+    """
+    Describes one output column of a table extraction.
+
+    :param name: Output column name. For the 'split' parser, a tuple of names.
+    :param selector: CSS selector resolved relative to the row. Takes precedence over index.
+    :param index: Position of the td cell in the row; negative values count from the end.
+    :param parser: 'text' (default), 'float' or 'split'.
+    :param sep: Separator used by the 'split' parser.
+    """
+    def __init__(self, name, selector=None, index=None, parser='text', sep=' - '):
+        if selector is None and index is None:
+            raise ValueError(f"Column {name!r} needs a selector or an index")
+        if parser != 'split' and parser not in PARSERS:
+            raise ValueError(f"Unknown parser {parser!r} for column {name!r}")
+        self.name = name
+        self.selector = selector
+        self.index = index
+        self.parser = parser
+        self.sep = sep
+
+    def names(self):
+        return list(self.name) if self.parser == 'split' else [self.name]
+
+    def parse(self, value):
+        if self.parser == 'split':
+            parts = value.split(self.sep) if value else []
+            parts = [part.strip() for part in parts] + [None] * len(self.name)
+            return parts[:len(self.name)]
+        return [PARSERS[self.parser](value)]
+
+    def to_js(self):
+        return {'selector': self.selector, 'index': self.index if self.index is not None else 0}
+
+class TableSpec:
+    """
+    Declarative description of a table to pull out of a page.
+
+    :param row_selector: CSS selector matching one element per output row.
+    :param columns: List of Column objects.
+    :param skip_rows: Number of leading matched rows to ignore (e.g. header rows).
+    :param min_cells: Rows with fewer td cells than this are dropped.
+    :param constants: Optional dict of columns with a fixed value for every row.
+    """
+    def __init__(self, row_selector, columns, skip_rows=0, min_cells=0, constants=None):
+        self.row_selector = row_selector
+        self.columns = columns
+        self.skip_rows = skip_rows
+        self.min_cells = min_cells
+        self.constants = constants or {}
+
+    def parse_html(self, document):
+        """
+        Parses server-rendered HTML (a string or an lxml tree) with the same rules the in-page
+        script applies, so one spec serves both the browser and the HTTP fetch tier.
+        """
+        return self.to_frame(extract_rows(document, self))
+
+    def script_args(self):
+        return [self.row_selector, [col.to_js() for col in self.columns], self.skip_rows, self.min_cells]
+
+    def to_frame(self, raw_rows):
+        """
+        Converts raw cell text (as returned by EXTRACT_TABLE_SCRIPT) into a typed DataFrame.
+        """
+        names = [name for col in self.columns for name in col.names()]
+        records = []
+        for raw in raw_rows:
+            record = []
+            for col, value in zip(self.columns, raw):
+                record.extend(col.parse(value))
+            records.append(record)
+
+        df = pd.DataFrame(records, columns=names)
+        for name, value in self.constants.items():
+            df[name] = value
+        return df
+
+def _cell_text(element):
+    # Collapse whitespace the way the browser's innerText does for table cells
+    return ' '.join(element.text_content().split())
+
+def extract_rows(document, spec):
+    """
+    lxml equivalent of EXTRACT_TABLE_SCRIPT: returns raw cell text for each matched row.
+    """
+    tree = lxml_html.fromstring(document) if isinstance(document, (str, bytes)) else document
+    out = []
+    for row in tree.cssselect(spec.row_selector)[spec.skip_rows:]:
+        cells = row.cssselect('td')
+        if len(cells) < spec.min_cells:
+            continue
+        raw = []
+        for col in spec.columns:
+            if col.selector:
+                found = row.cssselect(col.selector)
+                element = found[0] if found else None
+            else:
+                index = col.index if col.index is not None else 0
+                element = cells[index] if -len(cells) <= index < len(cells) else None
+            raw.append(_cell_text(element) if element is not None else None)
+        out.append(raw)
+    return out
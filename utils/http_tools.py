@@ -0,0 +1,95 @@
+import time
+import httpx
+from lxml import html as lxml_html
+from lxml.etree import ParserError
+from utils.scrape_tools import paginate_url, _NavigationStats, _new_timing_stats
+from utils.metrics_tools import get_recorder
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+class StaticPageError(Exception):
+    """
+    Raised when a page fetched over plain HTTP does not contain the expected content,
+    which usually means it needs JavaScript and should go through the browser instead.
+    """
+
+def create_http_client(max_connections=10, timeout=20, transport=None):
+    """
+    Builds a keep-alive HTTP client whose connection pool is shared by every HttpScraper in a run.
+
+    :param transport: Optional httpx transport, e.g. one routing requests to a local stand-in.
+    """
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return httpx.AsyncClient(headers=DEFAULT_HEADERS, limits=limits, timeout=timeout, follow_redirects=True,
+                             transport=transport)
+
+class HttpScraper(_NavigationStats):
+    """
+    Browser-free scraper for server-rendered pages.
+
+    Exposes the same navigate_to_page/extract_table interface as AsyncWebScraper, so the
+    per-source scrape functions and TableSpecs run unchanged on either tier, and records its
+    timings and row counts the same way.
+
+    :param client: Shared httpx.AsyncClient from create_http_client. One is created if omitted.
+    :param metrics: MetricsRecorder for stage timings; the process-wide recorder if omitted.
+    :param source: Source name the timings are labelled with.
+    """
+    tier = 'http'
+    # For plain HTTP, 'ready' is parsing the HTML and checking for the ready selector
+    ready_mode = 'http'
+
+    def __init__(self, client=None, metrics=None, source=None):
+        self.client = client
+        self._owns_client = client is None
+        self.tree = None
+        self.html = None
+        self.blocker = None
+        self.stats = dict(_new_timing_stats(), ready_mode=self.ready_mode)
+        self.metrics = metrics if metrics is not None else get_recorder()
+        self.source = source
+
+    async def setup(self):
+        if self.client is None:
+            self.client = create_http_client()
+
+    async def navigate_to_page(self, url, ready_selector=None, timeout=30000):
+        start = time.perf_counter()
+        response = await self.client.get(url, timeout=timeout / 1000)
+        response.raise_for_status()
+        loaded = time.perf_counter()
+
+        self.html = response.text
+        try:
+            self.tree = lxml_html.fromstring(self.html)
+        except ParserError as e:
+            raise StaticPageError(f"Could not parse {url}: {e}")
+        if ready_selector and not self.tree.cssselect(ready_selector):
+            raise StaticPageError(f"{ready_selector!r} not found in the static HTML of {url}")
+        self._record_navigation(start, loaded, ready_selector)
+
+    async def extract_table(self, spec):
+        start = time.perf_counter()
+        return self._record_extraction(start, spec.parse_html(self.tree))
+
+    async def has_selector(self, selector):
+        return bool(self.tree.cssselect(selector))
+
+    async def paginate_scrape_url(self, base_url, scrape_function, content_check, start_page=1, page_param='page',
+                                  ready_selector=None, max_pages=None):
+        await paginate_url(self, base_url, scrape_function, content_check, start_page, page_param, ready_selector, max_pages)
+
+    async def close(self):
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def __aenter__(self):
+        await self.setup()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
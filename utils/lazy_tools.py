@@ -0,0 +1,31 @@
+import importlib
+import threading
+
+class LazyModule:
+    """
+    Stands in for a module and imports it on first attribute access, so importing a script
+    does not pay for heavy dependencies it may never use.
+
+    :param name: Dotted module name, e.g. 'pandas' or 'utils.draft_tools'.
+    """
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module {self._name!r} ({state})>"
+
+def lazy_import(name):
+    return LazyModule(name)
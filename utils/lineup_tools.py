@@ -0,0 +1,230 @@
+import numpy as np
+import pandas as pd
+from utils.draft_tools import parse_team_bye
+from utils.lookahead_tools import DEFAULT_ROSTER_SLOTS, FLEX_POSITIONS
+from utils.registry_tools import normalize_position
+from utils.scoring_tools import parse_roster_slots
+
+NUM_WEEKS = 17
+BENCH_SLOT = 'BE'
+
+def _eligible(slot):
+    return FLEX_POSITIONS if slot == 'FLEX' else (slot,)
+
+def slot_labels(slots=None):
+    """
+    One label per starting slot in rules order, e.g. ['QB', 'RB', 'RB', 'WR', 'WR', 'TE',
+    'FLEX', 'D/ST', 'K']; bench spots are left out.
+    """
+    slots = slots or DEFAULT_ROSTER_SLOTS
+    return [slot for slot, count in slots.items() if slot != BENCH_SLOT for _ in range(count)]
+
+def season_points(players, num_weeks=NUM_WEEKS, value_col=None, weekly=None):
+    """
+    (players, num_weeks) matrix of projected points per week.
+
+    Season values are spread evenly over the weeks each player is not on bye. ``weekly`` (a
+    frame with 'player', 'week' and 'points' columns, e.g. per-week projections scored with
+    ScoringRules) replaces the weeks it covers.
+
+    :param players: Projections frame with 'player', 'team_bye_week' and the value column.
+    :param value_col: Season value to spread; defaults to 'consensus' when the frame has one
+                      (see consensus_tools.apply_consensus). Without one, only ``weekly`` points
+                      are used and the other weeks are left unscored (NaN).
+    :raises ValueError: If there is neither a value column nor ``weekly`` points; rankings
+                        values such as pts_over_replacement are never taken for points unless
+                        passed as ``value_col``.
+    """
+    value_col = value_col or ('consensus' if 'consensus' in players else None)
+    if value_col is None and weekly is None:
+        raise ValueError("No projected points: pass a frame with a 'consensus' column "
+                         "(consensus_tools.apply_consensus), weekly points or value_col")
+    _, bye = parse_team_bye(players['team_bye_week'])
+    games = num_weeks - ((bye >= 1) & (bye <= num_weeks)).to_numpy()
+    if value_col is not None:
+        season = pd.to_numeric(players[value_col], errors='coerce').to_numpy(dtype=float)
+    else:
+        season = np.full(len(players), np.nan)
+    points = np.repeat((season / games)[:, None], num_weeks, axis=1)
+
+    if weekly is not None and len(weekly):
+        rows = pd.Index(players['player']).get_indexer(weekly['player'])
+        weeks = weekly['week'].to_numpy(dtype=int) - 1
+        keep = (rows >= 0) & (weeks >= 0) & (weeks < num_weeks)
+        points[rows[keep], weeks[keep]] = weekly['points'].to_numpy(dtype=float)[keep]
+    return points
+
+def roster_ids(rosters, names):
+    """
+    (teams, roster size) array of player ids, -1 padded, from a dict of team to player names
+    (as run_mock_draft returns) or a sequence of name lists. Names not in ``names`` are -1.
+
+    :return: (ids, team labels)
+    """
+    teams = list(rosters) if isinstance(rosters, dict) else list(range(1, len(rosters) + 1))
+    lists = list(rosters.values()) if isinstance(rosters, dict) else list(rosters)
+    lookup = {name: i for i, name in enumerate(names)}
+    ids = np.full((len(lists), max((len(roster) for roster in lists), default=0)), -1, dtype=int)
+    for team, roster in enumerate(lists):
+        ids[team, :len(roster)] = [lookup.get(name, -1) for name in roster]
+    return ids, teams
+
+class LineupSolution:
+    """
+    Best weekly lineups for a batch of rosters.
+
+    Arrays are indexed [team, week, slot] with weeks 0-based: ``players`` holds player ids (-1
+    for a slot nobody on the roster can fill that week, e.g. a lone kicker on bye) and
+    ``points`` their projections (NaN for empty slots).
+
+    :param slots: Slot label of each slot column, from slot_labels.
+    :param teams: Optional team labels, aligned with the first axis.
+    :param names: Optional player names, indexed by player id.
+    :param units: What ``points`` measures: 'points', or the name of the column used instead.
+    """
+    def __init__(self, slots, players, points, teams=None, names=None, units='points'):
+        self.slots = list(slots)
+        self.players = players
+        self.points = points
+        self.teams = list(teams) if teams is not None else list(range(players.shape[0]))
+        self.names = names
+        self.units = units
+
+    @property
+    def weekly_totals(self):
+        """
+        (teams, weeks) projected points of the starting lineups.
+        """
+        return np.nansum(self.points, axis=2)
+
+    @property
+    def season_totals(self):
+        return self.weekly_totals.sum(axis=1)
+
+    def empty_slots(self):
+        """
+        (teams, weeks) count of starting slots the roster cannot fill.
+        """
+        return (self.players < 0).sum(axis=2)
+
+    def _team_index(self, team):
+        return self.teams.index(team) if team in self.teams else team
+
+    def lineup(self, team, week):
+        """
+        One team's starters for one (1-based) week as a frame of slot, player_id, player and points.
+        """
+        index = self._team_index(team)
+        ids = self.players[index, week - 1]
+        return pd.DataFrame({
+            'slot': self.slots,
+            'player_id': ids,
+            'player': [self.names[i] if self.names is not None and i >= 0 else None for i in ids],
+            'points': self.points[index, week - 1],
+        })
+
+    def frame(self):
+        """
+        Every starter of every team and week as a long frame: team, week, slot, player_id,
+        player and points.
+        """
+        teams, weeks, slots = self.players.shape
+        ids = self.players.ravel()
+        return pd.DataFrame({
+            'team': np.repeat(np.asarray(self.teams, dtype=object), weeks * slots),
+            'week': np.tile(np.repeat(np.arange(1, weeks + 1), slots), teams),
+            'slot': np.tile(self.slots, teams * weeks),
+            'player_id': ids,
+            'player': np.where(ids >= 0, np.asarray(self.names, dtype=object)[np.maximum(ids, 0)], None)
+                      if self.names is not None else None,
+            'points': self.points.ravel(),
+        })
+
+def solve_lineups(points, positions, rosters, bye_weeks=None, slots=None):
+    """
+    Fills every team's starting slots for every week at once.
+
+    Single-position slots take the best players at their position, then FLEX takes the best
+    RB/WR/TE left. Because the FLEX positions each have their own slots, that order is optimal:
+    any lineup can swap its way to it without losing points. A slot is filled whenever someone
+    eligible is playable that week. Each step is one argsort over the (teams, roster, weeks)
+    array, so a 14-team, 17-week season solves in a few milliseconds.
+
+    :param points: (players, weeks) projected points, e.g. from season_points.
+    :param positions: (players,) position labels.
+    :param rosters: (teams, roster size) player ids, -1 for empty spots, e.g. DraftState.rosters
+                    or roster_ids.
+    :param bye_weeks: Optional (players,) 1-based bye week, 0 for none; players score nothing on bye.
+    :param slots: Dict of slot to count as parse_roster_slots returns; DEFAULT_ROSTER_SLOTS if omitted.
+    :return: LineupSolution.
+    """
+    labels = slot_labels(slots)
+    points = np.asarray(points, dtype=float)
+    rosters = np.atleast_2d(np.asarray(rosters, dtype=int))
+    num_teams, roster_size = rosters.shape
+    num_weeks = points.shape[1]
+
+    filled = rosters >= 0
+    ids = np.where(filled, rosters, 0)
+    value = points[ids]  # (teams, roster, weeks)
+    playable = filled[..., None] & ~np.isnan(value)
+    if bye_weeks is not None:
+        playable &= np.asarray(bye_weeks)[ids][..., None] != np.arange(1, num_weeks + 1)
+    value = np.where(playable, value, -np.inf)
+    # Only the distinct position labels on the rosters are normalized
+    codes, found_labels = pd.factorize(np.asarray(positions, dtype=object)[ids].ravel())
+    codes = codes.reshape(ids.shape)
+    normalized = np.array([normalize_position(pos) for pos in found_labels], dtype=object)
+
+    chosen = np.full((num_teams, num_weeks, len(labels)), -1, dtype=int)  # Roster column per slot
+    used = np.zeros(value.shape, dtype=bool)
+    for slot in sorted(set(labels), key=lambda slot: len(_eligible(slot))):
+        columns = [i for i, label in enumerate(labels) if label == slot][:roster_size]
+        eligible = np.isin(normalized, _eligible(slot))[codes][..., None] & ~used
+        masked = np.where(eligible, value, -np.inf)
+        top = np.argsort(-masked, axis=1, kind='stable')[:, :len(columns)]  # (teams, k, weeks)
+        found = np.take_along_axis(masked, top, axis=1) > -np.inf
+        np.put_along_axis(used, top, np.take_along_axis(used, top, axis=1) | found, axis=1)
+        chosen[:, :, columns] = np.where(found, top, -1).transpose(0, 2, 1)
+
+    team_index = np.arange(num_teams)[:, None, None]
+    week_index = np.arange(num_weeks)[None, :, None]
+    column = np.maximum(chosen, 0)
+    players = np.where(chosen >= 0, rosters[team_index, column], -1)
+    starter_points = np.where(chosen >= 0, value[team_index, column, week_index], np.nan)
+    return LineupSolution(labels, players, starter_points)
+
+def solve_season(players, rosters, rules_text=None, num_weeks=NUM_WEEKS, weekly=None, value_col=None):
+    """
+    Best lineups for every team and week of a season from a projections frame. Starting slots
+    no position in ``players`` can fill (e.g. D/ST and K when the projections have no defenses
+    or kickers) are left out rather than reported empty every week.
+
+    :param players: Projections frame ('player', 'pos', 'team_bye_week' and a value column).
+    :param rosters: Dict of team to player names (as run_mock_draft returns), a list of name
+                    lists, or an id array such as DraftState.rosters.
+    :param rules_text: League rules prose to read the starting slots from; the standard
+                       QB/2 RB/2 WR/TE/FLEX/D/ST/K lineup if omitted or unparseable.
+    :param weekly: Optional per-week projections for season_points.
+    :param value_col: Season value column for season_points; its name becomes the solution's
+                      units unless it is 'consensus'.
+    :return: LineupSolution labelled with team labels, player names and units.
+    """
+    players = players.reset_index(drop=True)
+    names = players['player'].to_numpy()
+    if isinstance(rosters, np.ndarray):
+        ids, teams = rosters, None
+    else:
+        ids, teams = roster_ids(rosters, names)
+    slots = (parse_roster_slots(rules_text) if rules_text else None) or DEFAULT_ROSTER_SLOTS
+    pool_positions = {normalize_position(pos) for pos in players['pos'].unique()}
+    slots = {slot: count for slot, count in slots.items()
+             if slot == BENCH_SLOT or pool_positions.intersection(_eligible(slot))}
+    _, bye = parse_team_bye(players['team_bye_week'])
+
+    points = season_points(players, num_weeks, value_col=value_col, weekly=weekly)
+    solution = solve_lineups(points, players['pos'].to_numpy(), ids, bye.to_numpy(), slots)
+    solution.teams = teams if teams is not None else solution.teams
+    solution.names = names
+    solution.units = value_col if value_col not in (None, 'consensus') else 'points'
+    return solution
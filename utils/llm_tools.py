@@ -0,0 +1,225 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils import DATA_DIR
+from utils.metrics_tools import get_recorder
+
+DEFAULT_MODEL = "gpt-4-turbo-preview"
+SYSTEM_PROMPT = "You are a fantasy football draft assistant."
+
+def _canonical(value):
+    # Round floats so that recomputed-but-identical scores hash the same
+    if isinstance(value, float):
+        return round(value, 3)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if hasattr(value, 'item'):  # NumPy scalars
+        return _canonical(value.item())
+    return value
+
+def recommendation_key(context, model):
+    """
+    Canonical hash of a draft situation: the roster (order-insensitive), the top of the
+    available pool, positional scarcity, the league rules and the model answering.
+    """
+    context = dict(context)
+    if 'roster' in context:
+        context['roster'] = sorted(context['roster'])
+    if 'rules' in context:
+        context['rules'] = hashlib.sha256(context['rules'].encode('utf-8')).hexdigest()
+    payload = json.dumps({'model': model, 'context': _canonical(context)}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class OpenAIBackend:
+    """
+    Chat-completions backend. The client is created on first use unless one is passed in.
+    """
+    def __init__(self, model=DEFAULT_MODEL, max_tokens=150, client=None):
+        self.model = model
+        self.max_tokens = max_tokens
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI()
+        return self._client
+
+    def complete(self, prompt, context):
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=self.max_tokens
+        )
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            metrics = get_recorder()
+            metrics.increment('llm_tokens_total', usage.prompt_tokens or 0, model=self.model, type='prompt')
+            metrics.increment('llm_tokens_total', usage.completion_tokens or 0, model=self.model, type='completion')
+        return response.choices[0].message.content.strip()
+
+class LocalBackend:
+    """
+    Deterministic offline stand-in: recommends the top of the lookahead shortlist when the
+    context has one, otherwise the highest value-over-replacement player at a position the
+    roster still needs, else the highest value player overall.
+    """
+    model = 'local'
+
+    def complete(self, prompt, context):
+        shortlist = context.get('shortlist')
+        if shortlist:
+            choice = shortlist[0]
+            plan = f", then {choice['plan']}" if choice['plan'] else ''
+            return (f"{choice['player']} ({choice['pos']}) has the highest expected value over our next picks "
+                    f"({choice['ev']:.1f}{plan}).")
+        candidates = context.get('top_available') or []
+        if not candidates:
+            return "No players available."
+        needs = context.get('roster_needs') or {}
+        needed = [c for c in candidates if needs.get(c['pos'], 0) > 0]
+        choice = (needed or candidates)[0]
+        reason = 'fills a roster need' if needed else 'is the best value available'
+        return f"{choice['player']} ({choice['pos']}) {reason} with {choice['value']:.1f} points over replacement."
+
+class RecommendationCache:
+    """
+    SQLite-backed LRU cache of recommendations keyed by recommendation_key.
+
+    :param path: Database file.
+    :param max_entries: Least recently used entries beyond this count are evicted.
+    """
+    def __init__(self, path=os.path.join(DATA_DIR, 'cache', 'recommendations.sqlite'), max_entries=5000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connect() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS recommendations "
+                       "(key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)")
+
+    def _connect(self):
+        # A connection per call keeps the cache safe to use from prefetch threads
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, key):
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT value FROM recommendations WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE recommendations SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def put(self, key, value):
+        with self._lock, self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO recommendations VALUES (?, ?, ?)", (key, value, time.time()))
+            db.execute("DELETE FROM recommendations WHERE key IN (SELECT key FROM recommendations "
+                       "ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+class Recommender:
+    """
+    Memoizing front end for a recommendation backend.
+
+    :param backend: Object with ``model`` and ``complete(prompt, context)``.
+    :param cache: Optional RecommendationCache; without one every call reaches the backend.
+    :param metrics: MetricsRecorder for request latency; the process-wide recorder if omitted.
+    """
+    def __init__(self, backend, cache=None, metrics=None):
+        self.backend = backend
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else get_recorder()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, context):
+        return recommendation_key(context, self.backend.model)
+
+    def recommend(self, prompt, context):
+        key = self.key(context)
+        with self.metrics.timer('llm_latency_seconds', model=self.backend.model, kind=context.get('kind')) as labels:
+            if self.cache is not None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self.hits += 1
+                    labels['cache'] = 'hit'
+                    return cached
+            self.misses += 1
+            labels['cache'] = 'miss'
+            recommendation = self.backend.complete(prompt, context)
+        if self.cache is not None:
+            self.cache.put(key, recommendation)
+        return recommendation
+
+class RecommendationPrefetcher:
+    """
+    Fires recommendation requests for predicted draft situations in the background and serves
+    the one matching the real situation once it is known.
+
+    :param recommender: Recommender used for both prefetched and on-demand requests.
+    :param max_workers: Concurrent background requests.
+    """
+    def __init__(self, recommender, max_workers=3):
+        self.recommender = recommender
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._pending = {}
+        self.served = 0
+
+    def prefetch(self, scenarios):
+        """
+        Starts background requests for (prompt, context) scenarios, most likely first.
+        Requests left over from an earlier prefetch are cancelled.
+        """
+        self.cancel()
+        for prompt, context in scenarios:
+            key = self.recommender.key(context)
+            if key not in self._pending:
+                self._pending[key] = self._executor.submit(self.recommender.recommend, prompt, context)
+
+    def take(self, prompt, context):
+        """
+        Returns the recommendation for the real situation: the prefetched result when one of the
+        scenarios matched, otherwise a fresh request. Non-matching requests are cancelled.
+        """
+        future = self._pending.pop(self.recommender.key(context), None)
+        self.cancel()
+        if future is not None and not future.cancelled():
+            try:
+                recommendation = future.result()
+                self.served += 1
+                return recommendation
+            except Exception:
+                pass  # A failed speculative request is simply retried below
+        return self.recommender.recommend(prompt, context)
+
+    def cancel(self):
+        # Requests already in flight finish in the background and still land in the cache
+        for future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+
+    def close(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+def create_recommender(backend=None, cache_path=os.path.join(DATA_DIR, 'cache', 'recommendations.sqlite'), client=None):
+    """
+    Builds the default Recommender. ``backend`` is 'openai' or 'local'; it defaults to the
+    DRAFT_LLM_BACKEND environment variable, then 'openai'. Pass ``cache_path=None`` to disable caching.
+    """
+    backend = backend or os.environ.get('DRAFT_LLM_BACKEND', 'openai')
+    if backend == 'local':
+        backend = LocalBackend()
+    elif backend == 'openai':
+        backend = OpenAIBackend(client=client)
+    cache = RecommendationCache(cache_path) if cache_path else None
+    return Recommender(backend, cache)
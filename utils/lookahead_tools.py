@@ -0,0 +1,247 @@
+import itertools
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from utils.draft_tools import snake_order, adp_to_overall
+from utils.sim_tools import DEFAULT_ROSTER_LIMITS
+
+# Starting lineup and bench from data/rules.txt
+DEFAULT_ROSTER_SLOTS = {'QB': 1, 'RB': 2, 'WR': 2, 'TE': 1, 'FLEX': 1, 'D/ST': 1, 'K': 1, 'BE': 7}
+FLEX_POSITIONS = ('RB', 'WR', 'TE')
+
+# A bench player only scores through byes and injuries; kickers and defenses are never benched
+BENCH_WEIGHT = 0.25
+# ...and each further backup at the same position covers fewer of those weeks
+BENCH_DECAY = 0.5
+NO_BENCH = ('K', 'D/ST')
+
+@lru_cache(maxsize=32)
+def _sequences(num_positions, length):
+    # Every ordering of positions for the picks after the current one
+    # product() yields one empty plan for length 0, which reshape(-1, 0) cannot size
+    return np.array(list(itertools.product(range(num_positions), repeat=length)), dtype=int).reshape(num_positions ** length, length)
+
+def _adp_model(draft_state, adp_noise):
+    # Overall ADP (unranked players go after everyone) and the spread simulate_drafts uses
+    overall = adp_to_overall(draft_state.adp)
+    finite = np.isfinite(overall)
+    overall = np.where(finite, overall, overall[finite].max() + 50 if finite.any() else 1000)
+    return overall, adp_noise * np.sqrt(np.maximum(overall, 1))
+
+def _survival(picks, overall, spread, available):
+    z = (np.asarray(picks, dtype=float)[:, None] + 0.5 - overall) / spread
+    # Logistic approximation of the normal survival function
+    return available / (1 + np.exp(np.clip(1.702 * z, -50, 50)))
+
+def availability_probabilities(draft_state, picks, adp_noise=1.5):
+    """
+    Probability that each player is still on the board at each overall pick (0-based), from a
+    normal model around their ADP with the same spread simulate_drafts uses.
+
+    :return: (len(picks), players) array; drafted players are always 0.
+    """
+    overall, spread = _adp_model(draft_state, adp_noise)
+    return _survival(picks, overall, spread, draft_state.available)
+
+class PickOptimizer:
+    """
+    Ranks the players to draft with a team's next pick by looking ahead through its following
+    snake-draft picks.
+
+    Each candidate is scored as its own value plus the best plan of positions for the next
+    ``horizon`` picks, where a plan earns the expected value of the best player still available
+    at each position and pick. Players count fully in an open starting or FLEX slot. A bench
+    player counts BENCH_WEIGHT times their value over the position's replacement level (the
+    draft's VorEngine baselines), scaled by how many starting slots the position can fill and
+    by BENCH_DECAY for each backup already there, and nothing once the position is at its
+    roster limit or the roster is full. Plans that leave starting slots impossible to fill or
+    go past a roster limit are penalized. Everything that does not change between picks is
+    computed here once, and every plan is scored in one vectorized pass, so rank() takes well
+    under a millisecond on a draft-sized pool.
+
+    Values are pts_over_replacement shifted so that the worst player in the pool is worth zero,
+    which keeps comparisons across positions intact while an empty slot is never worth more
+    than a filled one.
+
+    :param draft_state: DraftState of the draft in progress (read, never modified).
+    :param slots: Dict of roster slots merged over DEFAULT_ROSTER_SLOTS.
+    :param limits: Dict of position to maximum players per team, merged over
+                   sim_tools.DEFAULT_ROSTER_LIMITS.
+    :param horizon: Number of later picks to plan for.
+    :param candidates: Number of top players to rank (the best player at each position is
+                       always included).
+    :param adp_noise: ADP spread for the availability model.
+    """
+    def __init__(self, draft_state, slots=None, horizon=3, candidates=12, adp_noise=1.5, limits=None):
+        self.draft_state = draft_state
+        self.slots = dict(DEFAULT_ROSTER_SLOTS, **(slots or {}))
+        limits = dict(DEFAULT_ROSTER_LIMITS, **(limits or {}))
+        self.horizon = horizon
+        self.candidates = candidates
+        self.adp_noise = adp_noise
+
+        points = np.nan_to_num(draft_state.vor.points)
+        self._offset = points.min() if len(points) else 0.0
+        self.values = points - self._offset
+        self.order = snake_order(draft_state.num_teams, draft_state.rounds)
+        self.pos_codes = draft_state.vor.pos_codes
+        self.labels = [pos for pos in draft_state.vor.labels if self.slots.get(pos, 0) > 0]
+        self.codes = np.array([draft_state.vor.labels.index(pos) for pos in self.labels], dtype=int)
+        # Position code -> index into labels (-1 for positions without a roster slot)
+        self._label_of = np.full(len(draft_state.vor.labels), -1)
+        self._label_of[self.codes] = np.arange(len(self.codes))
+        self.starters = np.array([self.slots[pos] for pos in self.labels])
+        self.flex = np.array([pos in FLEX_POSITIONS for pos in self.labels])
+        self.benchable = np.array([pos not in NO_BENCH for pos in self.labels])
+        self.limits = np.array([limits.get(pos, draft_state.rounds) for pos in self.labels])
+        # A backup stands in for the starting slots its position can fill, so one that can also
+        # play FLEX covers more weeks than a backup quarterback
+        fills = self.starters + self.flex * self.slots['FLEX']
+        self.bench_weights = BENCH_WEIGHT * fills / max(fills.max(), 1) if len(fills) else fills
+        self.capacity = sum(self.slots.values())
+        self._plan_cache = {}
+
+        # Pool orderings that never change: by value, and by position then value
+        label_of = self._label_of[self.pos_codes]
+        slotted = np.flatnonzero(label_of >= 0)
+        self._by_value = slotted[np.argsort(-self.values[slotted], kind='stable')]
+        self._grouped = slotted[np.lexsort((-self.values[slotted], label_of[slotted]))]
+        self._overall, self._spread = _adp_model(draft_state, adp_noise)
+
+    def _plans(self, steps):
+        # Every plan of positions (first pick fixed to each position) with per-position counts
+        # before each pick, ignoring the roster so far
+        if steps not in self._plan_cache:
+            sequences = _sequences(len(self.labels), steps)
+            positions = len(self.labels)
+            plans = np.concatenate([np.broadcast_to(np.arange(positions)[:, None, None], (positions, len(sequences), 1)),
+                                    np.broadcast_to(sequences, (positions,) + sequences.shape)], axis=2)
+            onehot = plans[..., None] == np.arange(positions)
+            prior = np.cumsum(onehot, axis=2) - onehot
+            own = np.take_along_axis(prior, plans[..., None], axis=-1)[..., 0]
+            self._plan_cache[steps] = (sequences, plans, onehot, prior, own)
+        return self._plan_cache[steps]
+
+    def availability(self, picks):
+        return _survival(picks, self._overall, self._spread, self.draft_state.available)
+
+    def rank(self, team, availability=None):
+        """
+        Ranks candidates for ``team``'s (0-based) next pick.
+
+        :param availability: Optional SimulationResult to take availability from instead of the
+                             ADP model.
+        :return: List of (player id, expected value, plan) tuples, best first. The plan is the
+                 tuple of positions to target with the following picks.
+        """
+        state = self.draft_state
+        current = len(state.history)
+        upcoming = np.flatnonzero(self.order[current:] == team)[:self.horizon + 1] + current
+        live = self._grouped[state.available[self._grouped]]
+        if not len(upcoming) or not len(live):
+            return []
+
+        if availability is not None:
+            probs = availability.availability[upcoming // state.num_teams, team] * state.available
+        else:
+            probs = self.availability(upcoming)
+        if upcoming[0] == current:
+            probs[0] = state.available  # We are on the clock
+        probs = np.clip(probs, 0, 0.999)
+
+        # Available players grouped by position, best first within each group
+        label_of = self._label_of[self.pos_codes]
+        groups = label_of[live]
+        starts = np.searchsorted(groups, np.arange(len(self.labels)))
+        ends = np.searchsorted(groups, np.arange(len(self.labels)), side='right')
+        present = ends > starts
+
+        # Candidates: the best players overall plus the best player at each position
+        by_value = self._by_value[state.available[self._by_value]][:self.candidates]
+        chosen = np.unique(np.concatenate([by_value, live[starts[present]]]))
+        chosen_pos = label_of[chosen]
+        index = np.empty(len(label_of), dtype=int)
+        index[live] = np.arange(len(live))
+        at = index[chosen]
+
+        # Starters are worth their value; bench players only what they add over their position's
+        # replacement level, so a backup below it is worth nothing
+        replacement = self.draft_state.vor.baselines()
+        replacement = np.array([replacement.get(pos, np.nan) for pos in self.labels]) - self._offset
+        worth = np.stack([self.values[live], np.nan_to_num(np.maximum(self.values[live] - replacement[groups], 0))])
+
+        # Expected worth of the best available player per position at each later pick: the
+        # survival product runs within each position group, taken as a segmented cumulative sum
+        steps = len(upcoming) - 1
+        p = probs[1:, live]
+        log_miss = np.log1p(-p)
+        log_survive = np.cumsum(log_miss, axis=1) - log_miss
+        seg_start = starts[groups]
+        terms = worth[:, None, :] * (p * np.exp(log_survive - log_survive[:, seg_start]))
+        cumulative = np.cumsum(terms, axis=-1)
+        before_group = cumulative[..., seg_start] - terms[..., seg_start]
+        expected = np.zeros((2, len(self.labels), steps))
+        expected[:, present] = (cumulative[..., ends[present] - 1] - before_group[..., starts[present]]).transpose(0, 2, 1)
+
+        # ...and the same with each candidate removed: the terms after it were scaled by its (1 - p)
+        expected_c = np.broadcast_to(expected[:, None], (2, len(chosen)) + expected.shape[1:]).copy()
+        before = cumulative[..., at] - terms[..., at] - before_group[..., at]
+        after = cumulative[..., ends[chosen_pos] - 1] - cumulative[..., at]
+        expected_c[:, np.arange(len(chosen)), chosen_pos] = (before + after / (1 - p[:, at])).transpose(0, 2, 1)
+
+        # Slot bookkeeping depends only on the candidate's position, so it is done per position
+        roster = state.roster(team)
+        base = np.bincount(label_of[roster][label_of[roster] >= 0], minlength=len(self.labels))
+        sequences, plans, onehot, prior, own = self._plans(steps)
+        counts = prior + base
+        starter = own + base[plans] < self.starters[plans]
+        flex_used = (np.maximum(counts - self.starters, 0) * self.flex).sum(axis=-1)
+        in_flex = ~starter & self.flex[plans] & (flex_used < self.slots['FLEX'])
+        room = (len(roster) + np.arange(steps + 1)) < self.capacity
+        under_limit = own + base[plans] < self.limits[plans]
+        full = starter | in_flex
+        backups = np.maximum(own + base[plans] - self.starters[plans], 0)
+        bench = np.where(~full & self.benchable[plans] & room & under_limit,
+                         self.bench_weights[plans] * BENCH_DECAY ** backups, 0.0)
+
+        # Plans that leave starting slots impossible to fill with the picks remaining, or that
+        # roster more players at a position than its limit, are penalized
+        final = counts[:, :, -1] + onehot[:, :, -1]
+        missing = (np.maximum(self.starters - final, 0) * present).sum(axis=-1)
+        if self.flex.any():
+            missing += np.maximum(self.slots['FLEX'] - (np.maximum(final - self.starters, 0) * self.flex).sum(axis=-1), 0)
+        picks_left = state.rounds - len(roster) - (steps + 1)
+        over_limit = np.maximum(final - np.maximum(self.limits, base), 0).sum(axis=-1)
+        penalty = 1000 * (np.maximum(missing - picks_left, 0) + over_limit)
+
+        full, bench = full[chosen_pos], bench[chosen_pos]
+        gains = expected_c[:, np.arange(len(chosen))[:, None, None], sequences, np.arange(steps)]
+        own_worth = worth[:, at]
+        totals = (full[..., 0] * own_worth[0][:, None] + bench[..., 0] * own_worth[1][:, None]
+                  + (full[..., 1:] * gains[0] + bench[..., 1:] * gains[1]).sum(axis=-1)
+                  - penalty[chosen_pos])
+
+        best = totals.argmax(axis=1)
+        evs = totals[np.arange(len(chosen)), best]
+        ranking = np.argsort(-evs, kind='stable')
+        return [(int(chosen[c]), float(evs[c]), tuple(self.labels[q] for q in sequences[best[c]])) for c in ranking]
+
+    def frame(self, ranking, team=None):
+        """
+        Display frame for a ranking: player, pos, value, ev and plan, indexed by player id.
+        """
+        ids = [player_id for player_id, _, _ in ranking]
+        return pd.DataFrame({
+            'player': self.draft_state.names[ids],
+            'pos': self.draft_state.positions[ids],
+            'value': self.values[ids],
+            'ev': [ev for _, ev, _ in ranking],
+            'plan': ['-'.join(plan) for _, _, plan in ranking],
+        }, index=ids)
+
+def rank_picks(draft_state, team, **kwargs):
+    """
+    One-off ranking for ``team``'s next pick as a DataFrame; see PickOptimizer.
+    """
+    optimizer = PickOptimizer(draft_state, **kwargs)
+    return optimizer.frame(optimizer.rank(team))
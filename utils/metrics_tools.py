@@ -0,0 +1,172 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+# Where the default recorder writes JSON lines and its Prometheus text snapshot; unset means in-memory only
+METRICS_PATH_ENV = 'DRAFT_METRICS_PATH'
+PROMETHEUS_PATH_ENV = 'DRAFT_METRICS_PROM'
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+class MetricsRecorder:
+    """
+    Cheap in-process metrics: timings and sizes are folded into per-label count/sum/max
+    summaries, counters into totals, and every observation can also be appended to a JSON
+    lines file as it happens.
+
+    Recording is a lock, a dict update and (with ``path``) one buffered line write, so it can
+    stay on in production. prometheus() renders the aggregates in the Prometheus text format.
+
+    :param path: Optional JSON lines file observations and events are appended to.
+    :param prometheus_path: Optional file flush() writes the Prometheus snapshot to.
+    :param namespace: Prefix for every metric name in the Prometheus snapshot.
+    """
+    def __init__(self, path=None, prometheus_path=None, namespace='ffm'):
+        self.path = path
+        self.prometheus_path = prometheus_path
+        self.namespace = namespace
+        self._summaries = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self._file = open(path, 'a', buffering=1)
+
+    def _write(self, record):
+        if self._file is not None:
+            line = json.dumps(record, default=str)
+            with self._lock:
+                self._file.write(line + '\n')
+
+    def observe(self, name, value, **labels):
+        """
+        Records one measurement (seconds, rows, tokens...) of ``name``.
+        """
+        key = (name, _label_key(labels))
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                self._summaries[key] = [1, value, value]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                summary[2] = max(summary[2], value)
+        self._write({'ts': time.time(), 'metric': name, 'value': value, 'labels': labels})
+
+    def increment(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._write({'ts': time.time(), 'metric': name, 'increment': value, 'labels': labels})
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """
+        Times the block into ``name`` in seconds. The yielded dict holds the labels, which the
+        block may update (e.g. with a status); a block that raises is recorded with status='error'.
+        """
+        start = time.perf_counter()
+        try:
+            yield labels
+        except BaseException:
+            labels['status'] = 'error'
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def event(self, kind, **fields):
+        """
+        Writes a structured record (a failure, a per-pick summary...) to the JSON lines file only.
+        """
+        self._write(dict({'ts': time.time(), 'event': kind}, **fields))
+
+    def snapshot(self):
+        """
+        Current aggregates: {'summaries': {(name, labels): (count, sum, max)}, 'counters': {...}}.
+        """
+        with self._lock:
+            return {'summaries': {key: tuple(value) for key, value in self._summaries.items()},
+                    'counters': dict(self._counters)}
+
+    def prometheus(self):
+        """
+        Aggregates in the Prometheus text exposition format: a summary (_count, _sum) plus a
+        _max gauge per observed metric, and a counter per incremented one.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name in sorted({name for name, _ in snapshot['summaries']}):
+            full = f"{self.namespace}_{name}"
+            series = sorted((key, value) for key, value in snapshot['summaries'].items() if key[0] == name)
+            lines.append(f"# TYPE {full} summary")
+            for (_, labels), (count, total, _) in series:
+                lines.append(f"{full}_count{_format_labels(labels)} {count}")
+                lines.append(f"{full}_sum{_format_labels(labels)} {total:.6g}")
+            lines.append(f"# TYPE {full}_max gauge")
+            for (_, labels), (_, _, peak) in series:
+                lines.append(f"{full}_max{_format_labels(labels)} {peak:.6g}")
+        for name in sorted({name for name, _ in snapshot['counters']}):
+            full = f"{self.namespace}_{name}"
+            lines.append(f"# TYPE {full} counter")
+            for (_, labels), value in sorted((key, value) for key, value in snapshot['counters'].items() if key[0] == name):
+                lines.append(f"{full}{_format_labels(labels)} {value:.6g}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        # Written to a temporary file and renamed, so a scraper never reads half a snapshot
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as file:
+            file.write(self.prometheus())
+        os.replace(temp_path, path)
+
+    def flush(self):
+        """
+        Flushes the JSON lines file and rewrites the Prometheus snapshot, when configured.
+        """
+        if self._file is not None:
+            with self._lock:
+                self._file.flush()
+        if self.prometheus_path:
+            self.write_prometheus(self.prometheus_path)
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+def get_recorder():
+    """
+    Process-wide recorder, configured from DRAFT_METRICS_PATH (JSON lines) and
+    DRAFT_METRICS_PROM (Prometheus snapshot) on first use.
+    """
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = MetricsRecorder(os.environ.get(METRICS_PATH_ENV), os.environ.get(PROMETHEUS_PATH_ENV))
+    return _recorder
+
+def set_recorder(recorder):
+    """
+    Replaces the process-wide recorder (e.g. with one writing to a per-run file).
+    """
+    global _recorder
+    with _recorder_lock:
+        _recorder = recorder
+    return recorder
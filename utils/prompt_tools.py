@@ -0,0 +1,92 @@
+import math
+import numpy as np
+from utils.draft_tools import adp_to_overall, snake_order
+from utils.scoring_tools import parse_scoring
+
+def estimate_tokens(text):
+    """
+    Rough token count (about four characters per token for English and tabular text).
+    """
+    return math.ceil(len(text) / 4)
+
+def summarize_scoring(rules_text):
+    """
+    Condenses rules prose into a compact scoring vector, one 'group: stat=points; ...' line per
+    position group, e.g. 'QB/RB/WR/TE: passing TD=4; rushing or receiving TD=6; ...'.
+    """
+    groups = {}
+    for group, description, points in parse_scoring(rules_text):
+        groups.setdefault(group, []).append(f"{description}={points}")
+    return '\n'.join(f"{group}: " + '; '.join(items) for group, items in groups.items())
+
+def encode_columnar(frame, columns, float_digits=1):
+    """
+    Pipe-separated table with a single header line, far denser than DataFrame.to_string().
+    ``float_digits`` is one precision for every float column or a dict of per-column overrides.
+    """
+    digits = [float_digits.get(col, 1) if isinstance(float_digits, dict) else float_digits for col in columns]
+    lines = ['|'.join(columns)]
+    for row in frame[columns].itertuples(index=False):
+        lines.append('|'.join(f"{value:.{d}f}" if isinstance(value, float) else str(value) for value, d in zip(row, digits)))
+    return '\n'.join(lines)
+
+class PromptBuilder:
+    """
+    Assembles a prompt from named sections under a token budget.
+
+    Fixed sections are always included; a table section is cut to as many rows as still fit
+    (but never fewer than ``min_rows``). ``report`` holds the token count of every section.
+
+    :param budget: Target token budget for the whole prompt.
+    :param counter: Function returning the token count of a string.
+    """
+    def __init__(self, budget=1200, counter=estimate_tokens):
+        self.budget = budget
+        self.counter = counter
+        self.sections = []
+        self.report = {}
+
+    def add(self, name, text):
+        self.sections.append((name, text))
+        self.report[name] = self.counter(text)
+        return self
+
+    def add_table(self, name, title, frame, columns, min_rows=5, float_digits=1):
+        """
+        Adds a columnar table, keeping the leading rows of ``frame`` that fit the remaining budget.
+        """
+        remaining = self.budget - self.used() - self.counter(title) - 1
+        encoded = encode_columnar(frame, columns, float_digits)
+        lines = encoded.split('\n')
+        line_tokens = np.cumsum([self.counter(line) + 1 for line in lines])
+        rows = max(min_rows, int(np.searchsorted(line_tokens, remaining, side='right')) - 1)
+        text = f"{title}\n" + '\n'.join(lines[:rows + 1])
+        return self.add(name, text)
+
+    def used(self):
+        return sum(self.report.values())
+
+    def build(self):
+        self.report['total'] = self.used()
+        return '\n\n'.join(text for _, text in self.sections)
+
+def candidate_slice(draft_state, team, picks_ahead=2, margin=6):
+    """
+    Available players likely to matter for ``team``'s next ``picks_ahead`` picks: everyone whose
+    ADP falls before the last of those picks (plus a margin), ordered by value over replacement.
+    """
+    current = len(draft_state.history)
+    order = snake_order(draft_state.num_teams, draft_state.rounds)
+    upcoming = np.flatnonzero(order[current:] == team)[:picks_ahead] + current
+    horizon = (upcoming[-1] if len(upcoming) else current) + 1 + margin
+
+    # ADP is published as round.pick for 12-team leagues; overall pick numbers carry over
+    overall = adp_to_overall(draft_state.adp)
+    values = draft_state.vor.values()
+    mask = draft_state.available & ~(overall > horizon)
+    ids = np.flatnonzero(mask)
+    ids = ids[np.argsort(-np.nan_to_num(values[ids], nan=-np.inf), kind='stable')]
+    frame = draft_state.players.iloc[ids][['player', 'pos', 'adp']].assign(
+        team=draft_state.teams[ids], bye=draft_state.bye_weeks[ids], vor=values[ids]
+    )
+    return frame, [int(p) + 1 for p in upcoming]
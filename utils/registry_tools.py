@@ -0,0 +1,237 @@
+import os
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from collections import defaultdict
+import pandas as pd
+from utils import DATA_DIR
+from utils.draft_tools import parse_team_bye
+from utils.scoring_tools import POSITION_ALIASES
+
+# Abbreviations as fantasy_rankings.csv and player_list.csv write them
+TEAM_NAMES = {
+    'ARI': ('arizona', 'cardinals'), 'ATL': ('atlanta', 'falcons'), 'BAL': ('baltimore', 'ravens'),
+    'BUF': ('buffalo', 'bills'), 'CAR': ('carolina', 'panthers'), 'CHI': ('chicago', 'bears'),
+    'CIN': ('cincinnati', 'bengals'), 'CLE': ('cleveland', 'browns'), 'DAL': ('dallas', 'cowboys'),
+    'DEN': ('denver', 'broncos'), 'DET': ('detroit', 'lions'), 'GB': ('green bay', 'packers'),
+    'HOU': ('houston', 'texans'), 'IND': ('indianapolis', 'colts'), 'JAC': ('jacksonville', 'jaguars'),
+    'KC': ('kansas city', 'chiefs'), 'LV': ('las vegas', 'raiders'), 'LAC': ('los angeles chargers', 'chargers'),
+    'LAR': ('los angeles rams', 'rams'), 'MIA': ('miami', 'dolphins'), 'MIN': ('minnesota', 'vikings'),
+    'NE': ('new england', 'patriots'), 'NO': ('new orleans', 'saints'), 'NYG': ('new york giants', 'giants'),
+    'NYJ': ('new york jets', 'jets'), 'PHI': ('philadelphia', 'eagles'), 'PIT': ('pittsburgh', 'steelers'),
+    'SF': ('san francisco', '49ers'), 'SEA': ('seattle', 'seahawks'), 'TB': ('tampa bay', 'buccaneers'),
+    'TEN': ('tennessee', 'titans'), 'WAS': ('washington', 'commanders'),
+}
+# Other spellings sources use for the same teams
+TEAM_ALIASES = {
+    'JAX': 'JAC', 'WSH': 'WAS', 'LA': 'LAR', 'LVR': 'LV', 'OAK': 'LV', 'SD': 'LAC', 'STL': 'LAR',
+    'GNB': 'GB', 'KAN': 'KC', 'NWE': 'NE', 'NOR': 'NO', 'SFO': 'SF', 'TAM': 'TB',
+}
+NAME_SUFFIXES = ('jr', 'sr', 'ii', 'iii', 'iv', 'v')
+DEFENSE_WORDS = ('d/st', 'dst', 'def', 'defense', 'd')
+
+# Names in the same block at least this similar are taken as the same player
+MATCH_THRESHOLD = 0.85
+
+def normalize_team(team):
+    if team is None or pd.isna(team):
+        return None
+    team = str(team).strip().upper()
+    return TEAM_ALIASES.get(team, team) or None
+
+def normalize_position(pos):
+    if pos is None or pd.isna(pos):
+        return None
+    pos = str(pos).strip().upper()
+    return POSITION_ALIASES.get(pos, 'K' if pos == 'PK' else pos)
+
+def normalize_name(name):
+    """
+    Lowercase ASCII name without punctuation or generational suffixes, so 'Patrick Mahomes II'
+    and 'patrick mahomes' compare equal.
+    """
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode()
+    words = re.sub(r"[.'’,]", '', name.lower()).replace('-', ' ').split()
+    while len(words) > 1 and words[-1] in NAME_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+def defense_team(name):
+    """
+    Team abbreviation named by a defense entry ('Eagles D/ST', 'Philadelphia Eagles', 'PHI DST'),
+    or None.
+    """
+    words = [w for w in normalize_name(name).replace('/', ' / ').split() if w not in DEFENSE_WORDS and w != '/']
+    text = ' '.join(words)
+    if normalize_team(text) in TEAM_NAMES:
+        return normalize_team(text)
+    for abbr, (city, nickname) in TEAM_NAMES.items():
+        if nickname in words or text == city or text.startswith(city + ' '):
+            return abbr
+    return None
+
+def soundex(word):
+    """
+    American Soundex code of a word ('mahomes' -> 'M252').
+    """
+    codes = {c: str(d) for d, letters in enumerate(('aeiouyhw', 'bfpv', 'cgjkqsxz', 'dt', 'l', 'mn', 'r')) for c in letters}
+    word = re.sub(r'[^a-z]', '', word.lower())
+    if not word:
+        return ''
+    out = []
+    last = codes.get(word[0])
+    for c in word[1:]:
+        code = codes.get(c)
+        if code != '0' and code != last:
+            out.append(code)
+        if c not in 'hw':
+            last = code
+    return (word[0].upper() + ''.join(out) + '000')[:4]
+
+def phonetic_key(normalized_name):
+    """
+    Blocking key: first initial plus the Soundex code of the last name.
+    """
+    words = normalized_name.split()
+    if not words:
+        return ''
+    return f"{words[0][0]}-{soundex(words[-1])}"
+
+class PlayerRegistry:
+    """
+    Stable integer ids for players across every source.
+
+    Names are normalized, then indexed two ways: exactly by (name, position), and in blocks of
+    (position, team, phonetic key) plus a looser (position, phonetic key) block for players
+    who changed teams or rows without a position. A lookup only compares names within one
+    small block, so resolving thousands of rows is near-linear rather than an all-pairs fuzzy
+    match. Defenses are keyed by team alone.
+
+    :ivar names: Display name for each id.
+    :ivar positions: Position for each id.
+    :ivar teams: Team abbreviation for each id (None when unknown).
+    :ivar unresolved: Rows that resolve() could not match, as dicts with source, row, name,
+                      position and team.
+    """
+    def __init__(self):
+        self.names = []
+        self.positions = []
+        self.teams = []
+        self.unresolved = []
+        self._exact = {}
+        self._blocks = defaultdict(list)
+        self._loose = defaultdict(list)
+        self._normalized = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def _keys(self, name, pos, team):
+        if pos == 'D/ST':
+            team = team or defense_team(name)
+            return f"{team} dst", (pos, team, ''), (pos, team)
+        normalized = normalize_name(name)
+        key = phonetic_key(normalized)
+        return normalized, (pos, team, key), (pos, key)
+
+    def add(self, name, pos, team=None):
+        """
+        Registers a new player and returns their id (always a new id, even for a known name).
+        """
+        pos, team = normalize_position(pos), normalize_team(team)
+        normalized, block, loose = self._keys(name, pos, team)
+        player_id = len(self.names)
+        self.names.append(name)
+        self.positions.append(pos)
+        self.teams.append(team)
+        self._normalized.append(normalized)
+        self._exact.setdefault((normalized, pos), player_id)
+        self._exact.setdefault((normalized, None), player_id)
+        self._blocks[block].append(player_id)
+        self._loose[loose].append(player_id)
+        if pos != 'D/ST':
+            self._loose[(None, loose[1])].append(player_id)  # For lookups without a position
+        return player_id
+
+    def _similarity(self, normalized, player_id):
+        other = self._normalized[player_id]
+        words, other_words = normalized.split(), other.split()
+        # Short first names ('Ken Walker', 'Pat Mahomes') count as the same player
+        if (len(words) > 1 and len(other_words) > 1 and words[-1] == other_words[-1]
+                and (words[0].startswith(other_words[0]) or other_words[0].startswith(words[0]))):
+            return 1.0
+        return SequenceMatcher(None, normalized, other).ratio()
+
+    def _best(self, normalized, ids):
+        best, best_score = None, MATCH_THRESHOLD
+        for player_id in ids:
+            score = self._similarity(normalized, player_id)
+            # Ties keep the earlier registration
+            if score > best_score or (best is None and score == best_score):
+                best, best_score = player_id, score
+        return best
+
+    def match(self, name, pos=None, team=None):
+        """
+        Id of the registered player a (name, position, team) row refers to, or None.
+        Position and team are optional but narrow the search.
+        """
+        pos, team = normalize_position(pos), normalize_team(team)
+        if pos is None and defense_team(name) and re.search(r'\b(d/st|dst|def|defense)\b', name.lower()):
+            pos = 'D/ST'
+        normalized, block, loose = self._keys(name, pos, team)
+        player_id = self._exact.get((normalized, pos))
+        if player_id is not None:
+            return player_id
+        if team is not None and pos is not None:
+            player_id = self._best(normalized, self._blocks.get(block, ()))
+            if player_id is not None:
+                return player_id
+        return self._best(normalized, self._loose.get(loose, ()))
+
+    def resolve(self, frame, name_col='name', pos_col='position', team_col='team', source=None, add=False):
+        """
+        Ids for every row of ``frame``. Rows that match nobody are registered as new players when
+        ``add`` is set, otherwise left as <NA> and recorded in ``unresolved``.
+
+        :return: Int64 Series aligned with ``frame``.
+        """
+        ids = []
+        for row, name, pos, team in zip(frame.index, frame[name_col],
+                                        frame[pos_col] if pos_col in frame else [None] * len(frame),
+                                        frame[team_col] if team_col in frame else [None] * len(frame)):
+            player_id = self.match(name, pos, team) if isinstance(name, str) else None
+            if player_id is None and add and isinstance(name, str):
+                player_id = self.add(name, pos, team)
+            if player_id is None:
+                self.unresolved.append({'source': source, 'row': row, 'name': name, 'position': pos, 'team': team})
+            ids.append(player_id)
+        return pd.Series(ids, index=frame.index, dtype='Int64')
+
+    def unresolved_frame(self):
+        return pd.DataFrame(self.unresolved, columns=['source', 'row', 'name', 'position', 'team'])
+
+    def to_frame(self):
+        return pd.DataFrame({'player_id': range(len(self)), 'player': self.names, 'pos': self.positions, 'team': self.teams})
+
+    def save(self, path=os.path.join(DATA_DIR, 'player_ids.csv')):
+        self.to_frame().to_csv(path, index=False)
+
+    @classmethod
+    def load(cls, path=os.path.join(DATA_DIR, 'player_ids.csv')):
+        registry = cls()
+        for row in pd.read_csv(path).sort_values('player_id').itertuples():
+            registry.add(row.player, row.pos, None if pd.isna(row.team) else row.team)
+        return registry
+
+    @classmethod
+    def from_rankings(cls, projections):
+        """
+        Registry seeded from fantasy_rankings.csv; ids are the frame's row positions, so they line
+        up with DraftState ids.
+        """
+        registry = cls()
+        teams, _ = parse_team_bye(projections['team_bye_week'])
+        for name, pos, team in zip(projections['player'], projections['pos'], teams):
+            registry.add(name, pos, team)
+        return registry
@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import random
+import asyncio
+from utils import DATA_DIR
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when a source's deadline or the run's global budget runs out before it completes.
+    """
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: attempt n waits a uniform random time up to
+    min(max_delay, base_delay * 2 ** n), so sources that failed together don't retry in lockstep.
+
+    :param attempts: Total attempts, including the first.
+    :param base_delay: Seconds of the first backoff window.
+    :param max_delay: Cap on any single backoff window.
+    :param attempt_timeout: Optional seconds allowed per attempt, so one hung attempt leaves
+                            time for a retry within the source deadline.
+    :param retry_on: Exception types worth retrying; anything else fails immediately.
+    """
+    def __init__(self, attempts=3, base_delay=1.0, max_delay=10.0, attempt_timeout=None, retry_on=(Exception,), rng=None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempt_timeout = attempt_timeout
+        self.retry_on = retry_on
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt):
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+async def run_with_deadline(make_attempt, deadline, policy=None, status=None):
+    """
+    Awaits ``make_attempt()`` until it succeeds, retrying with backoff, but never past
+    ``deadline`` (a time.monotonic() value).
+
+    :param make_attempt: Zero-argument callable returning a new awaitable for each attempt.
+    :param status: Optional dict updated with 'attempts' and the last 'error'.
+    :raises DeadlineExceeded: when the deadline passes first; otherwise the last error is re-raised.
+    """
+    policy = policy or RetryPolicy()
+    status = status if status is not None else {}
+    for attempt in range(policy.attempts):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"deadline passed after {attempt} attempts")
+        timeout = min(remaining, policy.attempt_timeout) if policy.attempt_timeout else remaining
+        status['attempts'] = attempt + 1
+        try:
+            return await asyncio.wait_for(make_attempt(), timeout)
+        except asyncio.TimeoutError:
+            status['error'] = f"attempt timed out after {timeout:.1f}s"
+            if time.monotonic() >= deadline:
+                raise DeadlineExceeded(status['error'])
+            error = None
+        except policy.retry_on as e:
+            status['error'] = f"{type(e).__name__}: {e}"
+            error = e
+        if attempt + 1 == policy.attempts:
+            if error is not None:
+                raise error
+            raise DeadlineExceeded(status['error'])
+        # Back off, but don't sleep past the deadline just to find it expired
+        await asyncio.sleep(min(policy.delay(attempt), max(deadline - time.monotonic(), 0)))
+    raise DeadlineExceeded('no attempts allowed')
+
+class CircuitBreaker:
+    """
+    Per-source circuit breaker persisted to a JSON file, so a site that kept failing in recent
+    runs is skipped instead of costing every refresh its full deadline.
+
+    A source's circuit opens after ``failure_threshold`` consecutive failed runs. Once
+    ``cooldown`` seconds have passed it is half-open: the next run tries the source once, and
+    a success closes the circuit while a failure opens it for another cooldown.
+
+    :param path: JSON file holding the state; None keeps it in memory only.
+    :param failure_threshold: Consecutive failures that open the circuit.
+    :param cooldown: Seconds an open circuit skips the source.
+    """
+    def __init__(self, path=os.path.join(DATA_DIR, 'cache', 'breakers.json'), failure_threshold=3, cooldown=6 * 3600):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = {}
+        if path:
+            try:
+                with open(path) as file:
+                    self.state = json.load(file)
+            except (OSError, ValueError):
+                self.state = {}
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as file:
+            json.dump(self.state, file, indent=2)
+        os.replace(temp_path, self.path)
+
+    def status(self, source, now=None):
+        """
+        'closed', 'open' or 'half-open'.
+        """
+        entry = self.state.get(source)
+        if entry is None or entry['failures'] < self.failure_threshold:
+            return 'closed'
+        now = time.time() if now is None else now
+        return 'half-open' if now - entry['opened_at'] >= self.cooldown else 'open'
+
+    def allow(self, source, now=None):
+        return self.status(source, now) != 'open'
+
+    def record_success(self, source):
+        if self.state.pop(source, None) is not None:
+            self._save()
+
+    def record_failure(self, source, error=None, now=None):
+        now = time.time() if now is None else now
+        entry = self.state.setdefault(source, {'failures': 0, 'opened_at': None, 'last_error': None})
+        entry['failures'] += 1
+        entry['last_error'] = error
+        if entry['failures'] >= self.failure_threshold:
+            entry['opened_at'] = now  # Opens, or re-opens after a failed half-open trial
+        self._save()
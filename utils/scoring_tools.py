@@ -0,0 +1,215 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+from utils import DATA_DIR
+
+# Per-player stat columns the compiled rules score, in matrix column order
+STAT_COLUMNS = [
+    'pass_yd', 'pass_td', 'pass_td_40', 'pass_2pt', 'pass_int',
+    'rush_yd', 'rush_td', 'rush_td_40', 'rush_2pt',
+    'rec', 'rec_yd', 'rec_td', 'rec_td_40', 'rec_2pt',
+    'return_td', 'fumble_return_td', 'fumble_lost',
+    'fg_0_39', 'fg_40_49', 'fg_50', 'xp', 'fg_miss_0_39', 'fg_miss_40_49',
+    'dst_td', 'dst_int', 'dst_fumble_rec', 'dst_block', 'dst_safety', 'dst_sack',
+]
+
+# Stat descriptions as written in rules.txt ('N pts per <description>') -> stat columns they cover
+STAT_PHRASES = {
+    'rushing or receiving td': ('rush_td', 'rec_td'),
+    'player returning kick/punt for td': ('return_td',),
+    'player returning or recovering a fumble for td': ('fumble_return_td',),
+    'passing td': ('pass_td',),
+    'rushing or receiving 2 pt conversion': ('rush_2pt', 'rec_2pt'),
+    'passing 2 pt conversion': ('pass_2pt',),
+    'rushing, passing, or receiving 2 pt conversion': ('rush_2pt', 'pass_2pt', 'rec_2pt'),
+    'every reception': ('rec',),
+    'rushing or receiving td of 40 yards or more': ('rush_td_40', 'rec_td_40'),
+    'passing td of 40 yards or more': ('pass_td_40',),
+    'intercepted pass': ('pass_int',),
+    'fumble lost': ('fumble_lost',),
+    '50+ yard fg made': ('fg_50',),
+    '40-49 yard fg made': ('fg_40_49',),
+    'fg made, 39 yards or less': ('fg_0_39',),
+    'extra point made': ('xp',),
+    'missed fg (0-39 yds)': ('fg_miss_0_39',),
+    'missed fg (40-49 yds)': ('fg_miss_40_49',),
+    'defensive or special teams td': ('dst_td',),
+    'interception': ('dst_int',),
+    'fumble recovery': ('dst_fumble_rec',),
+    'blocked punt, pat, or fg': ('dst_block',),
+    'safety': ('dst_safety',),
+    'sack': ('dst_sack',),
+}
+# '1 pt per 10 yards <description>' rules are scored per yard
+YARD_PHRASES = {
+    'rushing or receiving': ('rush_yd', 'rec_yd'),
+    'passing': ('pass_yd',),
+}
+
+POSITION_ALIASES = {'D': 'D/ST', 'DST': 'D/ST', 'DEF': 'D/ST'}
+COUNT_WORDS = {'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10}
+
+def _normalize_position(pos):
+    return POSITION_ALIASES.get(pos, pos)
+
+def parse_scoring(rules_text):
+    """
+    Pulls the scoring rules out of rules prose.
+
+    Headings naming positions like 'Kickers (K)' start a group; 'Bonus Points' and 'Penalty
+    Points' stay in it. Notes in parentheses are dropped.
+
+    :return: List of (group, description, points) tuples in file order, where group is the
+             heading's position codes joined with '/' (e.g. 'QB/RB/WR/TE').
+    """
+    # Notes can wrap over several lines and never carry point values
+    rules_text = re.sub(r'\(note:[^)]*\)', '', rules_text, flags=re.IGNORECASE | re.DOTALL)
+
+    rules = []
+    group = None
+    for line in rules_text.splitlines():
+        line = line.strip()
+        match = re.match(r'^(-?\d+)\s+pts?\s+(?:per\s+)?(?:for\s+)?(.*)$', line)
+        if match:
+            if group is not None:
+                rules.append((group, match.group(2).strip(' .'), int(match.group(1))))
+            continue
+        labels = re.findall(r'\(([A-Z/]+)\)', line)
+        if labels:
+            group = '/'.join(labels)
+    return rules
+
+def parse_roster_slots(rules_text):
+    """
+    Reads roster slots from a line like 'one Quarterback (QB), two Running Backs (RB), ...,
+    one Flex (RB/WR/TE), ... and seven Bench Spots (BE -- ...)'.
+
+    :return: Dict of slot ('QB', 'FLEX', 'D/ST', 'BE', ...) to count; empty if none are found.
+    """
+    slots = {}
+    pattern = r'\b(\d+|(?i:' + '|'.join(COUNT_WORDS) + r'))\s+([A-Za-z/ ]+?)\s*\(([A-Z/]+)\b'
+    for count, name, label in re.findall(pattern, rules_text):
+        count = int(count) if count.isdigit() else COUNT_WORDS[count.lower()]
+        slot = 'FLEX' if name.lower().startswith('flex') else _normalize_position(label)
+        slots[slot] = slots.get(slot, 0) + count
+    return slots
+
+class ScoringRules:
+    """
+    Compiled league scoring: a positions x stats matrix of points per unit of each stat.
+
+    Points for any batch of stat projections are one contraction against the matrix row of each
+    player's position, so a whole season for every source scores in milliseconds and a rule
+    tweak only means rebuilding a small matrix.
+
+    :param matrix: (positions, stats) points per unit.
+    :param positions: Position labels, aligned with the matrix rows.
+    :param stats: Stat column names, aligned with the matrix columns.
+    :param roster_slots: Optional dict of roster slots parsed alongside the scoring.
+    :param unparsed: Rule lines that could not be mapped to stat columns.
+    """
+    def __init__(self, matrix, positions, stats=STAT_COLUMNS, roster_slots=None, unparsed=None):
+        self.matrix = np.asarray(matrix, dtype=float)
+        self.positions = list(positions)
+        self.stats = list(stats)
+        self.roster_slots = roster_slots or {}
+        self.unparsed = unparsed or []
+
+    def vector(self, position):
+        """
+        Scoring vector (points per unit of each stat) for one position.
+        """
+        return self.matrix[self.positions.index(_normalize_position(position))]
+
+    def adjust(self, stat, points, positions=None):
+        """
+        Returns a copy with ``stat`` worth ``points`` per unit, for ``positions`` (default: every
+        position already scoring that stat).
+        """
+        matrix = self.matrix.copy()
+        column = self.stats.index(stat)
+        if positions is None:
+            rows = np.flatnonzero(matrix[:, column] != 0)
+        else:
+            rows = [self.positions.index(_normalize_position(pos)) for pos in positions]
+        matrix[rows, column] = points
+        return ScoringRules(matrix, self.positions, self.stats, self.roster_slots, self.unparsed)
+
+    def position_index(self, positions):
+        """
+        Matrix row for each position label; -1 for positions the rules do not score.
+        """
+        lookup = {pos: i for i, pos in enumerate(self.positions)}
+        return np.array([lookup.get(_normalize_position(pos), -1) for pos in np.asarray(positions)], dtype=int)
+
+    def score(self, stats, positions):
+        """
+        Fantasy points for a batch of stat projections in one NumPy contraction.
+
+        :param stats: Array of shape (players, ..., stats), e.g. (players, sources, weeks, stats);
+                      the last axis follows ``self.stats``. NaN propagates, so a projection a
+                      source does not have stays missing.
+        :param positions: (players,) position labels.
+        :return: Array of shape (players, ...); players at unscored positions get NaN.
+        """
+        rows = self.position_index(positions)
+        weights = self.matrix[np.maximum(rows, 0)]
+        weights[rows < 0] = np.nan
+        return np.einsum('p...s,ps->p...', stats, weights)
+
+    def score_frame(self, frame, position_col='pos'):
+        """
+        Points for a frame with one row per projection and a column per stat (missing stat
+        columns count as zero).
+        """
+        stats = frame.reindex(columns=self.stats).fillna(0).to_numpy(dtype=float)
+        return pd.Series(self.score(stats, frame[position_col].to_numpy()), index=frame.index)
+
+def compile_rules(rules_text):
+    """
+    Compiles rules prose into ScoringRules.
+    """
+    positions = []
+    entries = []
+    unparsed = []
+    for group, description, points in parse_scoring(rules_text):
+        group_positions = [_normalize_position(pos) for pos in group.split('/')]
+        positions.extend(pos for pos in group_positions if pos not in positions)
+
+        key = description.lower()
+        yards = re.match(r'^(\d+)\s+yards\s+(.*)$', key)
+        if key in STAT_PHRASES:
+            columns, per_unit = STAT_PHRASES[key], points
+        elif yards and yards.group(2) in YARD_PHRASES:
+            columns, per_unit = YARD_PHRASES[yards.group(2)], points / int(yards.group(1))
+        else:
+            unparsed.append(f"{points} pts per {description} ({group})")
+            continue
+        entries.append((group_positions, columns, per_unit))
+
+    matrix = np.zeros((len(positions), len(STAT_COLUMNS)))
+    for group_positions, columns, per_unit in entries:
+        rows = [positions.index(pos) for pos in group_positions]
+        cols = [STAT_COLUMNS.index(column) for column in columns]
+        matrix[np.ix_(rows, cols)] = per_unit
+    return ScoringRules(matrix, positions, STAT_COLUMNS, parse_roster_slots(rules_text), unparsed)
+
+def load_rules(path=os.path.join(DATA_DIR, 'rules.txt')):
+    with open(path, 'r') as file:
+        return compile_rules(file.read())
+
+def stat_tensor(frame, stats=STAT_COLUMNS, player_col='player', source_col='source', week_col='week'):
+    """
+    Pivots long stat projections (one row per player, source and week) into a dense
+    (players, sources, weeks, stats) array ready for ScoringRules.score. Stats a row does not
+    report count as zero; player, source and week combinations without a row are NaN.
+
+    :return: (tensor, players, sources, weeks) where the last three label the axes.
+    """
+    player_codes, players = pd.factorize(frame[player_col])
+    source_codes, sources = pd.factorize(frame[source_col], sort=True)
+    week_codes, weeks = pd.factorize(frame[week_col], sort=True)
+    tensor = np.full((len(players), len(sources), len(weeks), len(stats)), np.nan)
+    tensor[player_codes, source_codes, week_codes] = frame.reindex(columns=stats).fillna(0).to_numpy(dtype=float)
+    return tensor, players, sources, weeks
@@ -1,22 +1,207 @@
 import os
+import re
+import time
 import asyncio
+from urllib.parse import urlparse
 from playwright.sync_api import sync_playwright
 from playwright.async_api import async_playwright
+from utils.extract_tools import EXTRACT_TABLE_SCRIPT, EXTRACT_CELLS_SCRIPT
+from utils.metrics_tools import get_recorder
+
+def _response_matcher(url_pattern):
+    # Only successful XHR/fetch responses carry the data payloads we want to capture
+    pattern = re.compile(url_pattern)
+    def matches(response):
+        return (response.ok
+                and response.request.resource_type in ('xhr', 'fetch')
+                and pattern.search(response.url) is not None)
+    return matches
+
+# Resource types that never carry projection data
+DEFAULT_BLOCKED_RESOURCES = ('image', 'media', 'font')
+
+# Ad, analytics and tracking hosts that keep ad-heavy pages from ever reaching networkidle
+DEFAULT_BLOCKED_DOMAINS = (
+    'doubleclick.net', 'googlesyndication.com', 'googletagmanager.com', 'google-analytics.com',
+    'googletagservices.com', 'adnxs.com', 'amazon-adsystem.com', 'scorecardresearch.com',
+    'facebook.net', 'taboola.com', 'outbrain.com', 'criteo.com', 'moatads.com', 'chartbeat.net',
+    'quantserve.com', 'rubiconproject.com', 'pubmatic.com', 'casalemedia.com'
+)
+
+class RequestBlocker:
+    """
+    Request-routing rules that abort unneeded resource types and third-party domains.
+
+    :param resource_types: Playwright resource types to abort (e.g. 'image', 'font').
+    :param domains: Hosts to abort; subdomains are matched as well.
+    :param allowed_domains: Optional. When given, any host outside these domains is aborted.
+    """
+    def __init__(self, resource_types=DEFAULT_BLOCKED_RESOURCES, domains=DEFAULT_BLOCKED_DOMAINS, allowed_domains=None):
+        self.resource_types = set(resource_types)
+        self.domains = tuple(domains)
+        self.allowed_domains = tuple(allowed_domains) if allowed_domains else None
+        self.stats = {'requests_allowed': 0, 'requests_blocked': 0}
+
+    @staticmethod
+    def _matches(host, domains):
+        return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+    def should_block(self, request):
+        if request.resource_type in self.resource_types:
+            return True
+        host = urlparse(request.url).hostname or ''
+        if self._matches(host, self.domains):
+            return True
+        return self.allowed_domains is not None and not self._matches(host, self.allowed_domains)
+
+    def _count(self, blocked):
+        self.stats['requests_blocked' if blocked else 'requests_allowed'] += 1
+        return blocked
+
+    def handle(self, route):
+        if self._count(self.should_block(route.request)):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def handle_async(self, route):
+        if self._count(self.should_block(route.request)):
+            await route.abort()
+        else:
+            await route.continue_()
+
+async def iter_url_pages(scraper, base_url, content_check, start_page=1, page_param='page', ready_selector=None,
+                         max_pages=None):
+    """
+    URL pagination shared by every async scraper tier (browser, HTTP and cache replay).
+
+    Async generator that opens each page in turn and yields its number once the page is ready,
+    so the caller reads it before the next one is requested. The scraper must provide
+    ``navigate_to_page(url, ready_selector=...)`` and ``has_selector(selector)``. Stops once
+    ``content_check`` is missing from a page or after ``max_pages`` pages.
+    """
+    current_page = start_page
+    while True:
+        await scraper.navigate_to_page(f"{base_url}&{page_param}={current_page}", ready_selector=ready_selector)
+        yield current_page
+        if not await scraper.has_selector(content_check):
+            break
+        current_page += 1
+        if max_pages is not None and current_page - start_page >= max_pages:
+            break
+
+async def paginate_url(scraper, base_url, scrape_function, content_check, start_page=1, page_param='page',
+                       ready_selector=None, max_pages=None):
+    """
+    Awaits ``scrape_function()`` on every page iter_url_pages visits.
+    """
+    async for _ in iter_url_pages(scraper, base_url, content_check, start_page, page_param, ready_selector, max_pages):
+        await scrape_function()
+
+async def stream_url_table(scraper, base_url, spec, content_check, start_page=1, page_param='page',
+                           ready_selector=None, max_pages=None):
+    """
+    Async generator of one typed DataFrame batch per page: ``spec``'s rows of each page, yielded
+    before the next page is fetched. Nothing is kept between pages, so memory does not grow with
+    the number of pages.
+    """
+    async for _ in iter_url_pages(scraper, base_url, content_check, start_page, page_param, ready_selector, max_pages):
+        yield await scraper.extract_table(spec)
+
+def _new_timing_stats():
+    return {'pages': 0, 'goto_seconds': 0.0, 'ready_seconds': 0.0, 'ready_mode': None}
+
+class _NavigationStats:
+    # Shared by the sync and async browser scrapers and http_tools.HttpScraper, which all keep
+    # ``self.stats``, ``self.blocker``, ``self.metrics`` and ``self.source``
+    tier = 'browser'
+    # How pages are judged ready; browsers report whether they waited on a selector
+    ready_mode = None
+
+    def _record_stage(self, stage, seconds):
+        self.metrics.observe('scrape_stage_seconds', seconds, source=self.source, tier=self.tier, stage=stage)
+
+    def _record_navigation(self, start, loaded, ready_selector):
+        ready = time.perf_counter() - loaded
+        self.stats['pages'] += 1
+        self.stats['goto_seconds'] += loaded - start
+        self.stats['ready_seconds'] += ready
+        self.stats['ready_mode'] = self.ready_mode or ('selector' if ready_selector else 'networkidle')
+        self._record_stage('goto', loaded - start)
+        self._record_stage('ready', ready)
+
+    def _record_extraction(self, start, df):
+        self._record_stage('extract', time.perf_counter() - start)
+        self.metrics.observe('scrape_rows', len(df), source=self.source, tier=self.tier)
+        return df
+
+    def timing_stats(self):
+        """
+        Returns navigation timings together with the request blocker's counters.
+        """
+        stats = dict(self.stats)
+        if self.blocker is not None:
+            stats.update(self.blocker.stats)
+        return stats
 
-class WebScraper:
-    def __init__(self, download_dir='data', headless=True):
+class WebScraper(_NavigationStats):
+    def __init__(self, download_dir='data', headless=True, blocker=None, metrics=None, source=None):
         self.download_dir = download_dir
         self.scraped_data = []
+        self.blocker = blocker
+        self.stats = _new_timing_stats()
+        # Stage timings and row counts go to the process-wide recorder unless one is given
+        self.metrics = metrics if metrics is not None else get_recorder()
+        self.source = source
         if not os.path.exists(self.download_dir):
             os.makedirs(self.download_dir)
+        start = time.perf_counter()
         self.playwright = sync_playwright().start()  # Start Playwright here
         self.browser = self.playwright.chromium.launch(headless=headless)
         self.context = self.browser.new_context(accept_downloads=True)
+        if blocker is not None:
+            self.context.route('**/*', blocker.handle)
         self.page = self.context.new_page()
+        self._record_stage('launch', time.perf_counter() - start)
+
+    def navigate_to_page(self, url, ready_selector=None, timeout=30000):
+        """
+        Opens a page and waits until it is ready to scrape.
+
+        :param url: Page to open.
+        :param ready_selector: Optional. Return as soon as this selector is attached instead of
+                               waiting for 'networkidle'.
+        :param timeout: Milliseconds allowed for navigation and for the readiness wait.
+        """
+        start = time.perf_counter()
+        self.page.goto(url, wait_until='domcontentloaded' if ready_selector else 'load', timeout=timeout)
+        loaded = time.perf_counter()
+        self.wait_until_ready(ready_selector, timeout)
+        self._record_navigation(start, loaded, ready_selector)
+
+    def wait_until_ready(self, ready_selector=None, timeout=30000):
+        if ready_selector:
+            self.page.wait_for_selector(ready_selector, state='attached', timeout=timeout)
+        else:
+            self.page.wait_for_load_state('networkidle', timeout=timeout)
+
+    def capture_json(self, url, url_pattern, timeout=15000):
+        """
+        Navigates to a page and returns the JSON body of the first response whose URL matches
+        ``url_pattern``, without waiting for the page to render or the network to go idle.
 
-    def navigate_to_page(self, url):
-        self.page.goto(url)
-        self.page.wait_for_load_state('networkidle')
+        :param url: Page to open.
+        :param url_pattern: Regular expression searched against each response URL.
+        :param timeout: Milliseconds to wait for a matching response.
+        :return: The decoded JSON payload.
+        """
+        matcher = _response_matcher(url_pattern)
+        start = time.perf_counter()
+        with self.page.expect_response(matcher, timeout=timeout) as response_info:
+            self.page.goto(url, wait_until='commit', timeout=timeout)
+        payload = response_info.value.json()
+        self._record_stage('capture', time.perf_counter() - start)
+        return payload
 
     def select_dropdown(self, selector, value):
         self.page.select_option(selector, value)
@@ -62,132 +247,337 @@ class WebScraper:
         """
         Scrapes data from a table by extracting text from each table cell (td).
         """
-        # Find all table cell elements by XPath
-        cells = self.page.query_selector_all(f'xpath={selector}')
-
-        # Extract and return the text content from each cell
-        page_data = [cell.inner_text() for cell in cells]
+        # Pull the text of every matching cell in a single in-page evaluation
+        page_data = self.page.eval_on_selector_all(f'xpath={selector}', EXTRACT_CELLS_SCRIPT)
 
         # Append the data to the list of scraped data
         self.scraped_data.append(page_data)
 
+    def extract_table(self, spec):
+        """
+        Extracts a whole table described by a TableSpec in one round trip to the browser.
+
+        :param spec: utils.extract_tools.TableSpec describing the rows and columns.
+        :return: DataFrame with one row per matched table row.
+        """
+        start = time.perf_counter()
+        raw_rows = self.page.evaluate(EXTRACT_TABLE_SCRIPT, spec.script_args())
+        return self._record_extraction(start, spec.to_frame(raw_rows))
+
     def scrape_other_data(self, selector):
         pass
 
-    def paginate_scrape_selector(self, next_page_selector, scrape_function, wait_selector=None):
+    def iter_pages_selector(self, next_page_selector, wait_selector=None):
         """
-        Navigates through pages using a 'next page' button or link and applies a given function on each page.
+        Generator that yields once per page, following a 'next page' button or link after each
+        yield, so the caller reads every page as it is reached instead of collecting them all.
 
         :param next_page_selector: CSS selector for the 'next page' link or button.
-        :param scrape_function: Function to call for scraping/interacting with the page.
-                                It must accept a single argument, the page object.
         :param wait_selector: Optional. CSS selector to wait for after navigating to a new page, indicating the page has loaded.
+                              When given it replaces the 'networkidle' wait.
         """
+        page_number = 0
         while True:
-            # Apply the scrape function on the current page
-            scrape_function()
+            yield page_number
 
             # Try to find the 'next page' link or button
             next_page_link = self.page.query_selector(next_page_selector)
             if next_page_link and next_page_link.is_visible():
                 # Click the 'next page' link/button and wait for navigation
-                with self.page.expect_navigation():
+                start = time.perf_counter()
+                with self.page.expect_navigation(wait_until='domcontentloaded' if wait_selector else 'load'):
                     next_page_link.click()
+                loaded = time.perf_counter()
 
-                # Wait for the next page to reach a certain load state, e.g., 'networkidle'
-                self.page.wait_for_load_state('networkidle')
-
-                # Optionally, wait for a specific selector to appear on the new page
-                if wait_selector:
-                    self.page.wait_for_selector(wait_selector, state="visible")
+                # Wait for the selector if one was given, otherwise for 'networkidle'
+                self.wait_until_ready(wait_selector)
+                self._record_navigation(start, loaded, wait_selector)
+                page_number += 1
             else:
                 # Exit if no 'next page' link/button is found or it's not visible
                 break
 
-    def paginate_scrape_url(self, base_url, scrape_function, content_check, start_page=1, page_param='page'):
+    def paginate_scrape_selector(self, next_page_selector, scrape_function, wait_selector=None):
         """
-        Paginates through pages by modifying the URL directly and applies a given function on each page.
+        Navigates through pages using a 'next page' button or link and applies a given function on each page.
 
-        :param base_url: The base URL without the page number.
+        :param next_page_selector: CSS selector for the 'next page' link or button.
         :param scrape_function: Function to call for scraping/interacting with the page.
                                 It must accept a single argument, the page object.
+        :param wait_selector: Optional. CSS selector to wait for after navigating to a new page, indicating the page has loaded.
+                              When given it replaces the 'networkidle' wait.
+        """
+        for _ in self.iter_pages_selector(next_page_selector, wait_selector):
+            scrape_function()
+
+    def iter_pages_url(self, base_url, content_check, start_page=1, page_param='page', ready_selector=None, max_pages=None):
+        """
+        Generator that opens each page by modifying the URL directly and yields its number once
+        it is ready.
+
+        :param base_url: The base URL without the page number.
+        :param content_check: Selector present on every page that has content; the first page
+                              without it is the last one.
         :param start_page: The starting page number.
         :param page_param: The query parameter used for the page number in the URL.
+        :param ready_selector: Optional. Selector that marks each page as ready instead of 'networkidle'.
+        :param max_pages: Optional cap on the number of pages.
         """
         current_page = start_page
         while True:
             # Construct the URL for the current page
             page_url = f"{base_url}&{page_param}={current_page}"
-            self.navigate_to_page(page_url)
-
-            # Apply the scrape function on the current page
-            scrape_function()
+            self.navigate_to_page(page_url, ready_selector=ready_selector)
+            yield current_page
 
-            # Check for a condition to determine if there are more pages. This could be
-            # the presence of specific content that indicates a non-empty page.
-            # For example, you might check if a certain CSS selector exists that would
-            # not be present on an empty or final page. If such an element is not found,
-            # assume this is the last page and break out of the loop.
+            # A page without ``content_check`` (e.g. an empty results table) is the last one
             if not self.page.query_selector(content_check):
                 break
 
             # Increment the page number for the next iteration
             current_page += 1
+            if max_pages is not None and current_page - start_page >= max_pages:
+                break
+
+    def paginate_scrape_url(self, base_url, scrape_function, content_check, start_page=1, page_param='page', ready_selector=None):
+        """
+        Paginates through pages by modifying the URL directly and applies a given function on each page.
+
+        :param base_url: The base URL without the page number.
+        :param scrape_function: Function to call for scraping/interacting with the page.
+                                It must accept a single argument, the page object.
+        :param start_page: The starting page number.
+        :param page_param: The query parameter used for the page number in the URL.
+        :param ready_selector: Optional. Selector that marks each page as ready instead of 'networkidle'.
+        """
+        for _ in self.iter_pages_url(base_url, content_check, start_page, page_param, ready_selector):
+            scrape_function()
+
+    def stream_table_url(self, base_url, spec, content_check, start_page=1, page_param='page', ready_selector=None,
+                         max_pages=None):
+        """
+        Generator of one typed DataFrame batch per page, extracted with ``spec`` as each page is
+        reached. Unlike paginate_scrape_url with scrape_table_data, nothing accumulates in
+        ``scraped_data``.
+        """
+        for _ in self.iter_pages_url(base_url, content_check, start_page, page_param, ready_selector, max_pages):
+            yield self.extract_table(spec)
 
     def stop_browser(self):
         self.browser.close()
         self.playwright.stop()  # Properly stop Playwright
 
-class AsyncWebScraper:
-    def __init__(self, download_dir='data', headless=True):
+class BrowserPool:
+    """
+    Shares a single Playwright/Chromium process between many AsyncWebScraper instances.
+
+    Browser contexts are created lazily up to ``size`` and handed back to the pool when a
+    scraper is closed, so concurrent scrapes reuse warm contexts instead of launching a new
+    browser per page. An optional RequestBlocker is installed on every context.
+    """
+    def __init__(self, size=4, headless=True, blocker=None):
+        self.size = size
+        self.headless = headless
+        self.blocker = blocker
+        self.playwright = None
+        self.browser = None
+        self._idle = asyncio.Queue()
+        self._slots = asyncio.Semaphore(size)
+        self._launch_lock = asyncio.Lock()
+        self._created = 0
+
+    async def start(self):
+        async with self._launch_lock:
+            if self.browser is None:
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        return self
+
+    async def acquire(self):
+        """
+        Waits for a free slot and returns a (context, page) pair.
+        """
+        await self._slots.acquire()
+        context = None
+        try:
+            await self.start()
+            if not self._idle.empty():
+                return self._idle.get_nowait()
+            context = await self.browser.new_context(accept_downloads=True)
+            if self.blocker is not None:
+                await context.route('**/*', self.blocker.handle_async)
+            page = await context.new_page()
+            self._created += 1
+            return context, page
+        except BaseException:
+            # Cancellation (e.g. a job's deadline) lands here too and must give the slot back
+            self._slots.release()
+            if context is not None:
+                await context.close()
+            raise
+
+    async def release(self, context, page):
+        """
+        Returns a context to the pool. Pages are reset to a blank document so the next
+        scraper does not inherit the previous site's state.
+        """
+        try:
+            await page.goto('about:blank')
+            self._idle.put_nowait((context, page))
+        except BaseException as e:
+            # A context that could not be reset (or was cancelled mid-reset) is dropped
+            self._created -= 1
+            await context.close()
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self._slots.release()
+
+    async def close(self):
+        while not self._idle.empty():
+            context, _ = self._idle.get_nowait()
+            await context.close()
+        if self.browser is not None:
+            await self.browser.close()
+            await self.playwright.stop()
+        self.browser = None
+        self.playwright = None
+
+    async def __aenter__(self):
+        # Chromium is launched on the first acquire, so runs that never need a browser skip it
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+class AsyncWebScraper(_NavigationStats):
+    def __init__(self, download_dir='data', headless=True, pool=None, blocker=None, metrics=None, source=None):
         self.download_dir = download_dir
         self.scraped_data = []
         self.headless = headless
+        self.pool = pool
+        # A pooled context already carries the pool's blocker
+        self.blocker = pool.blocker if pool is not None else blocker
+        self.stats = _new_timing_stats()
+        self.metrics = metrics if metrics is not None else get_recorder()
+        self.source = source
         if not os.path.exists(self.download_dir):
             os.makedirs(self.download_dir)
 
     async def setup(self):
+        # With a pool, 'launch' is the wait for a context (and the one browser launch, if first)
+        start = time.perf_counter()
+        if self.pool is not None:
+            # Borrow a warm context from the shared browser instead of launching our own
+            self.context, self.page = await self.pool.acquire()
+            self._record_stage('launch', time.perf_counter() - start)
+            return
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(headless=self.headless)
         self.context = await self.browser.new_context(accept_downloads=True)
+        if self.blocker is not None:
+            await self.context.route('**/*', self.blocker.handle_async)
         self.page = await self.context.new_page()
-
-    async def navigate_to_page(self, url):
-        await self.page.goto(url)
-        await self.page.wait_for_load_state('networkidle')
+        self._record_stage('launch', time.perf_counter() - start)
+
+    async def navigate_to_page(self, url, ready_selector=None, timeout=30000):
+        start = time.perf_counter()
+        await self.page.goto(url, wait_until='domcontentloaded' if ready_selector else 'load', timeout=timeout)
+        loaded = time.perf_counter()
+        await self.wait_until_ready(ready_selector, timeout)
+        self._record_navigation(start, loaded, ready_selector)
+
+    async def wait_until_ready(self, ready_selector=None, timeout=30000):
+        if ready_selector:
+            await self.page.wait_for_selector(ready_selector, state='attached', timeout=timeout)
+        else:
+            await self.page.wait_for_load_state('networkidle', timeout=timeout)
+
+    async def capture_json(self, url, url_pattern, timeout=15000):
+        matcher = _response_matcher(url_pattern)
+        start = time.perf_counter()
+        async with self.page.expect_response(matcher, timeout=timeout) as response_info:
+            await self.page.goto(url, wait_until='commit', timeout=timeout)
+        response = await response_info.value
+        payload = await response.json()
+        self._record_stage('capture', time.perf_counter() - start)
+        return payload
 
     async def scrape_table_data(self, selector):
-        cells = await self.page.query_selector_all(f'xpath={selector}')
-        page_data = [await cell.inner_text() for cell in cells]
+        page_data = await self.page.eval_on_selector_all(f'xpath={selector}', EXTRACT_CELLS_SCRIPT)
         self.scraped_data.append(page_data)
 
+    async def extract_table(self, spec):
+        start = time.perf_counter()
+        raw_rows = await self.page.evaluate(EXTRACT_TABLE_SCRIPT, spec.script_args())
+        return self._record_extraction(start, spec.to_frame(raw_rows))
+
+    async def iter_pages_selector(self, next_page_selector, wait_selector=None):
+        """
+        Async counterpart of WebScraper.iter_pages_selector.
+        """
+        page_number = 0
+        while True:
+            yield page_number
+
+            next_page_link = await self.page.query_selector(next_page_selector)
+            if not (next_page_link and await next_page_link.is_visible()):
+                break
+
+            start = time.perf_counter()
+            async with self.page.expect_navigation(wait_until='domcontentloaded' if wait_selector else 'load'):
+                await next_page_link.click()
+            loaded = time.perf_counter()
+            await self.wait_until_ready(wait_selector)
+            self._record_navigation(start, loaded, wait_selector)
+            page_number += 1
+
+    async def paginate_scrape_selector(self, next_page_selector, scrape_function, wait_selector=None):
+        """
+        Async counterpart of WebScraper.paginate_scrape_selector; ``scrape_function`` is awaited.
+        """
+        async for _ in self.iter_pages_selector(next_page_selector, wait_selector):
+            await scrape_function()
+
+    async def has_selector(self, selector):
+        return await self.page.query_selector(selector) is not None
+
+    async def paginate_scrape_url(self, base_url, scrape_function, content_check, start_page=1, page_param='page',
+                                  ready_selector=None, max_pages=None):
+        """
+        Async counterpart of WebScraper.paginate_scrape_url; ``scrape_function`` is awaited.
+        """
+        await paginate_url(self, base_url, scrape_function, content_check, start_page, page_param, ready_selector, max_pages)
+
     async def close(self):
+        if self.pool is not None:
+            await self.pool.release(self.context, self.page)
+            return
         await self.browser.close()
         await self.playwright.stop()
 
+    async def __aenter__(self):
+        await self.setup()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
     @classmethod
-    async def scrape_urls(cls, urls, selector, max_concurrent_tasks=5):
-        async def scrape_url(url):
-            scraper = cls()
-            await scraper.setup()
-            await scraper.navigate_to_page(url)
-            await scraper.scrape_table_data(selector)
-            data = scraper.scraped_data
-            await scraper.close()
-            return data
-
-        async def run_scraping_tasks():
-            tasks = []
-            for url in urls:
-                if len(tasks) >= max_concurrent_tasks:
-                    # Wait for one task to finish before adding a new one
-                    _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
-                    tasks = [task for task in pending]
-                task = asyncio.create_task(scrape_url(url))
-                tasks.append(task)
-            # Wait for all remaining tasks to complete
-            if tasks:
-                done, _ = await asyncio.wait(tasks)
-            return [task.result() for task in done]
-
-        return await run_scraping_tasks()
\ No newline at end of file
+    async def scrape_urls(cls, urls, selector, max_concurrent_tasks=5, pool=None):
+        """
+        Scrapes the same table selector from many URLs concurrently.
+
+        All URLs share one browser; at most ``max_concurrent_tasks`` contexts are open at once.
+        Results are returned in the same order as ``urls``.
+        """
+        async def scrape_url(shared_pool, url):
+            async with cls(pool=shared_pool) as scraper:
+                await scraper.navigate_to_page(url)
+                await scraper.scrape_table_data(selector)
+                return scraper.scraped_data
+
+        if pool is not None:
+            return await asyncio.gather(*(scrape_url(pool, url) for url in urls))
+        async with BrowserPool(size=max_concurrent_tasks) as shared_pool:
+            return await asyncio.gather(*(scrape_url(shared_pool, url) for url in urls))
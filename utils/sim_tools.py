@@ -0,0 +1,142 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from utils.draft_tools import snake_order, adp_to_overall
+
+# Opponents never roster more than these at a position...
+DEFAULT_ROSTER_LIMITS = {'QB': 3, 'RB': 7, 'WR': 7, 'TE': 3, 'K': 1, 'D/ST': 1}
+# ...and always leave enough picks to fill their starting lineup
+DEFAULT_ROSTER_MINIMUMS = {'QB': 1, 'RB': 2, 'WR': 2, 'TE': 1}
+
+class SimulationResult:
+    """
+    Aggregated outcome of many simulated drafts.
+
+    :ivar availability: (rounds, teams, players) probability that each player is still on the
+                        board when the team in that draft slot picks in that round.
+    :ivar expected_value: (teams,) mean total value of the players each slot drafted.
+    :ivar num_sims: Number of drafts simulated.
+    """
+    def __init__(self, availability, expected_value, num_sims, names, start_pick=0):
+        self.availability = availability
+        self.expected_value = expected_value
+        self.num_sims = num_sims
+        self.names = names
+        self.start_pick = start_pick
+
+    def availability_frame(self, slot):
+        """
+        Players x rounds availability probabilities for a 1-based draft slot.
+        """
+        rounds = self.availability.shape[0]
+        return pd.DataFrame(self.availability[:, slot - 1, :].T, index=self.names,
+                            columns=[f"round_{r + 1}" for r in range(rounds)])
+
+def _simulate_chunk(args):
+    (num_sims, seed, scores, noise_sd, values, pos_codes, limits, minimums,
+     available, counts, order, start_pick, num_teams) = args
+    rng = np.random.default_rng(seed)
+    num_players = len(scores)
+    sims = np.arange(num_sims)
+
+    # Each simulated draft gets its own noisy ADP board, drawn once up front
+    board = scores + noise_sd * rng.standard_normal((num_sims, num_players))
+    available = np.broadcast_to(available, (num_sims, num_players)).copy()
+    counts = np.broadcast_to(counts, (num_sims,) + counts.shape).copy()
+
+    rounds = len(order) // num_teams
+    seen = np.zeros((len(order), num_players))
+    value_sum = np.zeros(num_teams)
+    has_minimum = minimums > 0
+
+    for pick in range(start_pick, len(order)):
+        team = order[pick]
+        seen[pick] = available.sum(axis=0)
+
+        team_counts = counts[:, team, :]
+        allowed = available & (team_counts < limits)[:, pos_codes]
+
+        # Once the remaining picks only just cover unfilled starters, only those positions count
+        missing = np.maximum(minimums - team_counts, 0)
+        picks_left = rounds - pick // num_teams
+        must_fill = missing.sum(axis=1) >= picks_left
+        needed = (missing > 0) & has_minimum
+        allowed &= ~must_fill[:, None] | needed[:, pos_codes]
+
+        # Fall back to the plain board if constraints leave a simulation with nothing to pick
+        stuck = ~allowed.any(axis=1)
+        allowed[stuck] = available[stuck]
+
+        choice = np.argmin(np.where(allowed, board, np.inf), axis=1)
+        valid = available[sims, choice]
+        available[sims[valid], choice[valid]] = False
+        counts[sims[valid], team, pos_codes[choice[valid]]] += 1
+        value_sum[team] += values[choice[valid]].sum()
+
+    return seen, value_sum
+
+def simulate_drafts(draft_state, num_sims=2000, adp_noise=1.5, roster_limits=None, roster_minimums=None,
+                    processes=None, seed=None):
+    """
+    Monte Carlo snake drafts from the current DraftState.
+
+    Every team drafts from a noisy ADP board (std of ``adp_noise * sqrt(overall ADP)`` picks)
+    subject to per-position roster limits and starter minimums. Each process simulates a chunk
+    of drafts at once, vectorized across drafts with NumPy.
+
+    :param draft_state: DraftState; picks already made are respected and simulation resumes
+                        from the next pick.
+    :param num_sims: Number of drafts to simulate.
+    :param adp_noise: Scale of the ADP noise.
+    :param roster_limits: Dict of position to maximum players per team.
+    :param roster_minimums: Dict of position to starters every team must draft.
+    :param processes: Worker processes. Defaults to one per 5000 simulations (capped at the
+                      CPU count), since small runs finish faster than a pool starts.
+    :param seed: Seed for reproducible results.
+    :return: SimulationResult.
+    """
+    limits_map = dict(DEFAULT_ROSTER_LIMITS, **(roster_limits or {}))
+    minimums_map = dict(DEFAULT_ROSTER_MINIMUMS, **(roster_minimums or {}))
+    pos_codes, labels = pd.factorize(draft_state.positions)
+    labels = list(labels)
+    limits = np.array([limits_map.get(pos, draft_state.rounds) for pos in labels])
+    minimums = np.array([minimums_map.get(pos, 0) for pos in labels])
+
+    num_teams = draft_state.num_teams
+    order = snake_order(num_teams, draft_state.rounds)
+    start_pick = len(draft_state.history)
+
+    overall = adp_to_overall(draft_state.adp)
+    # Unranked players go after everyone; a pool without any ADP (e.g. freshly scraped) is all unranked
+    finite = np.isfinite(overall)
+    overall = np.where(finite, overall, overall[finite].max() + 50 if finite.any() else 1000)
+    noise_sd = adp_noise * np.sqrt(np.maximum(overall, 1))
+    values = np.nan_to_num(draft_state.vor.points)
+
+    counts = np.zeros((num_teams, len(labels)), dtype=int)
+    for team in range(num_teams):
+        np.add.at(counts[team], pos_codes[draft_state.roster(team)], 1)
+
+    processes = processes or min(os.cpu_count() or 1, num_sims // 5000)
+    processes = max(1, min(processes, num_sims))
+    chunks = np.array_split(np.arange(num_sims), processes)
+    seeds = np.random.SeedSequence(seed).spawn(processes)
+    tasks = [(len(chunk), child, overall, noise_sd, values, pos_codes, limits, minimums,
+              draft_state.available.copy(), counts, order, start_pick, num_teams)
+             for chunk, child in zip(chunks, seeds) if len(chunk)]
+
+    if len(tasks) == 1:
+        results = [_simulate_chunk(tasks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+            results = list(executor.map(_simulate_chunk, tasks))
+
+    seen = sum(result[0] for result in results)
+    value_sum = sum(result[1] for result in results)
+
+    # Overall pick index -> (round, slot of the team on the clock)
+    availability = np.zeros((draft_state.rounds, num_teams, len(overall)))
+    picks = np.arange(len(order))
+    availability[picks // num_teams, order] = seen / num_sims
+    return SimulationResult(availability, value_sum / num_sims, num_sims, draft_state.names, start_pick)
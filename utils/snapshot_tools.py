@@ -0,0 +1,72 @@
+import os
+import pickle
+
+# Bump whenever the snapshot contents or the objects pickled in it change shape
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SOURCES = ('fantasy_rankings.csv', 'player_list.csv', 'rules.txt')
+
+class DataSnapshot:
+    """
+    Everything the agent loads at startup, parsed once.
+
+    :ivar projections: fantasy_rankings.csv as a DataFrame.
+    :ivar player_list: player_list.csv as a DataFrame.
+    :ivar rules: rules.txt text.
+    :ivar scoring: ScoringRules compiled from the rules.
+    :ivar registry: PlayerRegistry seeded from the projections (ids are projection rows), with
+                    player_list.csv already resolved against it.
+    """
+    def __init__(self, projections, player_list, rules, scoring, registry):
+        self.projections = projections
+        self.player_list = player_list
+        self.rules = rules
+        self.scoring = scoring
+        self.registry = registry
+
+def _fingerprint(data_dir):
+    # Size and modification time of every source file; any edit invalidates the snapshot
+    fingerprint = []
+    for name in SNAPSHOT_SOURCES:
+        stat = os.stat(os.path.join(data_dir, name))
+        fingerprint.append((name, stat.st_size, stat.st_mtime_ns))
+    return fingerprint
+
+def build_snapshot(data_dir):
+    import pandas as pd
+    from utils.scoring_tools import compile_rules
+    from utils.registry_tools import PlayerRegistry
+
+    projections = pd.read_csv(os.path.join(data_dir, 'fantasy_rankings.csv'))
+    player_list = pd.read_csv(os.path.join(data_dir, 'player_list.csv'))
+    with open(os.path.join(data_dir, 'rules.txt'), 'r') as file:
+        rules = file.read()
+    registry = PlayerRegistry.from_rankings(projections)
+    registry.resolve(player_list, name_col='Player', pos_col='Pos', team_col='Team', source='player_list')
+    return DataSnapshot(projections, player_list, rules, compile_rules(rules), registry)
+
+def load_snapshot(data_dir, path=None):
+    """
+    Loads the data snapshot, rebuilding it first when it is missing, from another
+    SNAPSHOT_VERSION, or older than any of the source files.
+
+    :param data_dir: Directory with the source files.
+    :param path: Snapshot file; defaults to cache/snapshot.pkl under ``data_dir``.
+    """
+    path = path or os.path.join(data_dir, 'cache', 'snapshot.pkl')
+    fingerprint = _fingerprint(data_dir)
+    try:
+        with open(path, 'rb') as file:
+            stored = pickle.load(file)
+        if stored.get('version') == SNAPSHOT_VERSION and stored.get('sources') == fingerprint:
+            return stored['data']
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, KeyError):
+        pass  # Unreadable or stale snapshots are rebuilt
+
+    snapshot = build_snapshot(data_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        pickle.dump({'version': SNAPSHOT_VERSION, 'sources': fingerprint, 'data': snapshot}, file,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+    return snapshot
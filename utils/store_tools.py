@@ -0,0 +1,221 @@
+import os
+import shutil
+import datetime
+import threading
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+from utils import DATA_DIR
+
+# Low-cardinality columns stored dictionary-encoded and read back as pandas categoricals
+CATEGORICAL_COLUMNS = ('position', 'pos', 'team')
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('season', pa.int16()), ('week', pa.int8()), ('source', pa.string())]),
+    flavor='hive',
+)
+
+def current_season(today=None):
+    # The NFL season is named after the year it starts in; the offseason still belongs to it until March
+    today = today or datetime.date.today()
+    return today.year if today.month >= 3 else today.year - 1
+
+def _filter_expression(filters):
+    # Accepts a dict of column -> value (or list of values), or pyarrow/pandas style
+    # [(column, op, value), ...] tuples
+    if filters is None:
+        return None
+    if isinstance(filters, dict):
+        filters = [(column, 'in' if isinstance(value, (list, tuple, set)) else '==', list(value) if isinstance(value, (list, tuple, set)) else value)
+                   for column, value in filters.items()]
+    if not filters:
+        return None
+    return pq.filters_to_expression(filters)
+
+# Partitions being streamed are staged here; dataset discovery skips '_'-prefixed paths
+STAGING_DIR = '_staging'
+
+def _drop_partition_columns(frame):
+    return frame.drop(columns=[c for c in ('season', 'week', 'source') if c in frame])
+
+def _stream_schema(table):
+    # Pins the schema the first batch implies so every later batch is written the same way:
+    # categoricals share one index width and all-missing columns become strings, not nulls
+    fields = []
+    for field in table.schema:
+        if field.name in CATEGORICAL_COLUMNS:
+            field = field.with_type(pa.dictionary(pa.int32(), pa.string()))
+        elif pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return pa.schema(fields, metadata=table.schema.metadata)
+
+class PartitionWriter:
+    """
+    Streams DataFrame batches into one (season, week, source) partition, one Parquet row group
+    per batch, so a scrape can be stored page by page without holding the whole source.
+
+    Rows are staged under the store's _staging directory and replace the partition on close().
+    Until then readers see the previous partition; abort(), an exception inside a ``with``
+    block or closing without rows leave it untouched. write() may be called from any thread.
+
+    :param store: ProjectionStore to write into.
+    """
+    def __init__(self, store, season, week, source):
+        self.path = store._partition_dir(season, week, source)
+        self.staging = os.path.join(store.root, STAGING_DIR, f"{season}-{week}-{source}-{os.getpid()}-{id(self)}")
+        self.rows = 0
+        self.batches = 0
+        self._schema = None
+        self._writer = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def write(self, frame):
+        if not len(frame):
+            return
+        frame = _drop_partition_columns(frame)
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"Writer for {self.path} is closed")
+            if self._writer is None:
+                self._schema = _stream_schema(pa.Table.from_pandas(frame, preserve_index=False))
+                os.makedirs(self.staging, exist_ok=True)
+                self._writer = pq.ParquetWriter(os.path.join(self.staging, 'part-0.parquet'), self._schema)
+            self._writer.write_table(pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+            self.rows += len(frame)
+            self.batches += 1
+
+    def close(self):
+        """
+        Swaps the staged rows in as the partition. Returns the number of rows written.
+        """
+        with self._lock:
+            if self._closed:
+                return self.rows
+            self._closed = True
+            if self._writer is None:
+                return 0
+            self._writer.close()
+            shutil.rmtree(self.path, ignore_errors=True)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            os.replace(self.staging, self.path)
+            self._remove_staging_root()
+        return self.rows
+
+    def abort(self):
+        with self._lock:
+            self._closed = True
+            if self._writer is not None:
+                self._writer.close()
+            shutil.rmtree(self.staging, ignore_errors=True)
+            self._remove_staging_root()
+
+    def _remove_staging_root(self):
+        try:
+            os.rmdir(os.path.dirname(self.staging))
+        except OSError:
+            pass  # Another partition is still being staged
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+class ProjectionStore:
+    """
+    Parquet store of scraped projections, partitioned as season=/week=/source= directories.
+
+    Position and team columns are dictionary-encoded. Reads go through a memory-mapped Arrow
+    dataset: only the requested columns are decoded, and filters on partition columns skip
+    whole directories while filters on other columns are pushed down to the Parquet row-group
+    statistics.
+
+    :param root: Directory holding the store.
+    """
+    def __init__(self, root=os.path.join(DATA_DIR, 'store')):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _partition_dir(self, season, week, source):
+        return os.path.join(self.root, f"season={season}", f"week={week}", f"source={source}")
+
+    def write(self, frame, season, week, source):
+        """
+        Replaces one (season, week, source) partition with ``frame``.
+        """
+        path = self._partition_dir(season, week, source)
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+        frame = _drop_partition_columns(frame)
+        categorical = {column: 'category' for column in CATEGORICAL_COLUMNS if column in frame}
+        table = pa.Table.from_pandas(frame.astype(categorical), preserve_index=False)
+        pq.write_table(table, os.path.join(path, 'part-0.parquet'))
+
+    def has_partition(self, season, week, source):
+        return os.path.isdir(self._partition_dir(season, week, source))
+
+    def writer(self, season, week, source):
+        """
+        PartitionWriter that replaces the (season, week, source) partition batch by batch.
+        """
+        return PartitionWriter(self, season, week, source)
+
+    def write_sources(self, results, season, week):
+        """
+        Writes every non-empty frame of a scrape_all result; failed (empty) sources are skipped
+        so their last good partition is kept.
+        """
+        for source, frame in results.items():
+            if frame is not None and len(frame):
+                self.write(frame, season, week, source)
+
+    def dataset(self):
+        filesystem = pafs.LocalFileSystem(use_mmap=True)
+        return ds.dataset(os.path.abspath(self.root), format='parquet', partitioning=PARTITIONING, filesystem=filesystem)
+
+    def scanner(self, columns=None, filters=None, batch_size=64 * 1024):
+        """
+        Lazy scanner over the store; iterate ``scanner.to_batches()`` to stream record batches.
+        """
+        return self.dataset().scanner(columns=columns, filter=_filter_expression(filters), batch_size=batch_size)
+
+    def read(self, columns=None, filters=None):
+        """
+        Reads matching rows as a DataFrame.
+
+        :param columns: Columns to load (partition columns included); all if omitted.
+        :param filters: Dict of column to value or list of values, or [(column, op, value)]
+                        tuples, e.g. {'season': 2024, 'week': [1, 2], 'position': 'QB'}.
+        """
+        table = self.scanner(columns=columns, filters=filters).to_table()
+        return table.to_pandas()
+
+    def read_sources(self, season, week, columns=None):
+        """
+        One frame per source for a week, in the shape scrape_all returns.
+        """
+        frame = self.read(columns=columns, filters={'season': season, 'week': week})
+        if not len(frame):
+            return {}
+        return {source: part.drop(columns=['season', 'week', 'source'], errors='ignore').reset_index(drop=True)
+                for source, part in frame.groupby('source', sort=False, observed=True)}
+
+    def partitions(self):
+        """
+        (season, week, source) of every stored partition.
+        """
+        found = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [name for name in dirnames if name != STAGING_DIR]
+            if any(name.endswith('.parquet') for name in filenames):
+                parts = dict(part.split('=', 1) for part in os.path.relpath(dirpath, self.root).split(os.sep))
+                found.append((int(parts['season']), int(parts['week']), parts['source']))
+        return sorted(found)
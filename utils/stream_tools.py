@@ -0,0 +1,112 @@
+import time
+import asyncio
+from contextlib import aclosing
+import pandas as pd
+from utils.registry_tools import normalize_team, normalize_position
+from utils.metrics_tools import get_recorder
+
+def normalize_batch(batch):
+    """
+    Stage giving a scraped batch the types and codes downstream stages expect: stripped names,
+    canonical position and team codes and float projections. Rows without a name are dropped.
+    """
+    batch = batch[batch['name'].notna()]
+    columns = {'name': batch['name'].astype(str).str.strip()}
+    if 'position' in batch:
+        columns['position'] = batch['position'].map(normalize_position)
+    if 'team' in batch:
+        columns['team'] = batch['team'].map(normalize_team)
+    if 'projection' in batch:
+        columns['projection'] = pd.to_numeric(batch['projection'], errors='coerce').astype('float64')
+    batch = batch.assign(**columns)
+    return batch[batch['name'] != '']
+
+class ResolveIds:
+    """
+    Stage adding a ``player_id`` column from a PlayerRegistry. Players the registry has never
+    seen are added to it unless ``add`` is False, in which case they get <NA>.
+
+    The registry is not thread-safe; run_stream calls stages one batch at a time, and runs that
+    share a registry should share one single-worker executor too.
+    """
+    def __init__(self, registry, source=None, add=True):
+        self.registry = registry
+        self.source = source
+        self.add = add
+
+    def __call__(self, batch):
+        return batch.assign(player_id=self.registry.resolve(batch, source=self.source, add=self.add))
+
+def _stage_name(stage):
+    return getattr(stage, '__name__', type(stage).__name__)
+
+def apply_stages(batch, stages, sink=None, metrics=None, source=None):
+    """
+    Runs one batch through every stage in order and hands the result to ``sink``.
+    """
+    for stage in stages:
+        start = time.perf_counter()
+        batch = stage(batch)
+        if metrics is not None:
+            metrics.observe('stream_stage_seconds', time.perf_counter() - start, source=source, stage=_stage_name(stage))
+    if sink is not None:
+        start = time.perf_counter()
+        sink(batch)
+        if metrics is not None:
+            metrics.observe('stream_stage_seconds', time.perf_counter() - start, source=source, stage='sink')
+    return batch
+
+async def run_stream(batches, stages=(), sink=None, max_pending=2, executor=None, metrics=None, source=None):
+    """
+    Drives an async iterator of DataFrame batches (e.g. one per scraped page) through ``stages``
+    into ``sink`` while the iterator is already fetching the next batch.
+
+    Stages and the sink run in ``executor`` (the default thread pool if None), so parsing,
+    normalization, id resolution and Parquet writes overlap with network and browser waits. At
+    most ``max_pending`` batches wait between the two sides: a slow sink holds the fetching back
+    instead of letting batches pile up, so memory stays flat however many pages there are.
+
+    :param batches: Async iterable of DataFrames.
+    :param stages: Callables taking and returning a batch, applied in order.
+    :param sink: Optional callable receiving every processed batch, e.g. PartitionWriter.write.
+    :param max_pending: Batches allowed to wait for the stages.
+    :param executor: concurrent.futures executor for the stages and sink.
+    :return: {'batches': n, 'rows': n} counted after the stages.
+    """
+    metrics = metrics if metrics is not None else get_recorder()
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(max_pending)
+    counts = {'batches': 0, 'rows': 0}
+
+    async def consume():
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            batch = await loop.run_in_executor(executor, apply_stages, batch, stages, sink, metrics, source)
+            counts['batches'] += 1
+            counts['rows'] += len(batch)
+
+    consumer = asyncio.create_task(consume())
+    try:
+        async with aclosing(aiter(batches)) as pages:
+            async for batch in pages:
+                metrics.observe('stream_batch_rows', len(batch), source=source)
+                # Wait for room in the queue, but notice a consumer that died while we waited
+                put = asyncio.ensure_future(queue.put(batch))
+                await asyncio.wait({put, consumer}, return_when=asyncio.FIRST_COMPLETED)
+                if not put.done():
+                    put.cancel()
+                if consumer.done():
+                    consumer.result()
+                    raise RuntimeError('stream consumer stopped early')
+        await queue.put(None)
+        await consumer
+    finally:
+        if not consumer.done():
+            consumer.cancel()
+            try:
+                await consumer
+            except asyncio.CancelledError:
+                pass
+    return counts